@@ -1,15 +1,24 @@
 import os
-import httpx
 import subprocess
 from pathlib import Path
 from typing import List, Optional
 from PyQt6.QtCore import QSettings
 
+from audio.library import strip_directions
+from runtime.asyncio_runtime import http_client
+from runtime.cancellation import CancellationToken, run_blocking
+from runtime.rate_scheduler import send_scheduled
+from telemetry.metrics import count_cache, provider_request
+from telemetry.tracing import span
+from video.ffmpeg import run_ffmpeg
+
 
 class AudioGenerator:
-    def __init__(self):
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        # Cancelling the token kills a running silence-removal ffmpeg process
+        self.cancel_token = cancel_token
         self.api_key = os.getenv("ELEVENLABS_API_KEY")
-        self.api_url = "https://api.elevenlabs.io/v1"
+        self.api_url = os.getenv("ELEVENLABS_API_URL", "https://api.elevenlabs.io/v1")
 
         # Get voice ID from settings or use default
         settings = QSettings("CloudePython", "AIVideoCreator")
@@ -33,10 +42,26 @@ class AudioGenerator:
 
         try:
             audio_path = Path(audio_path)
+            # Already processed, e.g. a short's audio_files on recreate
+            if audio_path.parent.name == "edited":
+                return str(audio_path)
+
             output_dir = audio_path.parent / "edited"
             output_dir.mkdir(exist_ok=True)
             output_path = output_dir / f"{audio_path.stem}_silenced.mp3"
 
+            # Reuse the processed file until the narration is regenerated, so
+            # its fingerprint stays stable for patched renders
+            if (
+                output_path.exists()
+                and output_path.stat().st_size > 0
+                and output_path.stat().st_mtime_ns >= audio_path.stat().st_mtime_ns
+            ):
+                count_cache("silence", hits=1)
+                return str(output_path)
+            count_cache("silence", misses=1)
+            temp_path = output_dir / f"{audio_path.stem}_silenced.tmp.mp3"
+
             silence_filter = (
                 "silenceremove="
                 "stop_periods=-1:"
@@ -57,16 +82,18 @@ class AudioGenerator:
                 silence_filter,
                 "-ac",
                 "2",
-                str(output_path),
+                str(temp_path),
             ]
 
             print(f"Processing audio: {audio_path}")
             print(f"Using silence filter: {silence_filter}")
 
-            result = subprocess.run(command, capture_output=True, text=True)
+            result = run_ffmpeg(command, self.cancel_token, text=True, kind="silence")
 
-            if result.returncode == 0 and output_path.exists():
+            if result.returncode == 0 and temp_path.exists():
+                os.replace(temp_path, output_path)
                 return str(output_path)
+            temp_path.unlink(missing_ok=True)
             return str(audio_path)
 
         except Exception as e:
@@ -85,7 +112,8 @@ class AudioGenerator:
             }
 
             data = {
-                "text": text,
+                # [Sound: ...] and [Music: ...] directions are not narrated
+                "text": strip_directions(text),
                 "model_id": "eleven_turbo_v2_5",
                 "voice_settings": {
                     "stability": 0.5,
@@ -97,31 +125,41 @@ class AudioGenerator:
 
             url = f"{self.api_url}/text-to-speech/{self.voice_id}"
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    url, headers=headers, json=data, timeout=60.0
-                )
+            client = http_client()
 
-                if response.status_code == 200:
-                    # Create output directory if it doesn't exist
-                    output_path.parent.mkdir(parents=True, exist_ok=True)
+            async def send():
+                with span("tts_request", "api", chars=len(data["text"])) as request_span, \
+                        provider_request("tts") as request:
+                    response = await client.post(
+                        url, headers=headers, json=data, timeout=60.0
+                    )
+                    request.status = response.status_code
+                    request_span.set(status=response.status_code, bytes=len(response.content))
+                return response
 
-                    # Save the raw audio file
-                    with open(output_path, "wb") as f:
-                        f.write(response.content)
+            response = await send_scheduled("tts", send)
 
-                    # Process the audio to remove silences (only for short videos)
-                    processed_path = self.process_audio_silence(
-                        str(output_path), is_short
-                    )
-                    if processed_path:
-                        return processed_path
+            if response.status_code == 200:
+                # Create output directory if it doesn't exist
+                output_path.parent.mkdir(parents=True, exist_ok=True)
 
-                    # Return original if processing fails
-                    return str(output_path)
-                else:
-                    print(f"Audio generation failed with status {response.status_code}")
-                    return None
+                # Save the raw audio file
+                with open(output_path, "wb") as f:
+                    f.write(response.content)
+
+                # Process the audio to remove silences (only for short videos);
+                # ffmpeg runs off the event loop so other jobs keep going
+                processed_path = await run_blocking(
+                    self.process_audio_silence, str(output_path), is_short
+                )
+                if processed_path:
+                    return processed_path
+
+                # Return original if processing fails
+                return str(output_path)
+            else:
+                print(f"Audio generation failed with status {response.status_code}")
+                return None
 
         except Exception as e:
             print(f"Error generating audio: {e}")
@@ -138,13 +176,14 @@ class AudioGenerator:
             output_path = Path(f"projects/{project_id}/audio/scene{i+1}-audio.mp3")
 
             # Generate audio for the script
-            audio_path = await self.generate_audio(script, output_path, is_short=False)
+            with span("tts", scene=i + 1):
+                audio_path = await self.generate_audio(script, output_path, is_short=False)
 
             if audio_path:
                 # Apply silence processing for short videos
                 if is_short:
-                    processed_path = self.process_audio_silence(
-                        audio_path, is_short=True
+                    processed_path = await run_blocking(
+                        self.process_audio_silence, audio_path, is_short=True
                     )
                     if processed_path:
                         generated_audio.append(processed_path)
@@ -177,7 +216,9 @@ class AudioGenerator:
 
             # Process the audio to remove silences for short videos
             if is_short:
-                processed_path = self.process_audio_silence(audio_path, is_short=True)
+                processed_path = await run_blocking(
+                    self.process_audio_silence, audio_path, is_short=True
+                )
                 if processed_path:
                     print(f"Audio processed successfully: {processed_path}")
                     return processed_path
@@ -188,13 +229,3 @@ class AudioGenerator:
         except Exception as e:
             print(f"Error in regenerate_audio: {e}")
             return None
-
-    async def generate_sound_effect(
-        self, effect_name: str, project_id: str, index: int
-    ) -> Optional[str]:
-        """Generate a sound effect"""
-        Path(f"projects/{project_id}/audio/sound_effect_{index}.mp3")
-
-        # Here we would typically use a sound effect library or AI service
-        # For now, we'll just return None as this would require additional setup
-        return None
@@ -0,0 +1,300 @@
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import wave
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from project.storage import atomic_write, file_key
+from runtime.cancellation import CancellationToken
+from telemetry.metrics import count_cache
+from video.ffmpeg import run_ffmpeg
+
+AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".aac", ".ogg", ".flac"}
+INDEX_NAME = "index.json"
+CACHE_DIR = ".cache"
+# Words in script hints that say nothing about which track fits
+STOPWORDS = {
+    "a", "an", "and", "the", "of", "with", "for", "in", "music", "background", "melody",
+    "sound", "sounds", "effect", "effects",
+}
+# [Sound: ...] and [Music: ...] directions the script prompt asks for
+DIRECTION_PATTERN = re.compile(r"\[\s*(sound|music)\s*:\s*([^\]]*)\]", re.IGNORECASE)
+
+# Concurrent renders build their own library objects over the same folder,
+# so the index and PCM cache are guarded per folder rather than per object
+_folder_locks: Dict[Path, threading.RLock] = {}
+_folder_locks_guard = threading.Lock()
+
+
+def folder_lock(root: Path) -> threading.RLock:
+    """Lock shared by every library over the folder root"""
+    key = Path(root).resolve()
+    with _folder_locks_guard:
+        return _folder_locks.setdefault(key, threading.RLock())
+
+
+def strip_directions(text: str) -> str:
+    """Script text without [Sound: ...]/[Music: ...] directions, as it is spoken"""
+    return re.sub(r"\s{2,}", " ", DIRECTION_PATTERN.sub("", text)).strip()
+
+
+def sound_cues(scripts: List[str], sounds: Optional[List[str]] = None) -> List[Tuple[int, float, str]]:
+    """Sound effect cues as (scene index, position within the scene 0-1, effect name)
+
+    [Sound: ...] directions in a scene's text are placed where they appear
+    in the spoken text. Scripts without directions fall back to the
+    script's "sounds" list, one effect at the start of each scene in order.
+    """
+    cues = []
+    for i, text in enumerate(scripts or []):
+        spoken_length = max(len(strip_directions(text)), 1)
+        for match in DIRECTION_PATTERN.finditer(text):
+            if match.group(1).lower() == "sound" and match.group(2).strip():
+                position = len(strip_directions(text[:match.start()])) / spoken_length
+                cues.append((i, min(position, 1.0), match.group(2).strip()))
+    if cues:
+        return cues
+    return [(i, 0.0, name) for i, name in enumerate((sounds or [])[:len(scripts or [])]) if name]
+
+
+def hint_words(text: str) -> List[str]:
+    """Lowercase words of a hint or file name, without stopwords"""
+    return [w for w in re.split(r"[^a-z0-9]+", text.lower()) if w and w not in STOPWORDS]
+
+
+def words_match(word: str, tag: str) -> bool:
+    """Whether a hint word names a tag, allowing for endings ("orchestral"/"orchestra")"""
+    if word == tag:
+        return True
+    return min(len(word), len(tag)) >= 4 and (word.startswith(tag) or tag.startswith(word))
+
+
+@dataclass
+class LibraryTrack:
+    """An analyzed audio file of a library"""
+    path: str  # Relative to the library folder
+    key: str  # file_key of the source when it was analyzed
+    duration: float
+    loudness: float  # Integrated loudness in LUFS
+    peak: float  # True peak in dBTP
+    tags: List[str] = field(default_factory=list)
+
+
+class AudioLibrary:
+    """A folder of audio files that is analyzed once and cached as normalized PCM.
+
+    index.json in the folder stores each file's duration, loudness and tags,
+    keyed by size and modification time so only new or changed files are
+    analyzed again. Tags default to the words of the folder and file names
+    and may be edited in the index. Every file is also decoded once to a
+    16-bit 44.1 kHz stereo WAV in .cache/, gained to target_loudness, so
+    renders only read PCM.
+    """
+
+    target_loudness = -14.0  # LUFS
+    max_peak = -1.0  # dBTP ceiling for the normalization gain
+
+    def __init__(self, root: Path, cancel_token: Optional[CancellationToken] = None):
+        self.root = Path(root)
+        self.cancel_token = cancel_token
+        self._tracks: Optional[Dict[str, LibraryTrack]] = None
+        self._lock = folder_lock(self.root)
+
+    @property
+    def tracks(self) -> List[LibraryTrack]:
+        """Indexed tracks, scanning the folder on first use"""
+        if self._tracks is None:
+            self._tracks = self.scan()
+        return list(self._tracks.values())
+
+    def scan(self) -> Dict[str, LibraryTrack]:
+        """Bring the index and PCM cache up to date with the folder"""
+        if not self.root.is_dir():
+            return {}
+        with self._lock:
+            return self._scan()
+
+    def _scan(self) -> Dict[str, LibraryTrack]:
+        index_path = self.root / INDEX_NAME
+        try:
+            stored = {
+                entry["path"]: LibraryTrack(**entry)
+                for entry in json.loads(index_path.read_text())["tracks"]
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            stored = {}
+
+        tracks = {}
+        for file in sorted(self.root.rglob("*")):
+            relative = file.relative_to(self.root)
+            if file.suffix.lower() not in AUDIO_EXTENSIONS or CACHE_DIR in relative.parts:
+                continue
+            key = file_key(file)
+            track = stored.get(relative.as_posix())
+            if track is None or track.key != key:
+                track = self.analyze(file, key, track.tags if track else None)
+                if track is None:
+                    continue
+            if self.ensure_pcm(track) is None:
+                continue
+            tracks[track.path] = track
+
+        if tracks != stored:
+            atomic_write(
+                index_path,
+                json.dumps({"tracks": [asdict(track) for track in tracks.values()]}, indent=2),
+            )
+
+        # Drop cached PCM of files that were removed or changed; .tmp files
+        # are decodes still being written
+        cached = {self.pcm_path(track) for track in tracks.values()}
+        for pcm in (self.root / CACHE_DIR).glob("*.wav"):
+            if pcm not in cached and ".tmp" not in pcm.suffixes:
+                pcm.unlink(missing_ok=True)
+        return tracks
+
+    def analyze(self, file: Path, key: str, tags: Optional[List[str]] = None) -> Optional[LibraryTrack]:
+        """Measure a file's duration, integrated loudness and true peak"""
+        command = [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            str(file),
+            "-af",
+            "loudnorm=print_format=json",
+            "-f",
+            "null",
+            "-",
+        ]
+        try:
+            print(f"Analyzing library track: {file}")
+            result = run_ffmpeg(command, self.cancel_token, check=True, text=True, kind="loudness")
+            stderr = result.stderr
+            stats = json.loads(stderr[stderr.rindex("{"):stderr.rindex("}") + 1])
+            hours, minutes, seconds = re.search(
+                r"Duration: (\d+):(\d+):([\d.]+)", stderr
+            ).groups()
+            relative = file.relative_to(self.root)
+            return LibraryTrack(
+                path=relative.as_posix(),
+                key=key,
+                duration=int(hours) * 3600 + int(minutes) * 60 + float(seconds),
+                loudness=float(stats["input_i"]),
+                peak=float(stats["input_tp"]),
+                tags=tags if tags is not None else hint_words(" ".join(relative.with_suffix("").parts)),
+            )
+        except (subprocess.CalledProcessError, ValueError, KeyError, AttributeError) as e:
+            print(f"Could not analyze {file}: {e}")
+            return None
+
+    def score(self, track: LibraryTrack, words: List[str]) -> int:
+        """Number of words that match one of the track's tags"""
+        return sum(any(words_match(word, tag) for tag in track.tags) for word in words)
+
+    def gain(self, track: LibraryTrack) -> float:
+        """Normalization gain in dB, limited so peaks stay below max_peak"""
+        if track.loudness == float("-inf"):
+            return 0.0
+        return min(self.target_loudness - track.loudness, self.max_peak - track.peak)
+
+    def pcm_path(self, track: LibraryTrack) -> Path:
+        digest = hashlib.sha1(f"{track.path}:{track.key}".encode()).hexdigest()[:16]
+        return self.root / CACHE_DIR / f"{digest}.wav"
+
+    def ensure_pcm(self, track: LibraryTrack) -> Optional[Path]:
+        """Normalized PCM of a track, decoding it if it is not cached yet"""
+        pcm = self.pcm_path(track)
+        with self._lock:
+            # Another render may have decoded it while this one waited
+            if pcm.exists():
+                count_cache("pcm", hits=1)
+                return pcm
+            count_cache("pcm", misses=1)
+            return self._decode(track, pcm)
+
+    def _decode(self, track: LibraryTrack, pcm: Path) -> Optional[Path]:
+        pcm.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_name = tempfile.mkstemp(dir=pcm.parent, prefix=f"{pcm.stem}.", suffix=".tmp.wav")
+        os.close(fd)
+        temp_pcm = Path(temp_name)
+        command = [
+            "ffmpeg",
+            "-y",
+            "-i",
+            str(self.root / track.path),
+            "-af",
+            f"volume={self.gain(track):.2f}dB",
+            "-ar",
+            "44100",
+            "-ac",
+            "2",
+            "-c:a",
+            "pcm_s16le",
+            str(temp_pcm),
+        ]
+        try:
+            run_ffmpeg(command, self.cancel_token, check=True, kind="library_pcm")
+            os.replace(temp_pcm, pcm)
+            return pcm
+        except subprocess.CalledProcessError as e:
+            print(f"Could not decode {track.path}: {e.stderr.decode()}")
+            temp_pcm.unlink(missing_ok=True)
+            return None
+        except OSError as e:
+            print(f"Could not cache PCM of {track.path}: {e}")
+            temp_pcm.unlink(missing_ok=True)
+            return None
+
+    def fit(self, track: LibraryTrack, duration: float, output_path: Path) -> bool:
+        """Write the track's PCM trimmed or looped to exactly duration seconds"""
+        pcm = self.ensure_pcm(track)
+        if pcm is None:
+            return False
+
+        with wave.open(str(pcm), "rb") as source:
+            if source.getnframes() == 0:
+                return False
+            frame_size = source.getsampwidth() * source.getnchannels()
+            with wave.open(str(output_path), "wb") as target:
+                target.setparams(source.getparams())
+                remaining = round(duration * source.getframerate())
+                while remaining > 0:
+                    frames = source.readframes(min(remaining, 65536))
+                    if not frames:
+                        source.rewind()
+                        continue
+                    target.writeframes(frames)
+                    remaining -= len(frames) // frame_size
+        return True
+
+
+class MusicLibrary(AudioLibrary):
+    """Background music tracks, chosen by the script's music hint"""
+
+    def select(self, hint: Optional[str]) -> Optional[LibraryTrack]:
+        """Track whose tags share the most words with the hint.
+
+        Ties, including hints that match nothing, go to the first track in
+        folder order so the choice is stable between renders.
+        """
+        words = hint_words(hint or "")
+        return max(self.tracks, key=lambda track: self.score(track, words), default=None)
+
+
+class SfxLibrary(AudioLibrary):
+    """Sound effects, looked up by the names in the script's sound cues"""
+
+    target_loudness = -20.0
+
+    def select(self, name: str) -> Optional[LibraryTrack]:
+        """Effect whose tags share the most words with name, or None if none do"""
+        words = hint_words(name)
+        best = max(self.tracks, key=lambda track: self.score(track, words), default=None)
+        return best if best is not None and self.score(best, words) > 0 else None
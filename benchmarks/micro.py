@@ -0,0 +1,292 @@
+"""Micro-benchmarks for the Python hot paths of the video and project code.
+
+    python -m benchmarks.micro --output results.json
+    python -m benchmarks.micro --baseline results.json --threshold 0.15
+
+Each benchmark is timed over several repeats and the median time per call
+is reported. With --baseline, results are compared against an earlier
+run and the command exits with status 1 when a benchmark got slower by
+more than the threshold, so it can gate a release.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SENTENCE = (
+    "În anul 1859, Alexandru Ioan Cuza a unit Moldova și Țara Românească: "
+    "„un singur stat”, spunea el, [Sound: crowd cheering] iar poporul l-a urmat."
+)
+
+
+class Benchmark:
+    def __init__(self, name: str, func: Callable[[], object], setup: Optional[Callable] = None,
+                 teardown: Optional[Callable] = None, repeat: int = 5, min_time: float = 0.2):
+        self.name = name
+        self.func = func
+        self.setup = setup
+        self.teardown = teardown
+        self.repeat = repeat
+        self.min_time = min_time
+
+    def run(self) -> dict:
+        """Median seconds per call over repeat rounds of at least min_time each"""
+        if self.setup:
+            self.setup()
+        try:
+            # Calibrate the number of calls per round, like timeit.autorange
+            loops = 1
+            while True:
+                start = time.perf_counter()
+                for _ in range(loops):
+                    self.func()
+                elapsed = time.perf_counter() - start
+                if elapsed >= self.min_time or loops >= 1_000_000:
+                    break
+                loops *= 10 if elapsed < self.min_time / 10 else 2
+            rounds = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                for _ in range(loops):
+                    self.func()
+                rounds.append((time.perf_counter() - start) / loops)
+        finally:
+            if self.teardown:
+                self.teardown()
+        return {
+            "median": statistics.median(rounds),
+            "min": min(rounds),
+            "stdev": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+            "loops": loops,
+            "repeat": self.repeat,
+        }
+
+
+def combiner_benchmarks() -> List[Benchmark]:
+    from video.combiner import FULL_PROFILE, LAYOUTS, PROXY_PROFILE, VideoCombiner
+
+    combiner = VideoCombiner()
+    long_text = " ".join([SENTENCE] * 4)
+    return [
+        Benchmark("combiner.escape_text", lambda: combiner.escape_text(SENTENCE)),
+        Benchmark("combiner.split_text_into_lines",
+                  lambda: combiner.split_text_into_lines(long_text, 30)),
+        Benchmark("combiner.scene_filter.vertical",
+                  lambda: combiner.scene_filter(LAYOUTS["vertical"], 5.2, SENTENCE, FULL_PROFILE)),
+        Benchmark("combiner.scene_filter.horizontal_proxy",
+                  lambda: combiner.scene_filter(LAYOUTS["horizontal"], 5.2, SENTENCE, PROXY_PROFILE)),
+        Benchmark("combiner.scene_filter.no_subtitle",
+                  lambda: combiner.scene_filter(LAYOUTS["vertical"], 5.2, "", FULL_PROFILE)),
+    ]
+
+
+def model_response(scenes: int) -> str:
+    """A long, slightly malformed script reply like the ones models send"""
+    rng = random.Random(scenes)
+    words = SENTENCE.split()
+    lines = ["Here is your script:", "```json", "{", '"title": "Unirea",', '"script": [']
+    lines += [f'"{" ".join(rng.sample(words, 12))}"' for _ in range(scenes)]  # No commas
+    lines += ["],", '"descriptions": [']
+    lines += [f'"Scene {i}, cinematic, dramatic lighting, photorealistic",' for i in range(scenes)]
+    lines += ['"Closing shot"', "],", '"music": "epic orchestral",', '"sounds": ["wind"],',
+              '"youtube_title": "Unirea #shorts"',
+              '"youtube_description": "Prima linie\nA doua linie\n#istorie"', "}", "```"]
+    return "\n".join(lines)
+
+
+def script_benchmarks() -> List[Benchmark]:
+    from script.generator import ScriptGenerator
+
+    benchmarks = []
+    for scenes in (12, 120, 1200):
+        content = model_response(scenes)
+        benchmarks.append(Benchmark(
+            f"script.clean_response.{scenes}_scenes",
+            lambda content=content: ScriptGenerator.clean_response(content),
+        ))
+    return benchmarks
+
+
+def synthetic_project(project_id: str, scenes: int = 12) -> dict:
+    now = time.time()
+    return {
+        "id": project_id,
+        "title": f"Project {project_id}",
+        "subject": f"Subject {int(project_id) % 97}",
+        "duration": scenes * 5,
+        "images": [f"projects/{project_id}/images/scene{i + 1}-image.webp" for i in range(scenes)],
+        "audio_files": [f"projects/{project_id}/audio/scene{i + 1}-audio.mp3" for i in range(scenes)],
+        "scripts": [SENTENCE] * scenes,
+        "output_path": f"projects/{project_id}/output.mp4",
+        "created_at": now,
+        "updated_at": now,
+        "metadata": {"youtube_description": SENTENCE, "image_descriptions": [SENTENCE] * scenes},
+    }
+
+
+def write_projects(projects_dir: Path, count: int) -> None:
+    """count project.json files, written directly to skip per-file fsyncs"""
+    for i in range(count):
+        project_id = str(1_000_000_000 + i)
+        project_dir = projects_dir / project_id
+        project_dir.mkdir(parents=True)
+        with open(project_dir / "project.json", "w") as f:
+            json.dump(synthetic_project(project_id), f)
+
+
+class ProjectTree:
+    """The synthetic projects/ tree, shared by the benchmarks of one size.
+
+    ensure() is idempotent, so every benchmark can call it from its own
+    setup and runs the same whether or not its neighbours were filtered out.
+    """
+
+    def __init__(self, path: Path = Path("projects")):
+        self.path = path
+        self.size: Optional[int] = None
+
+    def ensure(self, size: int) -> None:
+        if self.size == size and self.path.is_dir():
+            return
+        self.remove()
+        write_projects(self.path, size)
+        self.size = size
+
+    def remove(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.size = None
+
+
+def project_benchmarks(sizes: List[int]) -> List[Benchmark]:
+    from project.project import Project, ProjectManager
+
+    benchmarks = []
+    project = Project(**synthetic_project("1000000000", scenes=60))
+
+    def load():
+        if Project.load(project.id) is None:
+            raise RuntimeError(f"project {project.id} could not be loaded")
+
+    benchmarks.append(Benchmark("project.save", project.save, repeat=3))
+    benchmarks.append(Benchmark("project.load", load, setup=project.save))
+
+    tree = ProjectTree()
+    index = tree.path / ".index.json"
+    for size in sizes:
+        def cold():
+            # A first start: no summary index on disk yet
+            if index.exists():
+                index.unlink()
+            return ProjectManager().list_summaries()
+
+        def warm_setup(size=size):
+            tree.ensure(size)
+            ProjectManager().list_summaries()
+            if not index.exists():
+                raise RuntimeError(f"{index} was not written; the warm benchmark would run cold")
+
+        # Large trees make each call slow, so fewer rounds are enough
+        repeat = 5 if size <= 1000 else 3
+        benchmarks.append(Benchmark(
+            f"project_manager.list_summaries.cold.{size}", cold,
+            setup=lambda size=size: tree.ensure(size), repeat=repeat, min_time=0,
+        ))
+        benchmarks.append(Benchmark(
+            f"project_manager.list_summaries.warm.{size}",
+            lambda: ProjectManager().list_summaries(), setup=warm_setup,
+            repeat=repeat, min_time=0,
+        ))
+        benchmarks.append(Benchmark(
+            f"project_manager.list_projects.{size}",
+            lambda: ProjectManager().list_projects(),
+            setup=lambda size=size: tree.ensure(size), repeat=repeat, min_time=0,
+        ))
+    return benchmarks
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    """Print the change against baseline; returns the benchmarks that regressed"""
+    regressions = []
+    print(f"\n{'benchmark':<48}{'baseline':>12}{'now':>12}{'change':>9}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"{name:<48}{'-':>12}{format_time(result['median']):>12}{'new':>9}")
+            continue
+        change = result["median"] / before["median"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48}{format_time(before['median']):>12}"
+              f"{format_time(result['median']):>12}{change:>+9.1%}{flag}")
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="project counts for the ProjectManager benchmarks")
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this text")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with an earlier --output file")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="slowdown counted as a regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    output = args.output.resolve() if args.output else None
+    baseline = json.loads(args.baseline.read_text())["results"] if args.baseline else None
+
+    workdir = Path(tempfile.mkdtemp(prefix="micro-bench-"))
+    (workdir / "assets").symlink_to(ROOT / "assets", target_is_directory=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    results = {}
+    try:
+        benchmarks = combiner_benchmarks() + script_benchmarks() + project_benchmarks(args.sizes)
+        for benchmark in benchmarks:
+            if args.filter not in benchmark.name:
+                continue
+            results[benchmark.name] = benchmark.run()
+            print(f"{benchmark.name:<48}{format_time(results[benchmark.name]['median']):>12}")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if not results:
+        print(f"No benchmark matches --filter {args.filter!r}")
+        return 1
+    if output:
+        output.write_text(json.dumps({
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, indent=2))
+        print(f"Results written to {output}")
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
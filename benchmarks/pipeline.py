@@ -0,0 +1,142 @@
+"""End-to-end pipeline benchmark against the local provider simulator.
+
+Creates full projects of the given durations with VideoCreator.create_video,
+with the OpenRouter, Stability and ElevenLabs APIs served by
+simulators.providers, and reports wall time per stage:
+
+    python -m benchmarks.pipeline --durations 30 60 180 --runs 2 --latency image=2
+
+Stage times come from each job's trace (projects/<id>/trace.json). The
+projects are created in a temporary directory, so nothing is added to
+projects/. Needs ffmpeg on PATH.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from simulators.providers import (
+    ProviderSimulator, add_profile_arguments, parse_profile_options,
+)
+
+ROOT = Path(__file__).resolve().parent.parent
+
+STAGES = ["script", "images", "audio", "render"]
+
+
+def stage_times(trace_path: Path) -> Dict[str, float]:
+    """Seconds spent in each pipeline stage and in the whole job"""
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    times = {stage: 0.0 for stage in STAGES + ["total"]}
+    for event in events:
+        if event.get("ph") != "X":
+            continue
+        seconds = event["dur"] / 1e6
+        if event["cat"] == "job":
+            times["total"] += seconds
+        elif event["cat"] == "stage" and event["name"] in STAGES:
+            times[event["name"]] += seconds
+    return times
+
+
+def wait_for_new_project_id(previous: str) -> None:
+    # Project ids are creation timestamps in seconds
+    while str(int(time.time())) == previous:
+        time.sleep(0.05)
+
+
+def run_benchmark(durations: List[int], runs: int) -> List[dict]:
+    from project.project import ProjectManager
+    from runtime.asyncio_runtime import get_runtime
+    from video.creator import VideoCreator
+
+    manager = ProjectManager()
+    results = []
+    last_id = ""
+    for duration in durations:
+        for run in range(runs):
+            wait_for_new_project_id(last_id)
+            project = manager.create_project(f"Benchmark {duration}s", duration)
+            last_id = project.id
+            creator = VideoCreator()
+            start = time.perf_counter()
+            success = get_runtime().submit(creator.create_video(project)).result()
+            wall = time.perf_counter() - start
+            times = stage_times(Path("projects") / project.id / "trace.json")
+            result = {
+                "duration": duration,
+                "run": run + 1,
+                "scenes": len(project.scripts),
+                "success": bool(success),
+                "wall": round(wall, 3),
+                **{stage: round(seconds, 3) for stage, seconds in times.items()},
+            }
+            print(f"{duration}s run {run + 1}: {'ok' if success else 'FAILED'} in {wall:.1f}s")
+            results.append(result)
+    return results
+
+
+def print_table(results: List[dict]) -> None:
+    print(f"\n{'duration':>8}{'scenes':>8}{'ok':>5}" + "".join(f"{s:>9}" for s in STAGES + ["total"]))
+    for duration in dict.fromkeys(r["duration"] for r in results):
+        rows = [r for r in results if r["duration"] == duration]
+        ok = sum(r["success"] for r in rows)
+        medians = [statistics.median(r[s] for r in rows) for s in STAGES + ["total"]]
+        print(f"{duration:>8}{rows[0]['scenes']:>8}{ok:>3}/{len(rows)}"
+              + "".join(f"{m:>9.2f}" for m in medians))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--durations", type=int, nargs="+", default=[30, 60, 180],
+                        help="project durations in seconds (one scene per 5 s)")
+    parser.add_argument("--runs", type=int, default=1, help="projects per duration")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--keep", action="store_true", help="keep the working directory")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiles = parse_profile_options(args.latency, args.jitter, args.error_rate, args.throttle_rate)
+    server = ProviderSimulator(("127.0.0.1", 0), profiles, args.seed)
+    server.start_background()
+    os.environ.update(server.environment())
+
+    output = args.output.resolve() if args.output else None
+    workdir = Path(tempfile.mkdtemp(prefix="pipeline-bench-"))
+    # Prompts, music and effects are read from assets/ relative to the working directory
+    (workdir / "assets").symlink_to(ROOT / "assets", target_is_directory=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        from runtime.asyncio_runtime import shutdown_runtime
+
+        results = run_benchmark(args.durations, args.runs)
+        shutdown_runtime()
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        server.server_close()
+        if args.keep:
+            print(f"Projects kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_table(results)
+    print(f"Requests served: {server.requests}")
+    if output:
+        output.write_text(json.dumps({
+            "profiles": {name: vars(profile) for name, profile in profiles.items()},
+            "results": results,
+        }, indent=2))
+        print(f"Results written to {output}")
+    return 0 if all(r["success"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,309 @@
+"""Render throughput benchmark of VideoCombiner.create_final_video.
+
+Renders synthetic projects with the real combiner and reports seconds of
+output per CPU-second of ffmpeg work:
+
+    python -m benchmarks.render --scenes 5 12 24 60 --formats short long \\
+        --presets medium veryfast --subtitles none normal dense
+
+Scene images come from ffmpeg's lavfi test sources and narration from sine
+tones, so nothing has to be downloaded and every run renders the same input.
+Shorts keep their total under a minute and long-form videos run over one,
+so each scene count is rendered in both layouts.
+
+Each render's video frames are hashed with ffmpeg's framemd5 muxer. With
+--golden, the hashes are compared against an earlier --update-golden run
+and any difference makes the command exit with status 1, which shows that
+a change to the render path left the output untouched. x264 output differs
+between ffmpeg builds, so golden files only hold on the build that wrote them.
+"""
+import argparse
+import contextlib
+import dataclasses
+import hashlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from telemetry.resources import resource_report
+
+FORMATS = ("short", "long")
+SUBTITLES = ("none", "normal", "dense")
+# Words per scene subtitle for each density
+SUBTITLE_WORDS = {"none": 0, "normal": 12, "dense": 32}
+WORDS = (
+    "the old fortress stood above the river while merchants crossed the valley "
+    "carrying salt and silver toward the northern towns before winter closed the passes"
+).split()
+
+# Source image sizes, as the image API returns them for each format
+IMAGE_SIZES = {"short": (768, 1344), "long": (1344, 768)}
+# Only sources that draw the same picture every time (not gradients or life,
+# which are randomly seeded), or golden frame hashes would never match
+IMAGE_SOURCES = ["testsrc2", "smptehdbars", "mandelbrot", "rgbtestsrc", "yuvtestsrc"]
+
+
+def scene_seconds(scenes: int, fmt: str) -> float:
+    """Scene length that makes a project of this many scenes a short or long-form video"""
+    if fmt == "short":
+        return round(min(5.0, 58.0 / scenes), 2)
+    return round(max(5.0, 61.0 / scenes), 2)
+
+
+def ffmpeg(*args: str) -> None:
+    subprocess.run(["ffmpeg", "-y", "-v", "error", *args], capture_output=True, check=True)
+
+
+def ffmpeg_version() -> str:
+    result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
+    return result.stdout.splitlines()[0] if result.stdout else "unknown"
+
+
+def has_drawtext() -> bool:
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-filters"], capture_output=True, text=True)
+    return " drawtext " in result.stdout
+
+
+class SyntheticAssets:
+    """Scene images, narration and soundtrack generated once per benchmark run"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def image(self, fmt: str, scene: int) -> str:
+        width, height = IMAGE_SIZES[fmt]
+        path = self.root / f"{fmt}_image_{scene}.png"
+        if not path.exists():
+            source = IMAGE_SOURCES[scene % len(IMAGE_SOURCES)]
+            ffmpeg("-f", "lavfi", "-i", f"{source}=size={width}x{height}",
+                   "-vf", f"hue=h={scene * 37 % 360}", "-frames:v", "1", str(path))
+        return str(path)
+
+    def narration(self, scene: int, seconds: float) -> str:
+        path = self.root / f"narration_{scene}_{seconds:.2f}.mp3"
+        if not path.exists():
+            frequency = 180 + scene % 12 * 20
+            ffmpeg("-f", "lavfi", "-i", f"sine=frequency={frequency}:duration={seconds}:sample_rate=44100",
+                   "-c:a", "libmp3lame", "-b:a", "128k", str(path))
+        return str(path)
+
+    def soundtrack(self, path: Path) -> None:
+        """A 30 second chord, looped by the music pass like a real soundtrack"""
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tones = "+".join(f"0.1*sin(2*PI*{f}*t)" for f in (110, 138.6, 164.8))
+            ffmpeg("-f", "lavfi", "-i", f"aevalsrc='{tones}':s=44100:d=30",
+                   "-c:a", "libmp3lame", "-b:a", "128k", str(path))
+
+
+def subtitle(scene: int, density: str) -> str:
+    count = SUBTITLE_WORDS[density]
+    words = [WORDS[(scene * 7 + i) % len(WORDS)] for i in range(count)]
+    return " ".join(words).capitalize() + "." if words else ""
+
+
+def frame_digest(path: str) -> dict:
+    """Frame count and a hash of the decoded video frames of a file"""
+    result = subprocess.run(
+        ["ffmpeg", "-v", "error", "-i", path, "-map", "0:v", "-f", "framemd5", "-"],
+        capture_output=True, text=True, check=True,
+    )
+    frames = [line for line in result.stdout.splitlines() if line and not line.startswith("#")]
+    return {
+        "frames": len(frames),
+        "digest": hashlib.sha256("\n".join(frames).encode()).hexdigest(),
+    }
+
+
+async def render(combiner, project_id: str, images, audio_files, seconds, scripts, profile):
+    # The report is entered inside the coroutine so the render's worker
+    # thread inherits it
+    with resource_report(project_id, "render_benchmark") as report:
+        output = await combiner.create_final_video(
+            project_id, images, audio_files, seconds, scripts, profile
+        )
+    return output, report
+
+
+def run_case(assets: SyntheticAssets, scenes: int, fmt: str, preset: str, density: str,
+             verbose: bool) -> dict:
+    from runtime.asyncio_runtime import get_runtime
+    from video.combiner import FULL_PROFILE, VideoCombiner
+
+    # The stock preset keeps the real FULL_PROFILE, render state included
+    profile = FULL_PROFILE if preset == FULL_PROFILE.preset else dataclasses.replace(
+        FULL_PROFILE, preset=preset)
+    seconds = scene_seconds(scenes, fmt)
+    images = [assets.image(fmt, i) for i in range(scenes)]
+    audio_files = [assets.narration(i, seconds) for i in range(scenes)]
+    scripts = [subtitle(i, density) for i in range(scenes)]
+    project_id = f"bench_{scenes}_{fmt}_{preset}_{density}"
+    shutil.rmtree(Path("projects") / project_id, ignore_errors=True)
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stdout if verbose else log):
+        combiner = VideoCombiner()
+        output, report = get_runtime().submit(render(
+            combiner, project_id, images, audio_files, seconds, scripts, profile
+        )).result()
+    wall = time.perf_counter() - start
+
+    result = {
+        "case": project_id, "scenes": scenes, "format": fmt, "preset": preset,
+        "subtitles": density, "success": output is not None, "wall": round(wall, 3),
+    }
+    if output is None:
+        if not verbose:
+            print("\n".join(log.getvalue().splitlines()[-20:]))
+        return result
+
+    cpu = sum(entry["cpu"] for entry in report.passes().values())
+    output_seconds = combiner.media_duration(output) or scenes * seconds
+    result.update(
+        output_seconds=round(output_seconds, 3),
+        cpu=round(cpu, 3),
+        output_per_cpu_second=round(output_seconds / cpu, 3) if cpu else 0.0,
+        realtime_factor=round(output_seconds / wall, 3) if wall else 0.0,
+        passes=report.passes(),
+        **frame_digest(output),
+    )
+    return result
+
+
+def check_golden(results: List[dict], golden: dict) -> List[str]:
+    """Cases whose frames differ from the golden file"""
+    changed = []
+    expected = golden.get("cases", {})
+    for result in results:
+        case = expected.get(result["case"])
+        if case is None or not result["success"]:
+            result["golden"] = "missing" if case is None else "failed"
+            continue
+        same = case["digest"] == result["digest"] and case["frames"] == result["frames"]
+        result["golden"] = "match" if same else "CHANGED"
+        if not same:
+            changed.append(result["case"])
+    return changed
+
+
+def summarize(results: List[dict]) -> List[dict]:
+    """One row per case with the median of its runs"""
+    rows = []
+    for case in dict.fromkeys(r["case"] for r in results):
+        runs = [r for r in results if r["case"] == case]
+        ok = [r for r in runs if r["success"]]
+        row = dict(runs[0], runs=len(runs), success=len(ok) == len(runs))
+        if ok:
+            for key in ("wall", "cpu", "output_per_cpu_second", "realtime_factor"):
+                row[key] = round(statistics.median(r[key] for r in ok), 3)
+            # Renders of the same input must be identical run to run
+            if len({r["digest"] for r in ok}) > 1:
+                row["digest"] = "unstable"
+        rows.append(row)
+    return rows
+
+
+def print_table(rows: List[dict]) -> None:
+    print(f"\n{'case':<34}{'output s':>9}{'wall s':>9}{'cpu s':>9}{'out/cpu':>9}{'x rt':>7}  golden")
+    for row in rows:
+        if not row["success"]:
+            print(f"{row['case']:<34}{'FAILED':>9}")
+            continue
+        print(f"{row['case']:<34}{row['output_seconds']:>9.1f}{row['wall']:>9.2f}{row['cpu']:>9.2f}"
+              f"{row['output_per_cpu_second']:>9.3f}{row['realtime_factor']:>7.2f}  {row.get('golden', '-')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenes", type=int, nargs="+", default=[5, 12, 24, 60])
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--presets", nargs="+", default=["medium"], help="x264 presets")
+    parser.add_argument("--subtitles", nargs="+", choices=SUBTITLES, default=["none", "normal"],
+                        help="subtitle density per scene")
+    parser.add_argument("--runs", type=int, default=1, help="renders per case")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--golden", type=Path, help="compare frame hashes with this file")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="write the frame hashes of this run to --golden")
+    parser.add_argument("--verbose", action="store_true", help="show the combiner's output")
+    parser.add_argument("--keep", action="store_true", help="keep the working directory")
+    args = parser.parse_args()
+
+    densities = args.subtitles
+    if any(d != "none" for d in densities) and not has_drawtext():
+        print("This ffmpeg has no drawtext filter; skipping subtitled cases")
+        densities = [d for d in densities if d == "none"] or ["none"]
+
+    golden_path = args.golden.resolve() if args.golden else None
+    golden = None
+    if golden_path and not args.update_golden:
+        golden = json.loads(golden_path.read_text())
+        version = ffmpeg_version()
+        if golden.get("ffmpeg") != version:
+            print(f"Warning: golden file was written by {golden.get('ffmpeg')!r}, running {version!r}")
+    output = args.output.resolve() if args.output else None
+
+    workdir = Path(tempfile.mkdtemp(prefix="render-bench-"))
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    results = []
+    try:
+        from runtime.asyncio_runtime import shutdown_runtime
+
+        assets = SyntheticAssets(workdir / "synthetic")
+        assets.soundtrack(workdir / "assets" / "soundtrack.mp3")
+        for scenes in args.scenes:
+            for fmt in args.formats:
+                for preset in args.presets:
+                    for density in densities:
+                        for run in range(args.runs):
+                            result = run_case(assets, scenes, fmt, preset, density, args.verbose)
+                            status = "ok" if result["success"] else "FAILED"
+                            print(f"{result['case']} run {run + 1}: {status} in {result['wall']:.1f}s")
+                            results.append(result)
+        shutdown_runtime()
+    finally:
+        os.chdir(cwd)
+        if args.keep:
+            print(f"Renders kept in {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    rows = summarize(results)
+    changed = check_golden(rows, golden) if golden else []
+    print_table(rows)
+
+    if golden_path and args.update_golden:
+        golden_path.write_text(json.dumps({
+            "ffmpeg": ffmpeg_version(),
+            "cases": {
+                row["case"]: {"frames": row["frames"], "digest": row["digest"]}
+                for row in rows if row["success"] and row["digest"] != "unstable"
+            },
+        }, indent=2))
+        print(f"Golden frame hashes written to {golden_path}")
+    if output:
+        output.write_text(json.dumps({"ffmpeg": ffmpeg_version(), "results": rows}, indent=2))
+        print(f"Results written to {output}")
+    if changed:
+        print(f"Frames changed in {len(changed)} case(s): {', '.join(changed)}")
+        return 1
+    unstable = [row["case"] for row in rows if row.get("digest") == "unstable"]
+    if unstable:
+        print(f"Output differed between runs of: {', '.join(unstable)}")
+        return 1
+    return 0 if all(row["success"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,4 @@
 import sys
-import os
 from pathlib import Path
 from datetime import datetime
 from PyQt6.QtWidgets import (
@@ -13,30 +12,29 @@ from PyQt6.QtWidgets import (
     QLabel,
     QProgressBar,
     QListWidget,
+    QListWidgetItem,
     QSpinBox,
-    QScrollArea,
     QFrame,
     QFileDialog,
     QMessageBox,
-    QGridLayout,
     QDialog,
     QSlider,
     QTabWidget,
     QSplitter,
     QSizePolicy,
 )
-from PyQt6.QtCore import Qt, QThread, QUrl, QTimer, QSettings
-from PyQt6.QtGui import QPixmap, QImage
+from PyQt6.QtCore import Qt, QUrl, QTimer, QSettings, QSize
 from PyQt6.QtMultimedia import QMediaPlayer, QAudioOutput
 from PyQt6.QtMultimediaWidgets import QVideoWidget
 from typing import Optional
-from functools import partial
 
 from project.project import ProjectManager, Project
-from video.creator import VideoCreator
+from runtime.asyncio_runtime import shutdown_runtime
 
-from upload.youtube import UploadWorker
-from gui.workers.VideoWorker import VideoWorker
+from gui.workers.JobQueue import JobQueue
+from gui.workers.ThumbnailLoader import ThumbnailLoader
+from gui.widgets.ImageGallery import ImageGallery
+from gui.widgets.JobQueuePanel import JobQueuePanel
 from gui.dialogs.RegenerationDialog import RegenerationDialog
 from gui.dialogs.TopicSuggestionDialog import TopicSuggestionDialog
 from gui.dialogs.SettingsDialog import SettingsDialog
@@ -49,16 +47,26 @@ class MainWindow(QMainWindow):
         self.setMinimumSize(1200, 800)
 
         self.project_manager = ProjectManager()
-        self.video_creator = VideoCreator()
         self.current_project: Optional[Project] = None
-        self.worker: Optional[VideoWorker] = None
         self.current_image_index: int = 0
         self.selected_image_index = None
-        self.selected_image_label = None
         self.modified_scenes = set()
         self.slider_being_dragged = False
         self.playing = False
 
+        # Thumbnails are decoded off the GUI thread and cached across projects
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+
+        # Render jobs run in the background; only the project a job belongs
+        # to is locked while it is queued or running
+        self.job_queue = JobQueue(
+            QSettings("CloudePython", "AIVideoCreator").value("max_concurrent_jobs", 2, type=int),
+            parent=self,
+        )
+        self.job_queue.job_changed.connect(self.on_job_changed)
+        self.job_queue.job_preview.connect(self.on_job_preview)
+        self.job_queue.job_finished.connect(self.on_job_finished)
+
         # Initialize UI
         self.init_ui()
 
@@ -74,11 +82,9 @@ class MainWindow(QMainWindow):
         self.media_player.errorOccurred.connect(self.handle_media_error)
         self.media_player.positionChanged.connect(self.on_position_changed)
         self.media_player.durationChanged.connect(self.on_duration_changed)
-
-        # Add resize timer
-        self.resize_timer = QTimer()
-        self.resize_timer.setSingleShot(True)
-        self.resize_timer.timeout.connect(self.delayed_resize)
+        self.media_player.mediaStatusChanged.connect(self.on_media_status_changed)
+        self.pending_play = False
+        self.pending_position = 0
 
         self.upload_worker = None
         self.settings = QSettings("VideoForgeAI", "VideoForgeAI")
@@ -109,6 +115,16 @@ class MainWindow(QMainWindow):
 
         projects_layout.addWidget(QLabel("Projects:"))
 
+        # Full-text search over titles, scripts and image descriptions
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search projects...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer()
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.load_projects)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start(150))
+        projects_layout.addWidget(self.search_input)
+
         tabs = QTabWidget()
 
         # Shorts List (<= 60s)
@@ -178,6 +194,13 @@ class MainWindow(QMainWindow):
         self.metadata_label.setWordWrap(True)
         left_layout.addWidget(self.metadata_label)
 
+        # Render queue
+        self.job_queue_panel = JobQueuePanel(self.job_queue)
+        self.job_queue_panel.concurrency_input.valueChanged.connect(
+            self.save_max_concurrent_jobs)
+        self.job_queue_panel.job_activated.connect(self.show_job_project)
+        left_layout.addWidget(self.job_queue_panel)
+
         main_layout.addWidget(left_panel)
 
         # Right panel
@@ -241,14 +264,10 @@ class MainWindow(QMainWindow):
 
         image_layout.addWidget(QLabel("Image Gallery:"))
 
-        # Create a scroll area for the image gallery
-        self.image_scroll_area = QScrollArea()
-        self.image_scroll_area_widget = QWidget()
-        self.image_scroll_layout = QGridLayout(self.image_scroll_area_widget)
-        self.image_scroll_area_widget.setLayout(self.image_scroll_layout)
-        self.image_scroll_area.setWidgetResizable(True)
-        self.image_scroll_area.setWidget(self.image_scroll_area_widget)
-        image_layout.addWidget(self.image_scroll_area)
+        # Virtualized gallery: only visible cells are painted and the view reflows itself
+        self.image_gallery = ImageGallery(self.thumbnail_loader)
+        self.image_gallery.scene_selected.connect(self.select_image)
+        image_layout.addWidget(self.image_gallery)
 
         # Add image action buttons below the gallery
         image_actions = QHBoxLayout()
@@ -288,15 +307,7 @@ class MainWindow(QMainWindow):
         """Show the settings dialog"""
         dialog = SettingsDialog(self)
         if dialog.exec() == QDialog.DialogCode.Accepted:
-            # Reload API keys in generators
-            self.video_creator.script_generator.api_key = os.getenv(
-                "OPENROUTER_API_KEY"
-            )
-            self.video_creator.image_generator.api_key = os.getenv(
-                "STABILITY_API_KEY")
-            self.video_creator.audio_generator.api_key = os.getenv(
-                "ELEVENLABS_API_KEY")
-
+            # Each render job builds its generators from the updated keys
             QMessageBox.information(
                 self, "Settings", "Settings saved successfully!")
 
@@ -355,6 +366,25 @@ class MainWindow(QMainWindow):
         else:
             self.media_player.play()
 
+    def load_media(self, path: str, play: bool = False, position: int = 0):
+        """Set the player source; playback starts once the media has loaded"""
+        self.pending_play = play
+        self.pending_position = position
+        self.media_player.setSource(QUrl.fromLocalFile(str(path)))
+
+    def on_media_status_changed(self, status):
+        """Apply the pending seek/play as soon as the media is ready"""
+        if status in (
+            QMediaPlayer.MediaStatus.LoadedMedia,
+            QMediaPlayer.MediaStatus.BufferedMedia,
+        ):
+            if self.pending_position:
+                self.media_player.setPosition(self.pending_position)
+                self.pending_position = 0
+            if self.pending_play:
+                self.pending_play = False
+                self.media_player.play()
+
     def play_video(self):
         """Play the current video"""
         if self.current_project and self.current_project.output_path:
@@ -364,15 +394,11 @@ class MainWindow(QMainWindow):
                 self.media_player.stop()
                 self.media_player.setSource(QUrl())  # Clear current source
 
-                # Set new source and play
-                video_url = QUrl.fromLocalFile(str(video_file))
-                self.media_player.setSource(video_url)
                 # Reset slider and time labels
                 self.video_slider.setValue(0)
                 self.current_time_label.setText("0:00")
-                # Add a small delay before playing
-                QThread.msleep(100)
-                self.media_player.play()
+                # Play once the new source has loaded
+                self.load_media(video_file, play=True)
             else:
                 self.status_label.setText("Video file does not exist")
         else:
@@ -392,14 +418,32 @@ class MainWindow(QMainWindow):
         for category in self.project_lists.values():
             category.clear()
 
-        for project in self.project_manager.list_projects():
+        query = self.search_input.text().strip()
+        if query:
+            summaries = self.project_manager.search(query)
+        else:
+            summaries = self.project_manager.list_summaries()
+
+        for summary in summaries:
             # Determin category based on duration
-            is_short = project.duration <= 60
+            is_short = summary.duration <= 60
             category = "shorts" if is_short else "long"
-            self.project_lists[category].addItem(project.subject)
+            item = QListWidgetItem(summary.subject)
+            item.setData(Qt.ItemDataRole.UserRole, summary.id)
+            self.project_lists[category].addItem(item)
 
         self.update_ui_state()
 
+    def select_project_item(self, project: Project):
+        """Select the list item for a project in its category list"""
+        category = "shorts" if project.duration <= 60 else "long"
+        list_widget = self.project_lists[category]
+        for i in range(list_widget.count()):
+            item = list_widget.item(i)
+            if item.data(Qt.ItemDataRole.UserRole) == project.id:
+                list_widget.setCurrentItem(item)
+                break
+
     def delete_current_project(self):
         """Delete the currently selected project"""
         if not self.current_project:
@@ -452,19 +496,17 @@ class MainWindow(QMainWindow):
                 return
 
             # Check if project already exists
-            existing_projects = self.project_manager.list_projects()
-            for project in existing_projects:
-                if project.subject.lower() == subject.lower():
-                    reply = QMessageBox.question(
-                        self,
-                        "Project Exists",
-                        f'A project with subject "{
-                            subject}" already exists. Do you want to create a new one anyway?',
-                        QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                        QMessageBox.StandardButton.No,
-                    )
-                    if reply == QMessageBox.StandardButton.No:
-                        return
+            if self.project_manager.find_by_subject(subject):
+                reply = QMessageBox.question(
+                    self,
+                    "Project Exists",
+                    f'A project with subject "{
+                        subject}" already exists. Do you want to create a new one anyway?',
+                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                    QMessageBox.StandardButton.No,
+                )
+                if reply == QMessageBox.StandardButton.No:
+                    return
 
             # Create new project
             duration = self.duration_input.value()
@@ -474,47 +516,81 @@ class MainWindow(QMainWindow):
 
             self.current_project = project
             self.load_projects()
+            self.select_project_item(project)
+
+            # Language setting for the job's script generator
+            language = self.settings.value("script_language", "Romanian")
+            preview_mode = self.preview_mode()
+            renditions = self.extra_renditions()
+
+            def create(creator, p, cb, preview):
+                creator.script_generator.language = language
+                return creator.create_video(
+                    p, cb, skip_audio=False,
+                    preview_callback=preview if preview_mode != "off" else None,
+                    preview_mode=preview_mode, renditions=renditions)
+
+            # Queue video creation with audio
+            self.job_queue.submit("create", project.subject, project, create)
+            self.subject_input.clear()
+            self.update_ui_state()
 
-            # Pass language setting to script generator
-            self.video_creator.script_generator.language = self.settings.value(
-                "script_language", "Romanian"
-            )
+        except Exception as e:
+            self.update_progress(f"Error starting video creation: {str(e)}", 0)
+            self.update_ui_state()
 
-            # Start video creation with audio
-            self.worker = VideoWorker(
-                self.video_creator,
-                self.current_project,
-                lambda p, cb: self.video_creator.create_video(
-                    p, cb, skip_audio=False),
-            )
-            self.worker.progress.connect(self.update_progress)
-            self.worker.finished.connect(self.on_video_creation_finished)
-            self.worker.start()
+    def is_current_project(self, project: Project) -> bool:
+        return self.current_project is not None and self.current_project.id == project.id
 
-            self.update_ui_state(is_processing=True)
+    def on_job_changed(self, job_id: int):
+        """Mirror progress of the selected project's running job"""
+        job = self.job_queue.jobs.get(job_id)
+        if job and job.state == "running" and self.is_current_project(job.project):
+            self.update_progress(job.status, job.progress)
 
-        except Exception as e:
-            self.update_progress(f"Error starting video creation: {str(e)}", 0)
-            self.update_ui_state(is_processing=False)
+    def on_job_preview(self, job_id: int, preview_path: str):
+        self.on_preview_ready(preview_path)
+
+    def on_job_finished(self, job_id: int, success: bool):
+        """Refresh the views if the finished job belongs to the selected project"""
+        job = self.job_queue.jobs[job_id]
+        if not self.is_current_project(job.project):
+            self.update_ui_state()
+            return
+
+        # The job saved its own copy of the project, which is now the current state
+        self.current_project = job.project
+        if job.state == "cancelled":
+            # Finished scenes are kept; "Regenerate Video" resumes from them
+            self.update_ui_state()
+            self.update_progress("Render cancelled", 0)
+            self.load_preview()
+        elif job.kind == "create":
+            self.on_video_creation_finished(success)
+        elif job.kind == "regenerate":
+            self.on_video_regeneration_finished(success)
+        elif job.kind == "scene":
+            self.on_scene_update_finished(success, job.scene)
+
+    def show_job_project(self, job_id: int):
+        """Select the project a job belongs to"""
+        job = self.job_queue.jobs.get(job_id)
+        if job:
+            self.select_project_item(job.project)
+
+    def save_max_concurrent_jobs(self, value: int):
+        settings = QSettings("CloudePython", "AIVideoCreator")
+        settings.setValue("max_concurrent_jobs", value)
 
     def on_video_creation_finished(self, success: bool):
         """Handle video creation completion"""
-        self.update_ui_state(is_processing=False)
+        self.update_ui_state()
         if success:
             self.status_label.setText("Video created successfully!")
 
-            # Add delay before loading preview
-            QThread.msleep(1000)
-
             # Ensure project is selected in correct category list
             if self.current_project:
-                category = "shorts" if self.current_project.duration <= 60 else "long"
-                list_widget = self.project_lists[category]
-                for i in range(list_widget.count()):
-                    item = list_widget.item(i)
-                    if item.text() == self.current_project.subject:
-                        list_widget.setCurrentItem(item)
-                        break
+                self.select_project_item(self.current_project)
 
             # Force UI update
             QApplication.processEvents()
@@ -525,6 +601,26 @@ class MainWindow(QMainWindow):
         else:
             self.status_label.setText("Error creating video")
 
+    def preview_mode(self) -> str:
+        """Early preview shown during renders: "stream", "proxy" or "off"."""
+        # Stored by SettingsDialog
+        settings = QSettings("CloudePython", "AIVideoCreator")
+        return settings.value("preview_mode", "stream")
+
+    def extra_renditions(self) -> list:
+        """Layouts rendered next to the main video, e.g. ["square"]"""
+        # Stored by SettingsDialog
+        settings = QSettings("CloudePython", "AIVideoCreator")
+        return settings.value("renditions", [], type=list)
+
+    def on_preview_ready(self, preview_path: str):
+        """Play the proxy render or scene stream while the full render continues"""
+        project_dir = Path(f"projects/{self.current_project.id}") if self.current_project else None
+        if project_dir and project_dir in Path(preview_path).parents:
+            self.media_player.stop()
+            self.load_media(preview_path, play=True)
+            self.status_label.setText("Preview ready, full-quality render in progress...")
+
     def on_project_selected(self, current, previous):
         """Handle project selection"""
         if current:
@@ -535,17 +631,17 @@ class MainWindow(QMainWindow):
                 if list_widget != project_list and list_widget.currentItem():
                     list_widget.clearSelection()
 
-            projects = self.project_manager.list_projects()
-            for project in projects:
-                if project.subject == current.text():
-                    self.current_project = project
-                    self.current_image_index = 0
-                    # Update duration input with project duration
-                    self.duration_input.setValue(project.duration)
-                    self.load_preview()
-                    self.update_metadata_display()
-                    self.update_ui_state()
-                    break
+            # Only the selected project is loaded in full
+            project = self.project_manager.get_project(
+                current.data(Qt.ItemDataRole.UserRole))
+            if project:
+                self.current_project = project
+                self.current_image_index = 0
+                # Update duration input with project duration
+                self.duration_input.setValue(project.duration)
+                self.load_preview()
+                self.update_metadata_display()
+                self.update_ui_state()
 
     def load_preview(self):
         """Load video and image previews"""
@@ -554,6 +650,19 @@ class MainWindow(QMainWindow):
             return
 
         try:
+            # When replacing this project's proxy preview or scene stream,
+            # keep the playhead. Sources are set from relative project paths,
+            # so both sides are resolved before comparing
+            source = self.media_player.source().toLocalFile()
+            project_dir = Path(f"projects/{self.current_project.id}")
+            replaceable = {
+                (project_dir / "preview.mp4").resolve(),
+                (project_dir / "stream" / "stream.m3u8").resolve(),
+            }
+            position = 0
+            if source and Path(source).resolve() in replaceable:
+                position = self.media_player.position()
+
             # Stop current playback first
             self.media_player.stop()
 
@@ -561,108 +670,46 @@ class MainWindow(QMainWindow):
             if (
                 self.current_project.output_path and Path(self.current_project.output_path).exists()
             ):
-                video_path = QUrl.fromLocalFile(
-                    self.current_project.output_path)
-                self.media_player.setSource(video_path)
+                self.load_media(self.current_project.output_path, position=position)
                 print(f"Loaded video: {self.current_project.output_path}")
             else:
                 print("No video available")
                 self.status_label.setText("No video available")
 
-            # Reduce delays and forced updates
-            QThread.msleep(100)
-
             # Load images only if they exist and haven't been loaded already
             if self.current_project.images:
                 print(f"Starting to load {
                       len(self.current_project.images)} images...")
-                # Use a timer to load images after a short delay
-                QTimer.singleShot(200, self.load_image_gallery)
+                self.load_image_gallery()
             else:
                 print("No images available")
 
         except Exception as e:
             print(f"Error in load_preview: {str(e)}")
 
+    def gallery_thumbnail_size(self):
+        """Thumbnail size for the current project's orientation"""
+        image_width = 180
+        is_short = self.current_project.duration <= 60
+        image_height = (
+            int(image_width * 16 / 9) if is_short else int(image_width * 9 / 16)
+        )
+        return image_width, image_height
+
     def load_image_gallery(self):
-        """Load images into the gallery with optimizations"""
+        """Load images into the gallery; thumbnails are filled in as cells are painted"""
         try:
-            # Clear existing items before loading new ones
-            self.clear_image_gallery()
-
             if not self.current_project or not self.current_project.images:
+                self.clear_image_gallery()
                 return
 
-            # Calculate dimensions once
-            gallery_width = self.image_scroll_area.width()
-            image_width = 180
-            is_short = self.current_project.duration <= 60
-            image_height = (
-                int(image_width * 16 / 9) if is_short else int(image_width * 9 / 16)
+            image_width, image_height = self.gallery_thumbnail_size()
+            self.image_gallery.set_images(
+                self.current_project.images,
+                QSize(image_width, image_height),
+                Path(f"projects/{self.current_project.id}/thumbnails"),
             )
-            num_columns = max(1, gallery_width // (image_width + 10))
-
-            # Pre-calculate layout
-            total_images = len(self.current_project.images)
-            total_rows = (total_images + num_columns - 1) // num_columns
-
-            # Set fixed size for scroll area content
-            content_height = total_rows * (image_height + 10)
-            self.image_scroll_area_widget.setFixedHeight(content_height)
-
-            # Create and populate layout
-            row = 0
-            column = 0
-
-            # Image cache for faster loading
-            self.image_cache = {}
-
-            for idx, image_path in enumerate(self.current_project.images):
-                if idx > 0 and idx % 5 == 0:
-                    QApplication.processEvents()
-
-                path = Path(image_path)
-                if not path.exists():
-                    continue
-
-                try:
-                    # Create label with minimal initial setup
-                    label = QLabel()
-                    label.setFixedSize(image_width, image_height)
-                    label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                    label.setFrameStyle(QFrame.Shape.Box | QFrame.Shadow.Raised)
-                    label.mousePressEvent = partial(
-                        self.select_image, idx, label)
-
-                    # Load image using cache
-                    if image_path not in self.image_cache:
-                        image = QImage(str(path.absolute()))
-                        if not image.isNull():
-                            pixmap = QPixmap.fromImage(image)
-                            scaled_pixmap = pixmap.scaled(
-                                image_width,
-                                image_height,
-                                Qt.AspectRatioMode.KeepAspectRatio,
-                                Qt.TransformationMode.SmoothTransformation,
-                            )
-                            self.image_cache[image_path] = scaled_pixmap
-
-                    if image_path in self.image_cache:
-                        label.setPixmap(self.image_cache[image_path])
-
-                    # Add to layout
-                    self.image_scroll_layout.addWidget(label, row, column)
-
-                    column += 1
-                    if column >= num_columns:
-                        column = 0
-                        row += 1
-
-                except Exception as e:
-                    print(f"Error loading image {image_path}: {str(e)}")
-                    continue
-
-            self.image_scroll_layout.update()
+            self.selected_image_index = None
             self.highlight_modified_scenes()
 
         except Exception as e:
@@ -670,23 +717,7 @@ class MainWindow(QMainWindow):
 
     def clear_image_gallery(self):
         """Clear all images from the gallery"""
-        try:
-            for i in reversed(range(self.image_scroll_layout.count())):
-                item = self.image_scroll_layout.itemAt(i)
-                if item and item.widget():
-                    item.widget().setParent(None)
-        except Exception as e:
-            print(f"Error clearing image gallery: {str(e)}")
-
-    def resizeEvent(self, event):
-        """Handle window resize events with debouncing"""
-        super().resizeEvent(event)
-        self.resize_timer.start(150)
-
-    def delayed_resize(self):
-        """Called after resize events have stopped"""
-        if self.current_project and self.current_project.images:
-            self.load_image_gallery()
+        self.image_gallery.clear()
 
     def regenerate_video(self):
         """Regenerate the video using existing assets"""
@@ -704,18 +735,21 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.StandardButton.No:
                 return
 
-        self.worker = VideoWorker(
-            self.video_creator, self.current_project, self.video_creator.recreate_video
+        preview_mode = self.preview_mode()
+        renditions = self.extra_renditions()
+        self.job_queue.submit(
+            "regenerate",
+            self.current_project.subject,
+            self.current_project,
+            lambda creator, p, cb, preview: creator.recreate_video(
+                p, cb, preview_callback=preview if preview_mode != "off" else None,
+                preview_mode=preview_mode, renditions=renditions),
         )
-        self.worker.progress.connect(self.update_progress)
-        self.worker.finished.connect(self.on_video_regeneration_finished)
-        self.worker.start()
-
-        self.update_ui_state(is_processing=True)
+        self.update_ui_state()
 
     def on_video_regeneration_finished(self, success: bool):
         """Handle video regeneration completion"""
-        self.update_ui_state(is_processing=False)
+        self.update_ui_state()
         if success:
             self.status_label.setText("Video regenerated successfully!")
             self.modified_scenes.clear()
@@ -729,12 +763,7 @@ class MainWindow(QMainWindow):
             self.current_time_label.setText("0:00")
             self.total_time_label.setText("0:00")
 
-            # Force cleanup
-            QApplication.processEvents()
-
-            # Add delay before reloading
-            QTimer.singleShot(
-                500, lambda: self.reload_video_after_regeneration())
+            self.reload_video_after_regeneration()
         else:
             self.status_label.setText("Error regenerating video")
 
@@ -752,15 +781,9 @@ class MainWindow(QMainWindow):
             print(f"Error reloading video: {str(e)}")
             self.status_label.setText("Error reloading video")
 
-    def select_image(self, index, label, event):
+    def select_image(self, index):
         """Select an image in the gallery."""
-        # Deselect previous selection
-        if self.selected_image_label is not None:
-            self.selected_image_label.setStyleSheet("")
-        # Highlight the selected image
-        label.setStyleSheet("border: 2px solid blue;")
         self.selected_image_index = index
-        self.selected_image_label = label
 
     def replace_selected_image(self):
         """Replace the selected image with a new one."""
@@ -773,8 +796,6 @@ class MainWindow(QMainWindow):
             self.current_project.images[self.selected_image_index] = file_name
             self.current_project.update()
             self.load_image_gallery()
-            self.selected_image_index = None
-            self.selected_image_label = None
 
     def regenerate_selected_image(self):
         """Regenerate the selected image and/or audio using AI."""
@@ -809,32 +830,33 @@ class MainWindow(QMainWindow):
             changes_made = True
 
         if changes_made:
+            scene = self.selected_image_index
+            skip_audio = not dialog.regen_audio_cb.isChecked()
+
             # Folosește metoda oficială din VideoCreator pentru regenerare
-            self.worker = VideoWorker(
-                self.video_creator,
+            self.job_queue.submit(
+                "scene",
+                f"{self.current_project.subject} (scene {scene + 1})",
                 self.current_project,
-                lambda p, cb: self.video_creator.regenerate_scene(
+                lambda creator, p, cb, preview: creator.regenerate_scene(
                     p,
-                    self.selected_image_index,
+                    scene,
                     cb,
-                    skip_audio=not dialog.regen_audio_cb.isChecked(),
+                    skip_audio=skip_audio,
                 ),
+                scene=scene,
             )
 
-            self.worker.progress.connect(self.update_progress)
-            self.worker.finished.connect(self.on_scene_update_finished)
-            self.worker.start()
-
             # Adaugă scena la setul de scene modificate pentru regenerare ulterioară
-            self.modified_scenes.add(self.selected_image_index)
-            self.update_ui_state(is_processing=True)
+            self.modified_scenes.add(scene)
+            self.update_ui_state()
 
-    def on_scene_update_finished(self, success: bool):
+    def on_scene_update_finished(self, success: bool, scene: int):
         """Handle scene update completion"""
-        self.update_ui_state(is_processing=False)
+        self.update_ui_state()
         if success:
             self.status_label.setText(
-                f"Scene {self.selected_image_index + 1} updated successfully! "
+                f"Scene {scene + 1} updated successfully! "
                 f"Click 'Regenerate Video' to create the final video."
             )
             self.load_image_gallery()
@@ -844,19 +866,7 @@ class MainWindow(QMainWindow):
 
     def highlight_modified_scenes(self):
         """Highlight scenes that have been modified"""
-        for i in range(self.image_scroll_layout.count()):
-            widget = self.image_scroll_layout.itemAt(i).widget()
-            if widget and isinstance(widget, QLabel):
-                scene_index = i
-                if scene_index in self.modified_scenes:
-                    widget.setStyleSheet(
-                        "border: 2px solid orange;")  # Modified scenes
-                elif widget == self.selected_image_label:
-                    widget.setStyleSheet(
-                        "border: 2px solid blue;")  # Selected scene
-                else:
-                    widget.setStyleSheet(
-                        "border: 1px solid gray;")  # Normal scenes
+        self.image_gallery.set_modified(self.modified_scenes)
 
     def clear_form(self):
         """Clear input fields"""
@@ -866,23 +876,26 @@ class MainWindow(QMainWindow):
         self.status_label.setText("No video available")
 
         # Clear image gallery
-        for i in reversed(range(self.image_scroll_layout.count())):
-            widget = self.image_scroll_layout.itemAt(i).widget()
-            if widget is not None:
-                widget.setParent(None)
+        self.clear_image_gallery()
 
         self.status_label.clear()
         self.progress_bar.setValue(0)
         self.current_image_index = 0
         self.selected_image_index = None
-        self.selected_image_label = None
         self.video_slider.setValue(0)
         self.current_time_label.setText("0:00")
         self.total_time_label.setText("0:00")
 
     def update_ui_state(self, is_processing: bool = False):
-        """Update UI elements based on current state"""
+        """Update UI elements based on current state
+
+        Controls acting on the selected project stay disabled while a render
+        job for it is queued or running; other projects remain editable.
+        """
         has_project = self.current_project is not None
+        is_processing = is_processing or (
+            has_project and self.job_queue.is_busy(self.current_project.id)
+        )
         has_video = (
             has_project and self.current_project.output_path and Path(
                 self.current_project.output_path).exists()
@@ -949,27 +962,47 @@ class MainWindow(QMainWindow):
         # Set new duration based on category
         new_duration = 60 if new_category == "shorts" else 120
 
+        # Switch to a rendition of the new format if one was rendered
+        layout = "vertical" if new_category == "shorts" else "horizontal"
+        rendition = self.current_project.metadata.get("renditions", {}).get(layout)
+        if rendition and Path(rendition).exists():
+            self.current_project.output_path = rendition
+
         # Update project and UI
         self.current_project.duration = new_duration
         self.duration_input.setValue(new_duration)
         self.current_project.update()
 
         self.load_projects()
-
-        list_widget = self.project_lists[new_category]
-        for i in range(list_widget.count()):
-            if list_widget.item(i).text() == self.current_project.subject:
-                list_widget.setCurrentItem(list_widget.item(i))
-                break
+        self.select_project_item(self.current_project)
+        self.load_preview()
 
     def closeEvent(self, event):
         """Handle application closing"""
+        if self.job_queue.running():
+            reply = QMessageBox.question(
+                self,
+                "Render In Progress",
+                "Render jobs are still running. Cancel them and quit?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.No,
+            )
+            if reply == QMessageBox.StandardButton.No:
+                event.ignore()
+                return
+            # Stops ffmpeg and removes temp outputs; the runtime shutdown
+            # below waits for the jobs to unwind
+            self.job_queue.cancel_all()
         # Clear image cache
-        if hasattr(self, "image_cache"):
-            self.image_cache.clear()
+        self.thumbnail_loader.clear()
         # Cleanup media player resources
         self.media_player.stop()
         self.media_player.setSource(QUrl())
+        # Quit the upload browser if one was started this session
+        if "upload.youtube" in sys.modules:
+            sys.modules["upload.youtube"].close_browser_session()
+        # Stop the shared asyncio runtime and its pooled HTTP connections
+        shutdown_runtime()
         event.accept()
 
     def upload_video(self):
@@ -991,18 +1024,46 @@ class MainWindow(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Create worker thread for upload
-            self.upload_worker = UploadWorker(self.current_project)
+            # A running browser upload takes more videos in the same session
+            worker = self.upload_worker
+            if worker and worker.isRunning() and hasattr(worker, "enqueue"):
+                if worker.enqueue(self.current_project):
+                    self.status_label.setText(
+                        f"Queued upload of {self.current_project.title}"
+                    )
+                    return
+
+            # Upload modules are imported on first use instead of at startup
+            from upload.youtube_api import ApiUploadWorker, YouTubeApiUploader
+
+            if YouTubeApiUploader.configured():
+                # Resumable Data API upload; bounded by bandwidth, no browser
+                self.upload_worker = ApiUploadWorker(self.current_project)
+                # Disable UI during upload; the worker reports percentages
+                self.update_ui_state(is_processing=True)
+                self.progress_bar.setMaximum(100)
+            else:
+                # Selenium and undetected_chromedriver are only needed here
+                from upload.youtube import UploadWorker
+
+                # Create worker thread for upload; the UI stays usable so
+                # further uploads can be queued into its browser session
+                self.upload_worker = UploadWorker(self.current_project)
+                self.upload_worker.project_finished.connect(self.on_project_uploaded)
+                self.progress_bar.setMaximum(0)  # Show indefinite progress
             self.upload_worker.progress.connect(self.update_progress)
             self.upload_worker.finished.connect(self.on_upload_finished)
 
-            # Disable UI during upload
-            self.update_ui_state(is_processing=True)
             self.status_label.setText("Uploading to YouTube...")
-            self.progress_bar.setMaximum(0)  # Show indefinite progress
 
             self.upload_worker.start()
 
+    def on_project_uploaded(self, project_id: str, success: bool):
+        """Report each finished upload of a queued browser upload run"""
+        result = "uploaded" if success else "failed to upload"
+        print(f"Project {project_id} {result}")
+        self.status_label.setText(f"Project {project_id} {result}")
+
     def on_upload_finished(self, success: bool):
         """Handle upload completion"""
         self.progress_bar.setMaximum(100)  # Restore normal progress bar
@@ -1025,7 +1086,7 @@ class MainWindow(QMainWindow):
         """Show topic suggestion dialog"""
         # Get list of existing topics
         existing_topics = [
-            project.subject for project in self.project_manager.list_projects()
+            summary.subject for summary in self.project_manager.list_summaries()
         ]
 
         dialog = TopicSuggestionDialog(existing_topics, self)
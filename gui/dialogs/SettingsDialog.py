@@ -5,6 +5,7 @@ from PyQt6.QtWidgets import (
     QLabel,
     QDialog,
     QDialogButtonBox,
+    QCheckBox,
 )
 from PyQt6.QtCore import QSettings
 from PyQt6.QtWidgets import QComboBox
@@ -46,6 +47,24 @@ class SettingsDialog(QDialog):
         self.elevenlabs_key.setEchoMode(QLineEdit.EchoMode.Password)
         layout.addWidget(self.elevenlabs_key)
 
+        # YouTube Data API credentials; without them uploads go through the browser
+        layout.addWidget(QLabel("YouTube OAuth Client ID:"))
+        self.youtube_client_id = QLineEdit()
+        self.youtube_client_id.setText(self.settings.value("youtube_client_id", ""))
+        layout.addWidget(self.youtube_client_id)
+
+        layout.addWidget(QLabel("YouTube OAuth Client Secret:"))
+        self.youtube_client_secret = QLineEdit()
+        self.youtube_client_secret.setText(self.settings.value("youtube_client_secret", ""))
+        self.youtube_client_secret.setEchoMode(QLineEdit.EchoMode.Password)
+        layout.addWidget(self.youtube_client_secret)
+
+        layout.addWidget(QLabel("YouTube Refresh Token:"))
+        self.youtube_refresh_token = QLineEdit()
+        self.youtube_refresh_token.setText(self.settings.value("youtube_refresh_token", ""))
+        self.youtube_refresh_token.setEchoMode(QLineEdit.EchoMode.Password)
+        layout.addWidget(self.youtube_refresh_token)
+
         # Voice ID section
         layout.addWidget(QLabel("ElevenLabs Voice ID:"))
         self.voice_id = QLineEdit()
@@ -68,6 +87,32 @@ class SettingsDialog(QDialog):
         self.language_combo.setCurrentText(current_lang)
         layout.addWidget(self.language_combo)
 
+        # Rendering section
+        layout.addWidget(QLabel("Rendering:"))
+
+        layout.addWidget(QLabel("Preview while rendering:"))
+        self.preview_mode_combo = QComboBox()
+        self.preview_mode_combo.addItem("Stream scenes as they finish", "stream")
+        self.preview_mode_combo.addItem("Fast low-resolution render first", "proxy")
+        self.preview_mode_combo.addItem("Off", "off")
+        index = self.preview_mode_combo.findData(self.settings.value("preview_mode", "stream"))
+        self.preview_mode_combo.setCurrentIndex(max(index, 0))
+        layout.addWidget(self.preview_mode_combo)
+
+        # Extra renditions are encoded in the same pass as the main video
+        layout.addWidget(QLabel("Also render:"))
+        renditions = self.settings.value("renditions", [], type=list)
+        self.rendition_checks = {}
+        for name, label in [
+            ("vertical", "9:16 vertical (output_vertical.mp4)"),
+            ("horizontal", "16:9 horizontal (output_horizontal.mp4)"),
+            ("square", "1:1 square (output_square.mp4)"),
+        ]:
+            check = QCheckBox(label)
+            check.setChecked(name in renditions)
+            self.rendition_checks[name] = check
+            layout.addWidget(check)
+
         # Buttons
         button_box = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
@@ -81,6 +126,9 @@ class SettingsDialog(QDialog):
         self.settings.setValue("openrouter_api_key", self.openrouter_key.text())
         self.settings.setValue("stability_api_key", self.stability_key.text())
         self.settings.setValue("elevenlabs_api_key", self.elevenlabs_key.text())
+        self.settings.setValue("youtube_client_id", self.youtube_client_id.text())
+        self.settings.setValue("youtube_client_secret", self.youtube_client_secret.text())
+        self.settings.setValue("youtube_refresh_token", self.youtube_refresh_token.text())
 
         # Save voice ID
         self.settings.setValue("elevenlabs_voice_id", self.voice_id.text())
@@ -88,10 +136,20 @@ class SettingsDialog(QDialog):
         # Save language
         self.settings.setValue("script_language", self.language_combo.currentText())
 
+        # Save rendering options
+        self.settings.setValue("preview_mode", self.preview_mode_combo.currentData())
+        self.settings.setValue(
+            "renditions",
+            [name for name, check in self.rendition_checks.items() if check.isChecked()],
+        )
+
         # Update environment variables
         os.environ["OPENROUTER_API_KEY"] = self.openrouter_key.text()
         os.environ["STABILITY_API_KEY"] = self.stability_key.text()
         os.environ["ELEVENLABS_API_KEY"] = self.elevenlabs_key.text()
+        os.environ["YOUTUBE_CLIENT_ID"] = self.youtube_client_id.text()
+        os.environ["YOUTUBE_CLIENT_SECRET"] = self.youtube_client_secret.text()
+        os.environ["YOUTUBE_REFRESH_TOKEN"] = self.youtube_refresh_token.text()
         os.environ["ELEVENLABS_VOICE_ID"] = self.voice_id.text()
 
         self.accept()
@@ -5,7 +5,6 @@ from PyQt6.QtWidgets import (
     QDialog,
     QDialogButtonBox,
 )
-from script.generator import ScriptGenerator
 
 
 class TopicSuggestionDialog(QDialog):
@@ -39,6 +38,8 @@ class TopicSuggestionDialog(QDialog):
 
     def generate_topics(self):
         """Generate new topic suggestions"""
+        from script.generator import ScriptGenerator
+
         self.topic_list.clear()
 
         # Hardcoded list of topic categories
@@ -0,0 +1,150 @@
+from pathlib import Path
+from typing import List, Set
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, QRect, pyqtSignal
+from PyQt6.QtGui import QPixmap, QPen, QColor
+
+from gui.workers.ThumbnailLoader import ThumbnailLoader
+
+ImagePathRole = Qt.ItemDataRole.UserRole + 1
+ModifiedRole = Qt.ItemDataRole.UserRole + 2
+
+
+class GalleryModel(QAbstractListModel):
+    """One row per scene; thumbnails are requested only when a cell is painted"""
+
+    def __init__(self, thumbnail_loader: ThumbnailLoader, parent=None):
+        super().__init__(parent)
+        self.thumbnail_loader = thumbnail_loader
+        self.thumbnail_loader.thumbnail_ready.connect(self.on_thumbnail_ready)
+        self.images: List[str] = []
+        self.modified: Set[int] = set()
+        self.thumbnail_size = QSize(180, 320)
+        self.cache_dir = Path(".")
+
+    def set_images(self, images: List[str], thumbnail_size: QSize, cache_dir: Path):
+        """Replace the scenes shown in the gallery"""
+        self.beginResetModel()
+        self.images = list(images)
+        self.modified = set()
+        self.thumbnail_size = thumbnail_size
+        self.cache_dir = cache_dir
+        self.endResetModel()
+
+    def set_modified(self, modified: Set[int]):
+        """Mark which scenes have been modified since the last render"""
+        changed = self.modified ^ set(modified)
+        self.modified = set(modified)
+        for row in changed:
+            if 0 <= row < len(self.images):
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [ModifiedRole])
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.images)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.images):
+            return None
+
+        image_path = self.images[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"Scene {index.row() + 1}"
+        if role == Qt.ItemDataRole.DecorationRole:
+            if not Path(image_path).exists():
+                return None
+            return self.thumbnail_loader.request(
+                image_path,
+                self.thumbnail_size.width(),
+                self.thumbnail_size.height(),
+                self.cache_dir,
+            )
+        if role == ImagePathRole:
+            return image_path
+        if role == ModifiedRole:
+            return index.row() in self.modified
+        if role == Qt.ItemDataRole.SizeHintRole:
+            return self.thumbnail_size
+        return None
+
+    def on_thumbnail_ready(self, image_path: str, pixmap: QPixmap):
+        """Repaint the cells showing an image whose thumbnail just loaded"""
+        for row, path in enumerate(self.images):
+            if path == image_path:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class GalleryDelegate(QStyledItemDelegate):
+    """Paints a scene thumbnail with its selection / modified border"""
+
+    def sizeHint(self, option, index):
+        return index.data(Qt.ItemDataRole.SizeHintRole) or QSize(180, 320)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        rect = option.rect
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+
+        if pixmap is not None and not pixmap.isNull():
+            target = QRect(0, 0, pixmap.width(), pixmap.height())
+            target.moveCenter(rect.center())
+            painter.drawPixmap(target, pixmap)
+        else:
+            text = "Loading..." if Path(index.data(ImagePathRole)).exists() else "Missing image"
+            painter.setPen(QColor("gray"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+
+        if index.data(ModifiedRole):
+            pen = QPen(QColor("orange"), 2)  # Modified scenes
+        elif option.state & QStyle.StateFlag.State_Selected:
+            pen = QPen(QColor("blue"), 2)  # Selected scene
+        else:
+            pen = QPen(QColor("gray"), 1)  # Normal scenes
+        painter.setPen(pen)
+        painter.drawRect(rect.adjusted(1, 1, -1, -1))
+        painter.restore()
+
+
+class ImageGallery(QListView):
+    """Virtualized scene gallery; the view handles reflow on resize"""
+
+    scene_selected = pyqtSignal(int)
+
+    def __init__(self, thumbnail_loader: ThumbnailLoader, parent=None):
+        super().__init__(parent)
+        self.gallery_model = GalleryModel(thumbnail_loader, self)
+        self.setModel(self.gallery_model)
+        self.setItemDelegate(GalleryDelegate(self))
+
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setUniformItemSizes(True)
+        self.setSpacing(10)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+        self.selectionModel().selectionChanged.connect(self._on_selection_changed)
+
+    def _on_selection_changed(self, selected, deselected):
+        scene = self.selected_scene()
+        if scene is not None:
+            self.scene_selected.emit(scene)
+
+    def set_images(self, images: List[str], thumbnail_size: QSize, cache_dir: Path):
+        """Show the given scene images"""
+        self.gallery_model.set_images(images, thumbnail_size, cache_dir)
+
+    def set_modified(self, modified: Set[int]):
+        """Highlight modified scenes"""
+        self.gallery_model.set_modified(modified)
+
+    def clear(self):
+        """Remove all scenes"""
+        self.gallery_model.set_images([], self.gallery_model.thumbnail_size, Path("."))
+
+    def selected_scene(self):
+        """Index of the selected scene, or None"""
+        indexes = self.selectionModel().selectedIndexes()
+        return indexes[0].row() if indexes else None
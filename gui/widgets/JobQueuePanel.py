@@ -0,0 +1,111 @@
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QPushButton,
+    QProgressBar,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QAbstractItemView,
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+
+from gui.workers.JobQueue import JobQueue
+
+JOB_KIND_LABELS = {
+    "create": "Create",
+    "regenerate": "Regenerate",
+    "scene": "Scene update",
+}
+
+
+class JobQueuePanel(QWidget):
+    """Table of queued and running render jobs with per-job progress"""
+
+    job_activated = pyqtSignal(int)  # job id, on double click
+
+    def __init__(self, job_queue: JobQueue, parent=None):
+        super().__init__(parent)
+        self.job_queue = job_queue
+        self.rows = {}  # job id -> table row
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        header = QHBoxLayout()
+        header.addWidget(QLabel("Render Queue:"))
+        header.addStretch()
+        header.addWidget(QLabel("Parallel jobs:"))
+        self.concurrency_input = QSpinBox()
+        self.concurrency_input.setRange(1, 8)
+        self.concurrency_input.setValue(job_queue.max_concurrent)
+        header.addWidget(self.concurrency_input)
+        self.concurrency_input.valueChanged.connect(job_queue.set_max_concurrent)
+        self.clear_btn = QPushButton("Clear Finished")
+        self.clear_btn.clicked.connect(job_queue.clear_finished)
+        header.addWidget(self.clear_btn)
+        layout.addLayout(header)
+
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Job", "Status", "Progress", ""])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(2, 120)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.cellDoubleClicked.connect(self._on_double_clicked)
+        layout.addWidget(self.table)
+
+        job_queue.job_added.connect(self.add_job)
+        job_queue.job_changed.connect(self.update_job)
+        job_queue.job_removed.connect(self.remove_job)
+
+    def add_job(self, job_id: int):
+        job = self.job_queue.jobs[job_id]
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job_id] = row
+
+        title = QTableWidgetItem(f"{JOB_KIND_LABELS.get(job.kind, job.kind)}: {job.title}")
+        title.setData(Qt.ItemDataRole.UserRole, job_id)
+        self.table.setItem(row, 0, title)
+        self.table.setItem(row, 1, QTableWidgetItem(job.status))
+        progress_bar = QProgressBar()
+        progress_bar.setRange(0, 100)
+        self.table.setCellWidget(row, 2, progress_bar)
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(lambda: self.job_queue.cancel(job_id))
+        self.table.setCellWidget(row, 3, cancel_btn)
+        self.update_job(job_id)
+
+    def update_job(self, job_id: int):
+        job = self.job_queue.jobs.get(job_id)
+        row = self.rows.get(job_id)
+        if job is None or row is None:
+            return
+        self.table.item(row, 1).setText(job.status)
+        self.table.item(row, 1).setToolTip(job.status)
+        self.table.cellWidget(row, 2).setValue(job.progress)
+        self.table.cellWidget(row, 3).setEnabled(
+            job.state in ("queued", "running") and job.status != "Cancelling...")
+
+    def remove_job(self, job_id: int):
+        row = self.rows.pop(job_id, None)
+        if row is None:
+            return
+        self.table.removeRow(row)
+        self.rows = {
+            other: other_row - 1 if other_row > row else other_row
+            for other, other_row in self.rows.items()
+        }
+
+    def _on_double_clicked(self, row: int, column: int):
+        item = self.table.item(row, 0)
+        if item:
+            self.job_activated.emit(item.data(Qt.ItemDataRole.UserRole))
@@ -0,0 +1,149 @@
+import itertools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from project.project import Project
+from telemetry.metrics import QUEUE_DEPTH
+from gui.workers.VideoWorker import VideoWorker
+
+
+@dataclass
+class RenderJob:
+    """A queued create, regenerate or scene-update job"""
+    id: int
+    kind: str  # "create", "regenerate" or "scene"
+    title: str
+    project: Project
+    method: Callable  # method(creator, project, progress_callback, preview_callback)
+    scene: Optional[int] = None
+    status: str = "Queued"
+    progress: int = 0
+    state: str = "queued"  # "queued", "running", "done", "failed" or "cancelled"
+    worker: Optional[VideoWorker] = field(default=None, repr=False)
+
+
+class JobQueue(QObject):
+    """Runs render jobs with bounded concurrency.
+
+    Jobs for the same project always run one after another because they
+    share the project's files; jobs for different projects run in parallel
+    up to max_concurrent. Each job gets its own VideoCreator so progress
+    de-duplication and generator state are never shared between jobs.
+    """
+
+    job_added = pyqtSignal(int)
+    job_changed = pyqtSignal(int)  # status or progress changed
+    job_preview = pyqtSignal(int, str)  # job id, playable preview path
+    job_finished = pyqtSignal(int, bool)  # also emitted for cancelled jobs, with False
+    job_removed = pyqtSignal(int)
+
+    def __init__(self, max_concurrent: int = 2, parent=None):
+        super().__init__(parent)
+        self.max_concurrent = max(1, max_concurrent)
+        self.jobs: Dict[int, RenderJob] = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, kind: str, title: str, project: Project, method: Callable,
+               scene: Optional[int] = None) -> RenderJob:
+        """Queue a job and start it as soon as a slot is free"""
+        job = RenderJob(next(self._ids), kind, title, project, method, scene)
+        self.jobs[job.id] = job
+        self.job_added.emit(job.id)
+        self._schedule()
+        return job
+
+    def set_max_concurrent(self, value: int) -> None:
+        """Change how many jobs may run at once"""
+        self.max_concurrent = max(1, value)
+        self._schedule()
+
+    def cancel(self, job_id: int) -> None:
+        """Cancel a queued job, or stop a running one and clean up its outputs"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        if job.state == "queued":
+            job.state = "cancelled"
+            job.status = "Cancelled"
+            self._report_depth()
+            self.job_changed.emit(job_id)
+            self.job_finished.emit(job_id, False)
+        elif job.state == "running":
+            job.status = "Cancelling..."
+            self.job_changed.emit(job_id)
+            job.worker.cancel()
+
+    def cancel_all(self) -> None:
+        for job_id in list(self.jobs):
+            self.cancel(job_id)
+
+    def running(self) -> List[RenderJob]:
+        return [job for job in self.jobs.values() if job.state == "running"]
+
+    def is_busy(self, project_id: str) -> bool:
+        """Whether a job for the project is queued or running"""
+        return any(
+            job.project.id == project_id and job.state in ("queued", "running")
+            for job in self.jobs.values()
+        )
+
+    def clear_finished(self) -> None:
+        """Forget jobs that are no longer queued or running"""
+        finished = ("done", "failed", "cancelled")
+        for job_id in [i for i, job in self.jobs.items() if job.state in finished]:
+            del self.jobs[job_id]
+            self.job_removed.emit(job_id)
+
+    def _schedule(self) -> None:
+        busy_projects = {job.project.id for job in self.running()}
+        free = self.max_concurrent - len(busy_projects)
+        for job in self.jobs.values():
+            if free <= 0:
+                break
+            if job.state != "queued" or job.project.id in busy_projects:
+                continue
+            self._start(job)
+            busy_projects.add(job.project.id)
+            free -= 1
+        self._report_depth()
+
+    def _report_depth(self) -> None:
+        queued = sum(job.state == "queued" for job in self.jobs.values())
+        QUEUE_DEPTH.set(queued, "render")
+
+    def _start(self, job: RenderJob) -> None:
+        from video.creator import VideoCreator
+
+        job.state = "running"
+        job.status = "Starting..."
+        job.worker = VideoWorker(VideoCreator(), job.project, job.method)
+        job.worker.progress.connect(lambda status, value: self._on_progress(job.id, status, value))
+        job.worker.preview_ready.connect(lambda path: self.job_preview.emit(job.id, path))
+        job.worker.finished.connect(lambda success: self._on_finished(job.id, success))
+        self.job_changed.emit(job.id)
+        job.worker.start()
+
+    def _on_progress(self, job_id: int, status: str, value: int) -> None:
+        job = self.jobs.get(job_id)
+        if job:
+            job.status = status
+            job.progress = max(0, min(100, value))
+            self.job_changed.emit(job_id)
+
+    def _on_finished(self, job_id: int, success: bool) -> None:
+        job = self.jobs.get(job_id)
+        if not job:
+            return
+        if job.worker.cancelled:
+            job.state = "cancelled"
+            job.status = "Cancelled"
+        else:
+            job.state = "done" if success else "failed"
+            job.status = "Done" if success else "Failed"
+        if success:
+            job.progress = 100
+        job.worker = None
+        self.job_changed.emit(job_id)
+        self.job_finished.emit(job_id, success)
+        self._schedule()
@@ -0,0 +1,115 @@
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QThread, Qt, pyqtSignal
+from PyQt6.QtGui import QImage, QPixmap
+
+
+class ThumbnailSignals(QObject):
+    ready = pyqtSignal(str, str, QImage)  # image path, cache key, thumbnail
+
+
+class ThumbnailTask(QRunnable):
+    """Decode and scale one image off the GUI thread, using the disk cache"""
+
+    def __init__(self, image_path: str, key: str, cache_path: Path, width: int, height: int,
+                 signals: ThumbnailSignals):
+        super().__init__()
+        self.image_path = image_path
+        self.key = key
+        self.cache_path = cache_path
+        self.width = width
+        self.height = height
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+        try:
+            if self.cache_path.exists():
+                image = QImage(str(self.cache_path))
+
+            if image.isNull():
+                source = QImage(str(Path(self.image_path).absolute()))
+                if not source.isNull():
+                    image = source.scaled(
+                        self.width,
+                        self.height,
+                        Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation,
+                    )
+                    self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                    image.save(str(self.cache_path), "PNG")
+        except Exception as e:
+            print(f"Error creating thumbnail for {self.image_path}: {e}")
+
+        self.signals.ready.emit(self.image_path, self.key, image)
+
+
+class ThumbnailLoader(QObject):
+    """Produces gallery thumbnails on a thread pool.
+
+    Thumbnails are written once to a per-project disk cache keyed by source
+    path, mtime, size and thumbnail dimensions, and the most recently used
+    pixmaps are kept in memory across project switches.
+    """
+
+    thumbnail_ready = pyqtSignal(str, QPixmap)  # image path, thumbnail
+
+    def __init__(self, max_cached: int = 512, parent=None):
+        super().__init__(parent)
+        self.max_cached = max_cached
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(2, QThread.idealThreadCount() // 2))
+        self._cache: OrderedDict[str, QPixmap] = OrderedDict()
+        self._pending = set()
+        self._signals = ThumbnailSignals()
+        self._signals.ready.connect(self._on_ready)
+
+    @staticmethod
+    def cache_key(image_path: str, width: int, height: int) -> Optional[str]:
+        """Key identifying a thumbnail of the current contents of image_path"""
+        try:
+            stat = Path(image_path).stat()
+        except OSError:
+            return None
+        return f"{Path(image_path).absolute()}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+
+    def request(self, image_path: str, width: int, height: int, cache_dir: Path) -> Optional[QPixmap]:
+        """Return a cached thumbnail, or schedule one and return None.
+
+        Scheduled thumbnails are delivered through thumbnail_ready.
+        """
+        key = self.cache_key(image_path, width, height)
+        if key is None:
+            return None
+
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+            return pixmap
+
+        if key not in self._pending:
+            self._pending.add(key)
+            cache_path = Path(cache_dir) / f"{hashlib.sha1(key.encode()).hexdigest()}.png"
+            self.pool.start(ThumbnailTask(image_path, key, cache_path, width, height, self._signals))
+        return None
+
+    def _on_ready(self, image_path: str, key: str, image: QImage):
+        """Runs on the GUI thread, where pixmaps can be created"""
+        self._pending.discard(key)
+        if image.isNull():
+            print(f"Error loading image {image_path}")
+            return
+
+        pixmap = QPixmap.fromImage(image)
+        self._cache[key] = pixmap
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        self.thumbnail_ready.emit(image_path, pixmap)
+
+    def clear(self):
+        """Drop in-memory thumbnails and cancel queued work"""
+        self.pool.clear()
+        self._pending.clear()
+        self._cache.clear()
@@ -1,25 +1,58 @@
-from PyQt6.QtCore import QThread, pyqtSignal
+from concurrent.futures import CancelledError, Future
+from PyQt6.QtCore import QObject, pyqtSignal
 from video.creator import VideoCreator
 from project.project import Project
-import asyncio
-from typing import Callable
+from typing import Callable, Optional
 
+from runtime.asyncio_runtime import get_runtime
+from runtime.cancellation import run_cancellable
+
+
+class VideoWorker(QObject):
+    """Runs one render job on the shared asyncio runtime.
+
+    Signals are emitted from the runtime thread and delivered to GUI-thread
+    receivers as queued calls.
+    """
 
-class VideoWorker(QThread):
     progress = pyqtSignal(str, int)
+    preview_ready = pyqtSignal(str)  # Path of a playable preview render
     finished = pyqtSignal(bool)
 
-    def __init__(self, creator: VideoCreator, project: Project, method: Callable):
-        super().__init__()
+    def __init__(self, creator: VideoCreator, project: Project, method: Callable, parent=None):
+        super().__init__(parent)
         self.creator = creator
         self.project = project
         self.method = method
+        self.future: Optional[Future] = None
+        self.cancelled = False
+
+    def start(self):
+        """Submit the job's coroutine to the runtime"""
+        self.future = get_runtime().submit(run_cancellable(
+            self.method(self.creator, self.project, self.progress.emit, self.preview_ready.emit),
+            self.creator.cancel_token,
+        ))
+        self.future.add_done_callback(self._on_done)
+
+    def cancel(self):
+        """Stop the job: kills its ffmpeg processes and aborts pending requests.
 
-    def run(self):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        finished is emitted once the job has stopped and cleaned up.
+        """
+        self.creator.cancel_token.cancel()
 
-        success = loop.run_until_complete(self.method(self.project, self.progress.emit))
+    def isRunning(self) -> bool:
+        return self.future is not None and not self.future.done()
 
-        loop.close()
+    def _on_done(self, future: Future):
+        try:
+            success = bool(future.result())
+        except CancelledError:
+            self.cancelled = True
+            self.progress.emit("Cancelled", 0)
+            success = False
+        except Exception as e:
+            print(f"Error in video worker: {e}")
+            success = False
         self.finished.emit(success)
@@ -3,11 +3,18 @@ import httpx
 from pathlib import Path
 from typing import Optional, List, Tuple
 
+from runtime.asyncio_runtime import http_client
+from runtime.rate_scheduler import send_scheduled
+from telemetry.metrics import count_cache, provider_request
+from telemetry.tracing import span
+
 
 class ImageGenerator:
     def __init__(self):
         self.api_key = os.getenv("STABILITY_API_KEY")
-        self.api_url = "https://api.stability.ai/v2beta/stable-image/generate/core"
+        self.api_url = os.getenv(
+            "STABILITY_API_URL", "https://api.stability.ai/v2beta/stable-image/generate/core"
+        )
 
     async def generate_image(self, prompt: str, output_path: Path) -> Tuple[Optional[str], Optional[str]]:
         """Generate a single image using Stability AI"""
@@ -42,50 +49,65 @@ class ImageGenerator:
                 "style_preset": (None, data["style_preset"])
             }
 
-            async with httpx.AsyncClient() as client:
-                try:
+            client = http_client()
+
+            async def send():
+                with span("image_request", "api", aspect_ratio=aspect_ratio) as request_span, \
+                        provider_request("image") as request:
                     response = await client.post(
                         self.api_url,
                         headers=headers,
                         files=files,  # Use files parameter for multipart/form-data
                         timeout=60.0
                     )
-                except httpx.TimeoutException:
-                    return None, "Request timed out while generating image"
-                except httpx.RequestError as e:
-                    return None, f"Network error while generating image: {str(e)}"
-
-                if response.status_code == 200:
-                    try:
-                        # Create output directory if it doesn't exist
-                        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-                        # Save the image
-                        with open(output_path, "wb") as f:
-                            f.write(response.content)
-
-                        return str(output_path), None
-                    except Exception as e:
-                        return None, f"Error saving generated image: {str(e)}"
-                elif response.status_code == 401:
-                    return None, "Invalid API key. Please check your Stability API key."
-                elif response.status_code == 429:
-                    return None, "Rate limit exceeded. Please try again later."
-                else:
-                    error_msg = f"Image generation failed with status {response.status_code}"
-                    try:
-                        error_data = response.json()
-                        if isinstance(error_data, dict) and "message" in error_data:
-                            error_msg += f": {error_data['message']}"
-                    except:
-                        pass
-                    return None, error_msg
+                    request.status = response.status_code
+                    request_span.set(status=response.status_code, bytes=len(response.content))
+                return response
+
+            try:
+                # Throttled requests are retried after the provider's Retry-After
+                response = await send_scheduled("image", send)
+            except httpx.TimeoutException:
+                return None, "Request timed out while generating image"
+            except httpx.RequestError as e:
+                return None, f"Network error while generating image: {str(e)}"
+
+            if response.status_code == 200:
+                try:
+                    # Create output directory if it doesn't exist
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+                    # Save the image
+                    with open(output_path, "wb") as f:
+                        f.write(response.content)
+
+                    return str(output_path), None
+                except Exception as e:
+                    return None, f"Error saving generated image: {str(e)}"
+            elif response.status_code == 401:
+                return None, "Invalid API key. Please check your Stability API key."
+            elif response.status_code == 429:
+                return None, "Rate limit exceeded. Please try again later."
+            else:
+                error_msg = f"Image generation failed with status {response.status_code}"
+                try:
+                    error_data = response.json()
+                    if isinstance(error_data, dict) and "message" in error_data:
+                        error_msg += f": {error_data['message']}"
+                except:
+                    pass
+                return None, error_msg
 
         except Exception as e:
             return None, f"Unexpected error generating image: {str(e)}"
 
-    async def generate_project_images(self, project_id: str, descriptions: List[str], is_short: bool = True) -> Tuple[List[str], Optional[str]]:
-        """Generate all images for a project"""
+    async def generate_project_images(self, project_id: str, descriptions: List[str], is_short: bool = True,
+                                      skip_existing: bool = False) -> Tuple[List[str], Optional[str]]:
+        """Generate all images for a project
+
+        With skip_existing, scenes whose image is already on disk (for example
+        from a cancelled run) are reused instead of being generated again.
+        """
         generated_images = []
 
         # Define aspect ratio based on video type
@@ -95,6 +117,12 @@ class ImageGenerator:
 
         for i, description in enumerate(descriptions):
             output_path = Path(f"projects/{project_id}/images/scene{i+1}-image.webp")
+            if skip_existing and output_path.exists() and output_path.stat().st_size > 0:
+                print(f"Reusing existing image for scene {i+1}")
+                count_cache("image", hits=1)
+                with span("image", scene=i + 1, cache_hit=True):
+                    generated_images.append(str(output_path))
+                continue
 
             # Add style, quality and aspect ratio prompts to the description
             enhanced_prompt = (
@@ -103,7 +131,9 @@ class ImageGenerator:
                 "high quality"
             )
 
-            image_path, error = await self.generate_image(enhanced_prompt, output_path)
+            count_cache("image", misses=1)
+            with span("image", scene=i + 1, cache_hit=False):
+                image_path, error = await self.generate_image(enhanced_prompt, output_path)
             if image_path:
                 generated_images.append(image_path)
             else:
@@ -1,9 +1,173 @@
 import sys
 import os
+import subprocess
+from pathlib import Path
 from dotenv import load_dotenv
-from gui.MainWindow import main
+
+# Cold-start import budget for the GUI entry point, in milliseconds
+STARTUP_IMPORT_BUDGET_MS = int(os.getenv("VIDEOFORGE_STARTUP_BUDGET_MS", "1500"))
+
+# Heavy optional subsystems that must only be imported on first use
+LAZY_MODULES = [
+    "undetected_chromedriver",
+    "selenium",
+    "httpx",
+    "upload.youtube",
+    "script.generator",
+    "image.generator",
+    "audio.generator",
+    "video.combiner",
+]
+
+
+def import_trace(statement: str) -> tuple:
+    """Run statement in a fresh interpreter under -X importtime.
+
+    Returns (rows, error): rows are (cumulative us, self us, depth, module)
+    per import, and error is the child's stderr if it failed, else None.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=Path(__file__).resolve().parent,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return [], result.stderr
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    return rows, None
+
+
+def import_time_ms(rows: list) -> float:
+    """Total import time of a trace, from its top-level imports"""
+    return sum(cumulative for cumulative, _, depth, _ in rows if depth == 0) / 1000
+
+
+def eager_imports(rows: list) -> list:
+    """Modules of LAZY_MODULES (or their submodules) found in a trace"""
+    return sorted({
+        name for _, _, _, name in rows
+        if any(name == module or name.startswith(module + ".") for module in LAZY_MODULES)
+    })
+
+
+def profile_startup(top: int = 20) -> int:
+    """Print an import-time breakdown of the GUI entry point.
+
+    Returns a non-zero exit code when the cold-start import budget is
+    exceeded or one of LAZY_MODULES is imported eagerly.
+    """
+    rows, error = import_trace("import gui.MainWindow")
+    if error is not None:
+        print(error)
+        return 1
+
+    total_ms = import_time_ms(rows)
+    eager = eager_imports(rows)
+
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_us, depth, name in sorted(rows, reverse=True)[:top]:
+        print(f"{cumulative / 1000:9.1f} ms {self_us / 1000:7.1f} ms  {'  ' * depth}{name}")
+    print(f"\nTotal import time: {total_ms:.1f} ms (budget {STARTUP_IMPORT_BUDGET_MS} ms)")
+
+    failed = False
+    if total_ms > STARTUP_IMPORT_BUDGET_MS:
+        print("Error: Startup import budget exceeded")
+        failed = True
+    if eager:
+        print("Error: Optional subsystems imported at startup:")
+        for name in eager:
+            print(f"- {name}")
+        failed = True
+    return 1 if failed else 0
+
+
+def run_headless(argv: list) -> int:
+    """Render a project without the GUI.
+
+    SIGINT or SIGTERM cancels the job the same way the GUI's Cancel button
+    does: ffmpeg is killed, pending API requests are aborted and temp
+    outputs are removed, while finished scenes are kept so that
+    `recreate` can resume the project later. Returns 130 when cancelled.
+    """
+    import argparse
+    import asyncio
+    import signal
+    from project.project import ProjectManager
+    from runtime.cancellation import CancellationToken, run_cancellable
+    from video.creator import VideoCreator
+
+    parser = argparse.ArgumentParser(prog="main.py --headless")
+    commands = parser.add_subparsers(dest="command", required=True)
+    create = commands.add_parser("create", help="create a new project and render it")
+    create.add_argument("subject")
+    create.add_argument("--duration", type=int, default=60)
+    create.add_argument("--language", default="Romanian")
+    recreate = commands.add_parser("recreate", help="re-render an existing project")
+    recreate.add_argument("project_id")
+    upload = commands.add_parser("upload", help="upload a rendered project with the YouTube Data API")
+    upload.add_argument("project_id")
+    args = parser.parse_args(argv)
+
+    manager = ProjectManager()
+    if args.command == "create":
+        project = manager.create_project(args.subject, args.duration)
+        project.title = args.subject
+        project.save()
+    else:
+        project = manager.get_project(args.project_id)
+        if not project:
+            print(f"Error: Project {args.project_id} not found")
+            return 1
+    print(f"Project {project.id}: {project.subject}")
+
+    token = CancellationToken()
+    creator = VideoCreator(cancel_token=token)
+
+    def progress(message: str, value: int):
+        print(f"[{value:3d}%] {message}")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, token.cancel)
+
+        if args.command == "create":
+            creator.script_generator.language = args.language
+            job = creator.create_video(project, progress)
+        elif args.command == "upload":
+            from upload.youtube_api import YouTubeApiUploader
+
+            def upload_progress(sent: int, total: int):
+                progress(f"Uploaded {sent} of {total} bytes", sent * 100 // max(total, 1))
+
+            job = YouTubeApiUploader().upload_project(project, upload_progress)
+        else:
+            job = creator.recreate_video(project, progress)
+        return await run_cancellable(job, token)
+
+    try:
+        success = asyncio.run(run())
+    except asyncio.CancelledError:
+        resume = "upload" if args.command == "upload" else "recreate"
+        print(f"Cancelled; run `main.py --headless {resume} {project.id}` to resume")
+        return 130
+    return 0 if success else 1
+
 
 if __name__ == "__main__":
+    # Print the import-time breakdown without starting the GUI
+    if "--profile-startup" in sys.argv:
+        sys.exit(profile_startup())
+
     # Load environment variables from .env file
     load_dotenv()
 
@@ -21,5 +185,17 @@ if __name__ == "__main__":
             print(f"- {var}")
         sys.exit(1)
 
+    # Optional Prometheus endpoint for unattended runs
+    if os.getenv("VIDEOFORGE_METRICS_PORT"):
+        from telemetry.metrics import start_from_environment
+        start_from_environment()
+
+    # Render from the command line instead of opening the window
+    if "--headless" in sys.argv:
+        argv = sys.argv[1:]
+        argv.remove("--headless")
+        sys.exit(run_headless(argv))
+
     # Start the application
+    from gui.MainWindow import main
     main()
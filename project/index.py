@@ -0,0 +1,171 @@
+import os
+import json
+import threading
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Optional
+from pathlib import Path
+
+from project.storage import atomic_write
+
+
+@dataclass
+class ProjectSummary:
+    """Lightweight row describing a project, used by list views"""
+    id: str
+    title: str
+    subject: str
+    duration: int
+    output_path: str
+    created_at: float
+    updated_at: float
+    mtime: int  # project.json mtime (ns) the row was built from
+
+    @classmethod
+    def from_dict(cls, data: dict, mtime: int) -> 'ProjectSummary':
+        """Build a summary from a project.json payload"""
+        return cls(
+            id=str(data["id"]),
+            title=data.get("title", ""),
+            subject=data.get("subject", ""),
+            duration=data.get("duration", 0),
+            output_path=data.get("output_path", ""),
+            created_at=data.get("created_at", 0.0),
+            updated_at=data.get("updated_at", 0.0),
+            mtime=mtime,
+        )
+
+
+class ProjectIndex:
+    """Persistent index of project summaries kept current by mtime validation.
+
+    Only project.json files whose mtime changed since the last refresh are
+    parsed again, so listing thousands of projects costs one stat per project.
+    Saves reported through update() are applied in memory and persisted on
+    the next refresh.
+    """
+
+    VERSION = 1
+
+    def __init__(self, projects_dir: Path):
+        self.projects_dir = projects_dir
+        self.index_path = projects_dir / ".index.json"
+        self._by_id: Dict[str, ProjectSummary] = {}
+        self._by_subject: Dict[str, List[str]] = {}
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        """Load the index file, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return
+            names = [field.name for field in fields(ProjectSummary)]
+            for row in data["projects"]:
+                self._put(ProjectSummary(**dict(zip(names, row))))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading project index, rebuilding: {e}")
+            self._by_id.clear()
+            self._by_subject.clear()
+
+    def _save(self) -> None:
+        """Write the index file atomically in a compact row format"""
+        data = {
+            "version": self.VERSION,
+            "projects": [list(asdict(s).values()) for s in self._by_id.values()],
+        }
+        try:
+            atomic_write(self.index_path, json.dumps(data, separators=(",", ":")))
+            self._dirty = False
+        except Exception as e:
+            print(f"Error saving project index: {e}")
+
+    def _put(self, summary: ProjectSummary) -> None:
+        self._drop(summary.id)
+        self._by_id[summary.id] = summary
+        self._by_subject.setdefault(summary.subject.lower(), []).append(summary.id)
+
+    def _drop(self, project_id: str) -> Optional[ProjectSummary]:
+        summary = self._by_id.pop(project_id, None)
+        if summary:
+            ids = self._by_subject.get(summary.subject.lower(), [])
+            if project_id in ids:
+                ids.remove(project_id)
+            if not ids:
+                self._by_subject.pop(summary.subject.lower(), None)
+        return summary
+
+    def _read_summary(self, project_id: str, mtime: int) -> Optional[ProjectSummary]:
+        try:
+            with open(self.projects_dir / project_id / "project.json") as f:
+                return ProjectSummary.from_dict(json.load(f), mtime)
+        except Exception as e:
+            print(f"Error indexing project {project_id}: {e}")
+            return None
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the projects directory"""
+        with self._lock:
+            seen = set()
+
+            with os.scandir(self.projects_dir) as entries:
+                for entry in entries:
+                    if not entry.is_dir():
+                        continue
+                    try:
+                        mtime = os.stat(os.path.join(entry.path, "project.json")).st_mtime_ns
+                    except OSError:
+                        continue
+
+                    seen.add(entry.name)
+                    current = self._by_id.get(entry.name)
+                    if current and current.mtime == mtime:
+                        continue
+
+                    summary = self._read_summary(entry.name, mtime)
+                    if summary:
+                        self._put(summary)
+                        self._dirty = True
+
+            for project_id in set(self._by_id) - seen:
+                self._drop(project_id)
+                self._dirty = True
+
+            if self._dirty:
+                self._save()
+
+    def update(self, project_data: dict, mtime: int) -> None:
+        """Record a project that was just saved without waiting for a refresh"""
+        with self._lock:
+            self._put(ProjectSummary.from_dict(project_data, mtime))
+            self._dirty = True
+
+    def remove(self, project_id: str) -> None:
+        """Forget a deleted project"""
+        with self._lock:
+            if self._drop(project_id):
+                self._dirty = True
+
+    def get(self, project_id: str) -> Optional[ProjectSummary]:
+        """Look up a summary by project ID"""
+        with self._lock:
+            return self._by_id.get(project_id)
+
+    def find_by_subject(self, subject: str) -> List[ProjectSummary]:
+        """Look up summaries by subject, ignoring case"""
+        with self._lock:
+            return [self._by_id[i] for i in self._by_subject.get(subject.lower(), [])]
+
+    def summaries(self) -> List[ProjectSummary]:
+        """All summaries, newest first"""
+        with self._lock:
+            return sorted(self._by_id.values(), key=lambda s: s.created_at, reverse=True)
+
+    def mtimes(self) -> Dict[str, int]:
+        """Map of project ID to the project.json mtime each row was built from"""
+        with self._lock:
+            return {project_id: s.mtime for project_id, s in self._by_id.items()}
@@ -1,10 +1,42 @@
 import json
 import time
 import shutil
+import threading
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable
 from pathlib import Path
 
+from project.index import ProjectIndex, ProjectSummary
+from project.search import SearchIndex
+from project.storage import atomic_write
+
+# Callbacks notified with (payload, mtime) after every Project.save
+_save_listeners: List[Callable] = []
+
+
+def add_save_listener(callback: Callable[[dict, int], None]) -> None:
+    """Register a callback run after each project save.
+
+    Bound methods are held weakly so listeners die with their owner.
+    """
+    if hasattr(callback, "__self__"):
+        _save_listeners.append(weakref.WeakMethod(callback))
+    else:
+        _save_listeners.append(lambda: callback)
+
+
+def _notify_saved(data: dict, mtime: int) -> None:
+    for ref in list(_save_listeners):
+        callback = ref()
+        if callback is None:
+            _save_listeners.remove(ref)
+            continue
+        try:
+            callback(data, mtime)
+        except Exception as e:
+            print(f"Error in project save listener: {e}")
 
 @dataclass
 class Project:
@@ -20,6 +52,18 @@ class Project:
     updated_at: float
     metadata: Dict[str, any]
 
+    def __post_init__(self):
+        # Runtime-only state, not part of project.json
+        self._lock = threading.RLock()
+        self._batch_depth = 0
+        self._dirty = False
+        self._compact = False
+        # Saves serialize outside _lock; the write lock and generations keep
+        # an older snapshot from landing on disk after a newer one
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        self._written_generation = 0
+
     @classmethod
     def create(cls, subject: str, duration: int) -> 'Project':
         """Create a new project instance"""
@@ -46,10 +90,11 @@ class Project:
 
     def to_dict(self) -> dict:
         """Convert project to dictionary format"""
-        return asdict(self)
+        with self._lock:
+            return asdict(self)
 
-    def save(self) -> None:
-        """Save project state to disk"""
+    def save(self, compact: bool = False) -> None:
+        """Save project state to disk atomically"""
         # Create project directory structure
         project_dir = Path(f"projects/{self.id}")
         project_dir.mkdir(parents=True, exist_ok=True)
@@ -57,10 +102,47 @@ class Project:
         for subdir in ['images', 'audio', 'temp']:
             (project_dir / subdir).mkdir(exist_ok=True)
 
+        # Snapshot under the lock, serialize and write outside it
+        with self._lock:
+            data = self.to_dict()
+            self._dirty = False
+            self._generation += 1
+            generation = self._generation
+        if compact or self._compact:
+            content = json.dumps(data, separators=(",", ":"))
+        else:
+            content = json.dumps(data, indent=2)
+
         # Save project metadata
         metadata_path = project_dir / "project.json"
-        with open(metadata_path, 'w') as f:
-            json.dump(self.to_dict(), f, indent=2)
+        with self._write_lock:
+            if generation < self._written_generation:
+                return  # A newer snapshot is already on disk
+            atomic_write(metadata_path, content)
+            _notify_saved(data, metadata_path.stat().st_mtime_ns)
+            self._written_generation = generation
+
+    @contextmanager
+    def batch(self, compact: bool = False):
+        """Coalesce updates made inside the block into a single save.
+
+        Blocks may be nested; the project is written once when the outermost
+        block exits, and only if something changed.
+        """
+        with self._lock:
+            self._batch_depth += 1
+            if compact:
+                self._compact = True
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                flush = self._batch_depth == 0 and self._dirty
+                if self._batch_depth == 0:
+                    compact, self._compact = self._compact, False
+            if flush:
+                self.save(compact=compact)
 
     @classmethod
     def load(cls, project_id: str) -> Optional['Project']:
@@ -78,8 +160,12 @@ class Project:
             return None
 
     def update(self) -> None:
-        """Update project timestamp and save"""
-        self.updated_at = time.time()
+        """Update project timestamp and save, deferring the save inside batch()"""
+        with self._lock:
+            self.updated_at = time.time()
+            if self._batch_depth:
+                self._dirty = True
+                return
         self.save()
 
     def add_image(self, image_path: str) -> None:
@@ -112,16 +198,49 @@ class ProjectManager:
     def __init__(self):
         self.projects_dir = Path("projects")
         self.projects_dir.mkdir(exist_ok=True)
+        self.index = ProjectIndex(self.projects_dir)
+        self.search_index = SearchIndex(self.projects_dir)
+        add_save_listener(self._on_project_saved)
+
+    def _on_project_saved(self, data: dict, mtime: int) -> None:
+        """Keep the indexes current as projects are saved"""
+        self.index.update(data, mtime)
+        self.search_index.update(data, mtime)
+
+    def list_summaries(self) -> List[ProjectSummary]:
+        """List summaries of all projects without loading them"""
+        self.index.refresh()
+        return self.index.summaries()
+
+    def get_summary(self, project_id: str) -> Optional[ProjectSummary]:
+        """Get the summary of a specific project by ID"""
+        return self.index.get(project_id)
+
+    def find_by_subject(self, subject: str) -> List[ProjectSummary]:
+        """Find project summaries with the given subject (case-insensitive)"""
+        self.index.refresh()
+        return self.index.find_by_subject(subject)
+
+    def search(self, query: str) -> List[ProjectSummary]:
+        """Full-text search over titles, subjects, scripts and descriptions.
+
+        Relies on the summaries already listed rather than rescanning the
+        projects directory, so it is cheap enough to run on every keystroke.
+        """
+        self.search_index.sync(self.index.mtimes())
+        summaries = [self.index.get(i) for i in self.search_index.search(query)]
+        return sorted(
+            (s for s in summaries if s), key=lambda s: s.created_at, reverse=True
+        )
 
     def list_projects(self) -> List[Project]:
         """List all available projects"""
         projects = []
-        for project_dir in self.projects_dir.iterdir():
-            if project_dir.is_dir():
-                project = Project.load(project_dir.name)
-                if project:
-                    projects.append(project)
-        return sorted(projects, key=lambda p: p.created_at, reverse=True)
+        for summary in self.list_summaries():
+            project = Project.load(summary.id)
+            if project:
+                projects.append(project)
+        return projects
 
     def get_project(self, project_id: str) -> Optional[Project]:
         """Get a specific project by ID"""
@@ -140,6 +259,8 @@ class ProjectManager:
             if project_dir.exists():
                 # Use shutil.rmtree to recursively delete directory and contents
                 shutil.rmtree(project_dir)
+                self.index.remove(project_id)
+                self.search_index.remove(project_id)
                 return True
             return False
         except Exception as e:
@@ -0,0 +1,181 @@
+import re
+import json
+import bisect
+import threading
+import unicodedata
+from typing import List, Dict, Set, Iterable, Optional
+from pathlib import Path
+
+from project.storage import atomic_write
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase text and strip diacritics (ș, ş, ț, ţ, ă, â, î -> s, t, a, i)"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized search tokens"""
+    return [t for t in TOKEN_PATTERN.findall(normalize(text)) if len(t) > 1]
+
+
+def project_text(data: dict) -> Iterable[str]:
+    """Searchable fields of a project.json payload"""
+    metadata = data.get("metadata") or {}
+    yield data.get("title") or ""
+    yield data.get("subject") or ""
+    yield from data.get("scripts") or []
+    yield from metadata.get("image_descriptions") or []
+    yield metadata.get("youtube_description") or ""
+
+
+class SearchIndex:
+    """Inverted index over project titles, subjects, scripts and descriptions.
+
+    Documents are validated against the project.json mtime recorded in the
+    project index, so only changed projects are re-tokenized. The index is
+    loaded from disk on the first query, not at startup.
+    """
+
+    VERSION = 1
+
+    def __init__(self, projects_dir: Path):
+        self.projects_dir = projects_dir
+        self.index_path = projects_dir / ".search.json"
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._dirty = False
+        self._docs: Dict[str, tuple] = {}  # id -> (mtime, tokens)
+        self._postings: Dict[str, Set[str]] = {}
+        self._vocabulary: Optional[List[str]] = None
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION:
+                for project_id, (mtime, tokens) in data["docs"].items():
+                    self._add(project_id, mtime, tokens)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading search index, rebuilding: {e}")
+            self._docs.clear()
+            self._postings.clear()
+
+    def _save(self) -> None:
+        data = {"version": self.VERSION, "docs": self._docs}
+        try:
+            atomic_write(self.index_path, json.dumps(data, separators=(",", ":")))
+            self._dirty = False
+        except Exception as e:
+            print(f"Error saving search index: {e}")
+
+    def _add(self, project_id: str, mtime: int, tokens: List[str]) -> None:
+        self._remove(project_id)
+        self._docs[project_id] = (mtime, tokens)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = {project_id}
+                self._vocabulary = None
+            else:
+                postings.add(project_id)
+
+    def _remove(self, project_id: str) -> None:
+        doc = self._docs.pop(project_id, None)
+        if not doc:
+            return
+        for token in doc[1]:
+            postings = self._postings.get(token)
+            if postings:
+                postings.discard(project_id)
+                if not postings:
+                    del self._postings[token]
+                    self._vocabulary = None
+
+    def _read_tokens(self, project_id: str) -> Optional[List[str]]:
+        try:
+            with open(self.projects_dir / project_id / "project.json") as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error indexing project {project_id} for search: {e}")
+            return None
+        return sorted({t for text in project_text(data) for t in tokenize(text)})
+
+    def update(self, data: dict, mtime: int) -> None:
+        """Index a project payload that was just saved"""
+        tokens = sorted({t for text in project_text(data) for t in tokenize(text)})
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._add(str(data["id"]), mtime, tokens)
+            self._dirty = True
+
+    def remove(self, project_id: str) -> None:
+        """Drop a deleted project from the index"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._remove(project_id)
+            self._dirty = True
+
+    def sync(self, mtimes: Dict[str, int]) -> None:
+        """Re-index projects whose mtime differs from the given id -> mtime map"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            for project_id in set(self._docs) - set(mtimes):
+                self._remove(project_id)
+                self._dirty = True
+            for project_id, mtime in mtimes.items():
+                doc = self._docs.get(project_id)
+                if doc and doc[0] == mtime:
+                    continue
+                tokens = self._read_tokens(project_id)
+                if tokens is not None:
+                    self._add(project_id, mtime, tokens)
+                    self._dirty = True
+            if self._dirty:
+                self._save()
+
+    def _prefix_matches(self, prefix: str) -> Set[str]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        matches = set()
+        vocabulary = self._vocabulary
+        i = bisect.bisect_left(vocabulary, prefix)
+        while i < len(vocabulary) and vocabulary[i].startswith(prefix):
+            matches |= self._postings[vocabulary[i]]
+            i += 1
+        return matches
+
+    def search(self, query: str) -> Set[str]:
+        """IDs of projects containing every query term.
+
+        The last term also matches as a prefix so results update while typing.
+        """
+        terms = TOKEN_PATTERN.findall(normalize(query))
+        if not terms:
+            return set()
+
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            results = None
+            for i, term in enumerate(terms):
+                if i == len(terms) - 1:
+                    matches = self._prefix_matches(term)
+                elif len(term) > 1:
+                    matches = self._postings.get(term, set())
+                else:
+                    # Single characters are not indexed as whole words
+                    continue
+                results = set(matches) if results is None else results & matches
+                if not results:
+                    return set()
+            return results or set()
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Coroutine, Optional
+
+
+class AsyncRuntime:
+    """A background thread running one asyncio event loop for the whole session.
+
+    Render jobs submit coroutines here instead of creating an event loop per
+    job, so HTTP connection pools, rate limiters and caches created on the
+    loop survive from one job to the next and are shared between concurrent
+    jobs. Blocking work (ffmpeg, file processing) must be moved off the loop
+    with asyncio.to_thread so one job never stalls the others.
+    """
+
+    def __init__(self, name: str = "asyncio-runtime"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running yet"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+
+    def _run(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self._started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+            self.loop.close()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the runtime loop from any thread.
+
+        The returned concurrent.futures.Future resolves with the coroutine's
+        result; its done callbacks run on the runtime thread.
+        """
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Cancel outstanding work, close shared clients and stop the loop"""
+        if not self.running:
+            return
+
+        async def close():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await close_http_client()
+
+        try:
+            asyncio.run_coroutine_threadsafe(close(), self.loop).result(timeout)
+        except Exception as e:
+            print(f"Error shutting down async runtime: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
+
+
+_runtime: Optional[AsyncRuntime] = None
+_runtime_lock = threading.Lock()
+
+
+def get_runtime() -> AsyncRuntime:
+    """The application-wide runtime, started on first use"""
+    global _runtime
+    with _runtime_lock:
+        if _runtime is None:
+            _runtime = AsyncRuntime()
+    _runtime.start()
+    return _runtime
+
+
+def shutdown_runtime(timeout: float = 5.0) -> None:
+    """Stop the application-wide runtime if it was started"""
+    if _runtime is not None:
+        _runtime.shutdown(timeout)
+
+
+# One pooled client per event loop: the runtime loop in the GUI, or the loop
+# of asyncio.run() when generators are used from a script
+_http_clients: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def http_client():
+    """Shared httpx.AsyncClient for the running event loop.
+
+    The client keeps connections to the provider APIs alive between
+    requests. Callers must not close it.
+    """
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _http_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0),
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+        _http_clients[loop] = client
+    return client
+
+
+async def close_http_client() -> None:
+    """Close the running loop's shared client, if any"""
+    client = _http_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
@@ -0,0 +1,95 @@
+import asyncio
+import threading
+from typing import Callable, List
+
+
+class OperationCancelled(asyncio.CancelledError):
+    """Raised by blocking work (ffmpeg, file processing) that saw its token cancelled.
+
+    It derives from CancelledError so the generic `except Exception`
+    handlers in the pipeline never swallow a cancellation.
+    """
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag for one job.
+
+    Blocking code polls raise_if_cancelled() or registers a callback, such
+    as killing a child process, that runs as soon as cancel() is called.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the job; safe to call from any thread and more than once"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancellation callback: {e}")
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback on cancel (immediately if already cancelled).
+
+        Returns a function that unregisters the callback.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise OperationCancelled()
+
+
+async def run_cancellable(coro, token: CancellationToken):
+    """Await coro in the current task and cancel that task when token is cancelled.
+
+    Task cancellation aborts in-flight HTTP requests at their await point;
+    blocking work started with run_blocking() is waited for so it can stop
+    its child processes and clean up first.
+    """
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    remove = token.add_callback(lambda: loop.call_soon_threadsafe(task.cancel))
+    try:
+        return await coro
+    finally:
+        remove()
+
+
+async def run_blocking(func: Callable, *args, **kwargs):
+    """asyncio.to_thread that does not return before the thread does.
+
+    If the awaiting task is cancelled, the thread is expected to notice its
+    cancellation token and unwind; its cleanup finishes before the
+    cancellation propagates, so a follow-up job never races it.
+    """
+    future = asyncio.ensure_future(asyncio.to_thread(func, *args, **kwargs))
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait({future})
+        if not future.cancelled():
+            future.exception()  # Mark as retrieved; the cancellation wins
+        raise
@@ -0,0 +1,267 @@
+import asyncio
+import functools
+import random
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Awaitable, Callable, Deque, Iterator, Optional
+
+from telemetry.metrics import PROVIDER_CONCURRENCY_LIMIT, PROVIDER_RETRIES, PROVIDER_WAITING
+
+# Statuses worth sending again once the provider has recovered
+RETRY_STATUSES = {429, 503}
+
+
+@dataclass(frozen=True)
+class ProviderLimits:
+    """Request budget of one provider API"""
+    rate: float  # Requests started per second, sustained
+    burst: int  # Requests that may start at once after an idle period
+    initial_concurrency: int
+    max_concurrency: int
+    min_concurrency: int = 1
+    # A response this many times slower than the fastest one seen counts
+    # as a sign of overload, like a 429 but answered more gently
+    latency_tolerance: float = 3.0
+    max_attempts: int = 5  # Attempts per request, for 429 and 503 answers
+    max_backoff: float = 60.0  # Seconds, when no Retry-After is sent
+
+
+DEFAULT_LIMITS = {
+    # One script per job; OpenRouter limits per key and model
+    "script": ProviderLimits(rate=1.0, burst=2, initial_concurrency=2, max_concurrency=4),
+    # Stability allows 150 requests per 10 seconds
+    "image": ProviderLimits(rate=10.0, burst=10, initial_concurrency=3, max_concurrency=10),
+    # ElevenLabs caps concurrent requests by plan (2-15)
+    "tts": ProviderLimits(rate=5.0, burst=5, initial_concurrency=2, max_concurrency=8),
+}
+
+# Key of the project whose requests are being made, for fair queuing
+_owner: ContextVar[str] = ContextVar("rate_owner", default="")
+
+
+@contextmanager
+def request_owner(key: str) -> Iterator[None]:
+    """Queue the provider requests made inside the block under key.
+
+    Tasks started inside the block inherit the key, so all requests of a
+    job share one place in the round-robin.
+    """
+    token = _owner.set(key)
+    try:
+        yield
+    finally:
+        _owner.reset(token)
+
+
+def scheduled_job(func):
+    """Decorator for VideoCreator jobs: queue their requests as the project's"""
+    @functools.wraps(func)
+    async def wrapper(self, project, *args, **kwargs):
+        with request_owner(project.id):
+            return await func(self, project, *args, **kwargs)
+    return wrapper
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class Slot:
+    """Permission to send one request; report() the response to steer the scheduler"""
+
+    def __init__(self):
+        self.status: Optional[int] = None
+        self.retry_after: Optional[float] = None
+        self.started = time.monotonic()
+
+    def report(self, status: int, retry_after: Optional[str] = None) -> None:
+        self.status = status
+        self.retry_after = retry_after_seconds(retry_after)
+
+
+class ProviderScheduler:
+    """Shares one provider's request budget between all jobs on an event loop.
+
+    A token bucket keeps the request rate under the provider's limit and
+    an adaptive concurrency limit grows by one per round of fast successful
+    responses and halves on 429s (AIMD), so it settles just below what the
+    provider accepts. A 429 or 503 also pauses the provider for its
+    Retry-After delay. Waiting requests are served round-robin across
+    projects, so a long video cannot starve a short one queued after it.
+    """
+
+    def __init__(self, provider: str, limits: ProviderLimits):
+        self.provider = provider
+        self.limits = limits
+        self.limit = float(limits.initial_concurrency)
+        self.in_flight = 0
+        self.tokens = float(limits.burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._backoff = 1.0
+        self._last_decrease = 0.0
+        self._fastest: Optional[float] = None
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        PROVIDER_CONCURRENCY_LIMIT.set(int(self.limit), provider)
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            float(self.limits.burst), self.tokens + (now - self._refilled) * self.limits.rate
+        )
+        self._refilled = now
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        """Head of the next project's queue, rotating through projects"""
+        while self._queues:
+            key, queue = next(iter(self._queues.items()))
+            future = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            if not future.done():
+                return future
+        return None
+
+    def _dispatch(self) -> None:
+        """Start waiting requests while the concurrency limit and tokens allow"""
+        self._wakeup = None
+        while self._queues and self.in_flight < max(1, int(self.limit)):
+            now = time.monotonic()
+            self._refill(now)
+            delay = max(self._paused_until - now, (1 - self.tokens) / self.limits.rate)
+            if delay > 0:
+                loop = asyncio.get_running_loop()
+                self._wakeup = loop.call_later(delay, self._dispatch)
+                break
+            future = self._next_waiter()
+            if future is None:
+                break
+            self.tokens -= 1
+            self.in_flight += 1
+            future.set_result(None)
+        PROVIDER_WAITING.set(self.waiting, self.provider)
+
+    def _schedule(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.cancel()
+        self._dispatch()
+
+    async def acquire(self, key: str = "") -> None:
+        """Wait until a request of project key may be sent"""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(key, deque()).append(future)
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as the caller was cancelled
+                self.release()
+            else:
+                queue = self._queues.get(key)
+                if queue and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self._queues[key]
+                PROVIDER_WAITING.set(self.waiting, self.provider)
+            raise
+
+    def release(self, slot: Optional[Slot] = None) -> None:
+        """Free a request's slot and adapt the limits to its outcome"""
+        self.in_flight -= 1
+        if slot is not None and slot.status is not None:
+            self._adapt(slot)
+        self._schedule()
+
+    def _adapt(self, slot: Slot) -> None:
+        now = time.monotonic()
+        latency = now - slot.started
+        limits = self.limits
+        if slot.status in RETRY_STATUSES:
+            # Halve at most once per round trip, since the 429s of one
+            # burst of concurrent requests all report the same overload
+            if slot.status == 429 and now - self._last_decrease > latency:
+                self.limit = max(float(limits.min_concurrency), self.limit / 2)
+                self._last_decrease = now
+            pause = slot.retry_after
+            if pause is None:
+                pause = self._backoff * random.uniform(0.5, 1.0)
+                self._backoff = min(limits.max_backoff, self._backoff * 2)
+            self._paused_until = max(self._paused_until, now + pause)
+            # Requests resume one at a time after the pause
+            self.tokens = min(self.tokens, 0.0)
+        elif 200 <= slot.status < 300:
+            self._backoff = 1.0
+            if self._fastest is None or latency < self._fastest:
+                self._fastest = latency
+            if latency > self._fastest * limits.latency_tolerance:
+                self.limit = max(float(limits.min_concurrency), self.limit * 0.9)
+            else:
+                self.limit = min(float(limits.max_concurrency), self.limit + 1 / self.limit)
+        PROVIDER_CONCURRENCY_LIMIT.set(int(self.limit), self.provider)
+
+    @asynccontextmanager
+    async def slot(self, key: Optional[str] = None) -> AsyncIterator[Slot]:
+        """Hold a request slot of the current (or given) project"""
+        await self.acquire(_owner.get() if key is None else key)
+        slot = Slot()
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+
+# One set of schedulers per event loop, like the shared HTTP client
+_schedulers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def rate_scheduler(provider: str) -> ProviderScheduler:
+    """The running event loop's scheduler for provider ("script", "image" or "tts")"""
+    loop = asyncio.get_running_loop()
+    schedulers = _schedulers.setdefault(loop, {})
+    scheduler = schedulers.get(provider)
+    if scheduler is None:
+        scheduler = schedulers[provider] = ProviderScheduler(provider, DEFAULT_LIMITS[provider])
+    return scheduler
+
+
+async def send_scheduled(provider: str, send: Callable[[], Awaitable]):
+    """Send a request through the provider's scheduler, retrying 429s and 503s.
+
+    send makes one attempt and returns the httpx response. Throttled
+    attempts are sent again after the provider's Retry-After pause, up to
+    the provider's max_attempts; the last response is returned either way.
+    """
+    scheduler = rate_scheduler(provider)
+    for attempt in range(scheduler.limits.max_attempts):
+        if attempt:
+            PROVIDER_RETRIES.inc(provider)
+        async with scheduler.slot() as slot:
+            response = await send()
+            slot.report(response.status_code, response.headers.get("Retry-After"))
+        if response.status_code not in RETRY_STATUSES:
+            break
+        print(f"{provider} request answered {response.status_code}, "
+              f"attempt {attempt + 1} of {scheduler.limits.max_attempts}")
+    return response
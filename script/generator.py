@@ -1,15 +1,21 @@
 import os
 import json
-import httpx
 import re
 from pathlib import Path
 from typing import Dict, Optional, List
 
+from runtime.asyncio_runtime import http_client
+from runtime.rate_scheduler import send_scheduled
+from telemetry.metrics import provider_request
+from telemetry.tracing import span
+
 
 class ScriptGenerator:
     def __init__(self):
         self.api_key = os.getenv("OPENROUTER_API_KEY")
-        self.api_url = "https://openrouter.ai/api/v1/chat/completions"
+        self.api_url = os.getenv(
+            "OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions"
+        )
         self.model = "anthropic/claude-3.5-sonnet:beta"
         self.prompt_template = Path("assets/prompts/prompt.txt").read_text()
         self.language = "Romanian"  # Default language
@@ -48,70 +54,84 @@ class ScriptGenerator:
                 ],
             }
 
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    self.api_url, headers=headers, json=data, timeout=60.0
-                )
-
-                if response.status_code == 200:
-                    result = response.json()
-                    content = result["choices"][0]["message"]["content"]
-
-                    try:
-                        # Clean the content before parsing JSON
-                        # Remove any potential control characters
-                        content = "".join(
-                            char
-                            for char in content
-                            if ord(char) >= 32 or char in "\n\r\t"
-                        )
-
-                        # Find the start of the JSON content (first '{')
-                        json_start = content.find("{")
-                        if json_start != -1:
-                            content = content[json_start:]
-
-                            # Find the end of the JSON content (last '}')
-                            json_end = content.rfind("}")
-                            if json_end != -1:
-                                content = content[: json_end + 1]
-
-                        # Replace newlines in youtube_description with \n
-                        content = re.sub(
-                            r'("youtube_description":\s*")(.*?)(")',
-                            lambda m: m.group(1)
-                            + m.group(2).replace("\n", "\\n")
-                            + m.group(3),
-                            content,
-                            flags=re.DOTALL,
-                        )
-
-                        # Fix missing commas between elements
-                        content = re.sub(
-                            r'"\n"', '",\n"', content
-                        )  # Add commas between array elements
-                        content = re.sub(
-                            r'"\n}', '"\n}', content
-                        )  # Don't add comma before closing brace
-                        content = re.sub(
-                            r'"\n([a-z"])', '",\n\\1', content, flags=re.IGNORECASE
-                        )  # Add commas between fields
-
-                        # Parse the cleaned JSON response
-                        script_data = json.loads(content)
-                        return script_data
-                    except json.JSONDecodeError as e:
-                        print(f"Error parsing script JSON: {e}")
-                        print(f"Content causing error: {content}")
-                        return None
-                else:
-                    print(f"API request failed with status {response.status_code}")
+            client = http_client()
+
+            async def send():
+                with span("script_request", "api", model=self.model) as request_span, \
+                        provider_request("script") as request:
+                    response = await client.post(
+                        self.api_url, headers=headers, json=data, timeout=60.0
+                    )
+                    request.status = response.status_code
+                    request_span.set(status=response.status_code, bytes=len(response.content))
+                return response
+
+            response = await send_scheduled("script", send)
+
+            if response.status_code == 200:
+                result = response.json()
+                content = result["choices"][0]["message"]["content"]
+
+                try:
+                    # Parse the cleaned JSON response
+                    content = self.clean_response(content)
+                    script_data = json.loads(content)
+                    return script_data
+                except json.JSONDecodeError as e:
+                    print(f"Error parsing script JSON: {e}")
+                    print(f"Content causing error: {content}")
                     return None
+            else:
+                print(f"API request failed with status {response.status_code}")
+                return None
 
         except Exception as e:
             print(f"Error generating script: {e}")
             return None
 
+    @staticmethod
+    def clean_response(content: str) -> str:
+        """Repair the model's reply into parseable JSON"""
+        # Clean the content before parsing JSON
+        # Remove any potential control characters
+        content = "".join(
+            char
+            for char in content
+            if ord(char) >= 32 or char in "\n\r\t"
+        )
+
+        # Find the start of the JSON content (first '{')
+        json_start = content.find("{")
+        if json_start != -1:
+            content = content[json_start:]
+
+            # Find the end of the JSON content (last '}')
+            json_end = content.rfind("}")
+            if json_end != -1:
+                content = content[: json_end + 1]
+
+        # Replace newlines in youtube_description with \n
+        content = re.sub(
+            r'("youtube_description":\s*")(.*?)(")',
+            lambda m: m.group(1)
+            + m.group(2).replace("\n", "\\n")
+            + m.group(3),
+            content,
+            flags=re.DOTALL,
+        )
+
+        # Fix missing commas between elements
+        content = re.sub(
+            r'"\n"', '",\n"', content
+        )  # Add commas between array elements
+        content = re.sub(
+            r'"\n}', '"\n}', content
+        )  # Don't add comma before closing brace
+        content = re.sub(
+            r'"\n([a-z"])', '",\n\\1', content, flags=re.IGNORECASE
+        )  # Add commas between fields
+        return content
+
     def validate_script(self, script_data: Dict) -> bool:
         """Validate the generated script data"""
         required_fields = [
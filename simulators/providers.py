@@ -0,0 +1,286 @@
+"""Local stand-in for the OpenRouter, Stability and ElevenLabs APIs.
+
+Serves the three endpoints the generators call, with synthetic payloads,
+so the whole pipeline runs offline and reproducibly:
+
+    python -m simulators.providers --port 8766 --latency image=4 --throttle-rate 0.05
+
+then point the app at it with the environment variables it prints.
+Latencies are drawn from a log-normal distribution around the given
+median; --error-rate and --throttle-rate make that share of requests
+fail with 500 or 429 (with Retry-After).
+"""
+import argparse
+import json
+import math
+import random
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+SCRIPT_PATH = "/api/v1/chat/completions"
+IMAGE_PATH = "/v2beta/stable-image/generate/core"
+TTS_PREFIX = "/v1/text-to-speech/"
+
+# Image sizes Stability returns for the aspect ratios the app asks for
+IMAGE_SIZES = {"9:16": (768, 1344), "16:9": (1344, 768), "1:1": (1024, 1024)}
+IMAGE_SOURCES = ["testsrc2", "smptehdbars", "mandelbrot", "gradients"]
+
+# Narration pace of the synthetic speech
+CHARS_PER_SECOND = 16
+
+WORDS = (
+    "istoria povestea regele cetatea muntele poporul legenda secretul "
+    "batalia comoara drumul timpul lumina umbra vremea oamenii"
+).split()
+MUSIC = ["calm orchestral strings", "epic cinematic drums", "mysterious ambient piano"]
+SOUNDS = ["wind", "thunder", "footsteps", "crowd", "bells", "horses"]
+
+
+@dataclass
+class ProviderProfile:
+    """How one simulated API behaves"""
+    latency: float  # Median response time in seconds
+    jitter: float = 0.3  # Sigma of the log-normal latency distribution
+    error_rate: float = 0.0  # Share of requests answered with 500
+    throttle_rate: float = 0.0  # Share of requests answered with 429
+    retry_after: int = 1  # Seconds, sent with 429s
+
+
+DEFAULT_PROFILES = {
+    "script": ProviderProfile(latency=8.0),
+    "image": ProviderProfile(latency=3.0),
+    "tts": ProviderProfile(latency=1.0),
+}
+
+
+class ProviderSimulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, profiles: Optional[Dict[str, ProviderProfile]] = None,
+                 seed: Optional[int] = None):
+        super().__init__(address, SimulatorHandler)
+        self.profiles = dict(DEFAULT_PROFILES, **(profiles or {}))
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.generate_lock = threading.Lock()
+        self.cache_dir = Path(tempfile.mkdtemp(prefix="provider-sim-"))
+        self.payloads: Dict[tuple, bytes] = {}
+        self.requests = {name: 0 for name in self.profiles}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def environment(self) -> Dict[str, str]:
+        """Environment variables that point the generators at this server"""
+        return {
+            "OPENROUTER_API_URL": f"{self.base_url}{SCRIPT_PATH}",
+            "STABILITY_API_URL": f"{self.base_url}{IMAGE_PATH}",
+            "ELEVENLABS_API_URL": f"{self.base_url}/v1",
+            "OPENROUTER_API_KEY": "simulated",
+            "STABILITY_API_KEY": "simulated",
+            "ELEVENLABS_API_KEY": "simulated",
+        }
+
+    def server_close(self):
+        super().server_close()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.serve_forever, name="provider-simulator", daemon=True)
+        thread.start()
+        return thread
+
+    def draw(self, provider: str) -> Tuple[float, Optional[int]]:
+        """Latency and injected failure status (or None) of the next request"""
+        profile = self.profiles[provider]
+        with self.lock:
+            self.requests[provider] += 1
+            delay = self.random.lognormvariate(math.log(profile.latency), profile.jitter)
+            roll = self.random.random()
+        if roll < profile.throttle_rate:
+            return delay, 429
+        if roll < profile.throttle_rate + profile.error_rate:
+            return delay, 500
+        return delay, None
+
+    def cached(self, key: tuple, command: List[str], output: Path) -> bytes:
+        """Payload made by an ffmpeg command, generated once per key"""
+        with self.generate_lock:
+            data = self.payloads.get(key)
+            if data is None:
+                subprocess.run(command + [str(output)], capture_output=True, check=True)
+                data = self.payloads[key] = output.read_bytes()
+        return data
+
+    def image(self, aspect_ratio: str, variant: int) -> bytes:
+        width, height = IMAGE_SIZES.get(aspect_ratio, IMAGE_SIZES["16:9"])
+        source = IMAGE_SOURCES[variant % len(IMAGE_SOURCES)]
+        output = self.cache_dir / f"{source}_{width}x{height}.webp"
+        return self.cached(("image", aspect_ratio, source), [
+            "ffmpeg", "-y", "-v", "error", "-f", "lavfi", "-i", f"{source}=size={width}x{height}",
+            "-frames:v", "1", "-c:v", "libwebp", "-quality", "80",
+        ], output)
+
+    def speech(self, text: str) -> bytes:
+        # A pitch-wobbling tone with syllable-rate amplitude modulation
+        duration = round(max(1.0, min(15.0, len(text) / CHARS_PER_SECOND)) * 4) / 4
+        output = self.cache_dir / f"speech_{duration:.2f}.mp3"
+        expression = "0.4*sin(2*PI*(150+40*sin(2*PI*0.7*t))*t)*(0.55+0.45*sin(2*PI*4*t))"
+        return self.cached(("speech", duration), [
+            "ffmpeg", "-y", "-v", "error", "-f", "lavfi",
+            "-i", f"aevalsrc='{expression}':s=44100:d={duration}",
+            "-c:a", "libmp3lame", "-b:a", "64k",
+        ], output)
+
+    def script(self, prompt: str) -> dict:
+        match = re.search(r"<number_of_images>\s*(\d+)", prompt)
+        scenes = max(1, int(match.group(1))) if match else 6
+        with self.lock:
+            rng = random.Random(self.random.random())
+        sentences = []
+        for i in range(scenes):
+            words = " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12)))
+            sentence = words.capitalize() + "."
+            if rng.random() < 0.3:
+                sentence += f" [Sound: {rng.choice(SOUNDS)}]"
+            sentences.append(sentence)
+        return {
+            "title": "Simulated story",
+            "script": sentences,
+            "music": rng.choice(MUSIC),
+            "sounds": [rng.choice(SOUNDS) for _ in range(scenes)],
+            "descriptions": [f"Scene {i + 1}, ancient fortress at dusk" for i in range(scenes)],
+            "youtube_title": "Simulated story #shorts",
+            "youtube_description": "A simulated script.\n#history #story",
+        }
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    server: ProviderSimulator
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, data: bytes, content_type: str, headers: Optional[dict] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _json(self, status: int, body: dict, headers: Optional[dict] = None):
+        self._reply(status, json.dumps(body).encode(), "application/json", headers)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _fail(self, provider: str) -> bool:
+        """Sleep the drawn latency and answer an injected failure, if any"""
+        delay, status = self.server.draw(provider)
+        threading.Event().wait(delay)
+        if status == 429:
+            retry_after = self.server.profiles[provider].retry_after
+            self._json(429, {"message": "simulated rate limit"},
+                       {"Retry-After": str(retry_after)})
+            return True
+        if status:
+            self._json(status, {"message": "simulated server error"})
+            return True
+        return False
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._body()
+        authorized = (
+            self.headers.get("Authorization", "").startswith("Bearer ")
+            or self.headers.get("xi-api-key")
+        )
+        if not authorized:
+            self._json(401, {"message": "missing API key"})
+            return
+
+        if path == SCRIPT_PATH:
+            if self._fail("script"):
+                return
+            request = json.loads(body or b"{}")
+            prompt = request.get("messages", [{}])[-1].get("content", "")
+            # Models often wrap the JSON in prose; the generator strips it
+            content = "Here is the script:\n" + json.dumps(
+                self.server.script(prompt), indent=2, ensure_ascii=False)
+            self._json(200, {"choices": [{"message": {"role": "assistant", "content": content}}]})
+        elif path == IMAGE_PATH:
+            if self._fail("image"):
+                return
+            fields = dict(re.findall(rb'name="([^"]+)"\r\n\r\n([^\r]*)', body))
+            aspect_ratio = fields.get(b"aspect_ratio", b"16:9").decode()
+            with self.server.lock:
+                variant = self.server.requests["image"]
+            self._reply(200, self.server.image(aspect_ratio, variant), "image/webp")
+        elif path.startswith(TTS_PREFIX):
+            if self._fail("tts"):
+                return
+            text = json.loads(body or b"{}").get("text", "")
+            self._reply(200, self.server.speech(text), "audio/mpeg")
+        else:
+            self._json(404, {"message": "not found"})
+
+
+def parse_profile_options(latencies: List[str], jitter: float, error_rate: float,
+                          throttle_rate: float) -> Dict[str, ProviderProfile]:
+    """Profiles from --latency NAME=SECONDS options and the shared rates"""
+    medians = {name: profile.latency for name, profile in DEFAULT_PROFILES.items()}
+    for option in latencies:
+        name, _, value = option.partition("=")
+        if name not in medians:
+            raise ValueError(f"Unknown provider {name!r}, expected one of {sorted(medians)}")
+        medians[name] = max(0.001, float(value))
+    return {
+        name: ProviderProfile(median, jitter, error_rate, throttle_rate)
+        for name, median in medians.items()
+    }
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", action="append", default=[], metavar="PROVIDER=SECONDS",
+                        help="median latency of script, image or tts requests")
+    parser.add_argument("--jitter", type=float, default=0.3,
+                        help="sigma of the log-normal latency distribution")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="share of requests failing with 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0,
+                        help="share of requests failing with 429")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    profiles = parse_profile_options(args.latency, args.jitter, args.error_rate, args.throttle_rate)
+    server = ProviderSimulator((args.host, args.port), profiles, args.seed)
+    print("Provider simulator running; use:")
+    for name, value in server.environment().items():
+        print(f"  {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Local stand-in for the YouTube Data API upload endpoints.
+
+Implements the OAuth token refresh and the resumable upload protocol
+closely enough to exercise upload.resumable without a Google account:
+
+    python -m simulators.youtube --port 8765 --fail-every 3
+
+then point the app at it with the environment variables it prints.
+--fail-every N makes every Nth chunk store only half its bytes and
+answer 503, so resuming from the acknowledged offset gets tested.
+"""
+import argparse
+import base64
+import hashlib
+import itertools
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class UploadSession:
+    def __init__(self, session_id: str, size: int, metadata: dict):
+        self.id = session_id
+        self.size = size
+        self.metadata = metadata
+        self.received = 0
+        self.md5 = hashlib.md5()
+        self.video: Optional[dict] = None
+
+
+class YouTubeSimulator(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_every: int = 0):
+        super().__init__(address, SimulatorHandler)
+        self.fail_every = fail_every
+        self.sessions: Dict[str, UploadSession] = {}
+        self.lock = threading.Lock()
+        self.chunks = itertools.count(1)
+        self.ids = itertools.count(1)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class SimulatorHandler(BaseHTTPRequestHandler):
+    server: YouTubeSimulator
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: Optional[dict] = None, headers: Optional[dict] = None):
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if body is not None:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _session_status(self, session: UploadSession):
+        if session.video is not None:
+            digest = base64.b64encode(session.md5.digest()).decode()
+            self._reply(201, session.video, {"X-Goog-Hash": f"md5={digest}"})
+        elif session.received:
+            self._reply(308, headers={"Range": f"bytes=0-{session.received - 1}"})
+        else:
+            self._reply(308)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path == "/token":
+            self._body()
+            self._reply(200, {"access_token": "simulated-token", "expires_in": 3600,
+                              "token_type": "Bearer"})
+            return
+        if url.path != "/upload/youtube/v3/videos":
+            self._reply(404, {"error": "not found"})
+            return
+        if not self.headers.get("Authorization", "").startswith("Bearer "):
+            self._reply(401, {"error": "unauthorized"})
+            return
+        metadata = json.loads(self._body() or b"{}")
+        with self.server.lock:
+            session = UploadSession(
+                f"session-{next(self.server.ids)}",
+                int(self.headers["X-Upload-Content-Length"]),
+                metadata,
+            )
+            self.server.sessions[session.id] = session
+        location = f"{self.server.base_url}{url.path}?uploadType=resumable&upload_id={session.id}"
+        self._reply(200, headers={"Location": location})
+
+    def do_PUT(self):
+        query = parse_qs(urlparse(self.path).query)
+        session = self.server.sessions.get(query.get("upload_id", [""])[0])
+        if session is None:
+            self._reply(404, {"error": "upload session not found"})
+            return
+
+        body = self._body()
+        content_range = self.headers.get("Content-Range", "")
+        with self.server.lock:
+            if content_range.startswith("bytes */") or session.video is not None:
+                self._session_status(session)
+                return
+
+            span, _ = content_range[len("bytes "):].split("/")
+            start, end = (int(value) for value in span.split("-"))
+            if start != session.received or end - start + 1 != len(body):
+                # Out of sync; tell the client what was stored
+                self._session_status(session)
+                return
+
+            failing = self.server.fail_every and next(self.server.chunks) % self.server.fail_every == 0
+            if failing:
+                body = body[:len(body) // 2]
+            session.md5.update(body)
+            session.received += len(body)
+            if failing:
+                self._reply(503, {"error": "simulated backend error"})
+                return
+
+            if session.received >= session.size:
+                video_id = f"sim{session.id.split('-')[1]:0>8}"
+                session.video = {
+                    "kind": "youtube#video",
+                    "id": video_id,
+                    "snippet": session.metadata.get("snippet", {}),
+                    "status": {**session.metadata.get("status", {}), "uploadStatus": "uploaded"},
+                }
+                print(f"Received {session.size} bytes as video {video_id}: "
+                      f"{session.video['snippet'].get('title', '')}")
+            self._session_status(session)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fail-every", type=int, default=0,
+                        help="fail every Nth chunk after storing half of it")
+    args = parser.parse_args()
+
+    server = YouTubeSimulator((args.host, args.port), args.fail_every)
+    print("YouTube upload simulator running; use:")
+    print(f"  YOUTUBE_UPLOAD_URL={server.base_url}/upload/youtube/v3/videos")
+    print(f"  YOUTUBE_TOKEN_URL={server.base_url}/token")
+    print("  YOUTUBE_REFRESH_TOKEN=simulated")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Port of the local /metrics endpoint; unset means no endpoint
+METRICS_PORT_ENV = "VIDEOFORGE_METRICS_PORT"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; API requests take 0.5-30 s, ffmpeg passes and jobs up to minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """A metric family in Prometheus text format, keyed by label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, object] = {}
+        REGISTRY.register(self)
+
+    def _key(self, label_values: tuple) -> tuple:
+        if len(label_values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {label_values}")
+        return tuple(str(v) for v in label_values)
+
+    def _label_text(self, key: tuple, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            return [
+                f"{self.name}{self._label_text(key)} {_number(value)}"
+                for key, value in self._values.items()
+            ]
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"] + self.samples()
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, *label_values) -> float:
+        with self._lock:
+            return self._values.get(self._key(label_values), 0)
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *label_values) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, *label_values, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, *label_values) -> None:
+        key = self._key(label_values)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for key, (counts, total) in self._values.items():
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    labels = self._label_text(key, [("le", _number(bound))])
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                lines.append(f"{self.name}_sum{self._label_text(key)} {_number(total)}")
+                lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics)
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PROVIDER_REQUEST_SECONDS = Histogram(
+    "videoforge_provider_request_seconds",
+    "Latency of script, image and TTS API requests by response status.",
+    ["provider", "status"],
+)
+PROVIDER_THROTTLED = Counter(
+    "videoforge_provider_throttled_total",
+    "API requests answered with 429 Too Many Requests.",
+    ["provider"],
+)
+PROVIDER_RETRIES = Counter(
+    "videoforge_provider_retries_total",
+    "API requests sent again after a failed attempt.",
+    ["provider"],
+)
+PROVIDER_CONCURRENCY_LIMIT = Gauge(
+    "videoforge_provider_concurrency_limit",
+    "Adaptive limit on concurrent requests to each provider.",
+    ["provider"],
+)
+PROVIDER_WAITING = Gauge(
+    "videoforge_provider_waiting",
+    "Requests waiting for a provider's rate scheduler.",
+    ["provider"],
+)
+CACHE_LOOKUPS = Counter(
+    "videoforge_cache_lookups_total",
+    "Reuse checks for images, narration, PCM and scene clips by result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_HIT_RATIO = Gauge(
+    "videoforge_cache_hit_ratio",
+    "Share of cache lookups that were hits since start.",
+    ["cache"],
+)
+FFMPEG_PASS_SECONDS = Histogram(
+    "videoforge_ffmpeg_pass_seconds",
+    "Wall time of ffmpeg and ffprobe runs by pass.",
+    ["pass"],
+)
+FFMPEG_CPU_SECONDS = Counter(
+    "videoforge_ffmpeg_cpu_seconds_total",
+    "User and system CPU time of ffmpeg runs by pass.",
+    ["pass"],
+)
+FFMPEG_MEDIA_SECONDS = Counter(
+    "videoforge_ffmpeg_media_seconds_total",
+    "Seconds of media written by ffmpeg runs by pass.",
+    ["pass"],
+)
+FFMPEG_FAILURES = Counter(
+    "videoforge_ffmpeg_failures_total",
+    "ffmpeg runs that exited with a non-zero status, by pass.",
+    ["pass"],
+)
+RENDER_SECONDS = Histogram(
+    "videoforge_render_seconds",
+    "Wall time of create_final_video by profile and result.",
+    ["profile", "result"],
+)
+RENDERED_SCENES = Counter(
+    "videoforge_rendered_scenes_total",
+    "Scenes in successfully rendered videos, by profile.",
+    ["profile"],
+)
+QUEUE_DEPTH = Gauge(
+    "videoforge_queue_depth",
+    "Jobs waiting to start, by queue (render or upload).",
+    ["queue"],
+)
+JOBS_IN_FLIGHT = Gauge(
+    "videoforge_jobs_in_flight",
+    "VideoCreator jobs currently running, by job.",
+    ["job"],
+)
+JOBS = Counter(
+    "videoforge_jobs_total",
+    "Finished VideoCreator jobs by job and result (ok, failed, cancelled or error).",
+    ["job", "result"],
+)
+JOB_SECONDS = Histogram(
+    "videoforge_job_seconds",
+    "Wall time of VideoCreator jobs.",
+    ["job"],
+)
+
+
+class RequestTimer:
+    """Status of a timed API request, set by the caller once it is known"""
+
+    def __init__(self):
+        self.status: Optional[object] = None
+
+
+@contextmanager
+def provider_request(provider: str) -> Iterator[RequestTimer]:
+    """Time an API request of provider ("script", "image" or "tts").
+
+    Set .status to the HTTP status; requests that raise are recorded as
+    "timeout", "cancelled" or "error".
+    """
+    request = RequestTimer()
+    start = time.perf_counter()
+    try:
+        yield request
+    except BaseException as e:
+        name = type(e).__name__
+        request.status = (
+            "timeout" if "Timeout" in name
+            else "cancelled" if "Cancel" in name
+            else "error"
+        )
+        raise
+    finally:
+        status = str(request.status or "unknown")
+        PROVIDER_REQUEST_SECONDS.observe(time.perf_counter() - start, provider, status)
+        if status == "429":
+            PROVIDER_THROTTLED.inc(provider)
+
+
+def count_cache(cache: str, hits: int = 0, misses: int = 0) -> None:
+    """Record reuse checks of a cache and update its hit ratio"""
+    if hits:
+        CACHE_LOOKUPS.inc(cache, "hit", amount=hits)
+    if misses:
+        CACHE_LOOKUPS.inc(cache, "miss", amount=misses)
+    total_hits = CACHE_LOOKUPS.value(cache, "hit")
+    total = total_hits + CACHE_LOOKUPS.value(cache, "miss")
+    if total:
+        CACHE_HIT_RATIO.set(round(total_hits / total, 4), cache)
+
+
+def observe_ffmpeg(usage) -> None:
+    """Record one ffmpeg run (a telemetry.resources.ProcessUsage)"""
+    FFMPEG_PASS_SECONDS.observe(usage.wall, usage.kind)
+    FFMPEG_CPU_SECONDS.inc(usage.kind, amount=usage.cpu)
+    if usage.media_seconds:
+        FFMPEG_MEDIA_SECONDS.inc(usage.kind, amount=usage.media_seconds)
+    if usage.returncode != 0:
+        FFMPEG_FAILURES.inc(usage.kind)
+
+
+class JobOutcome:
+    def __init__(self):
+        self.result = "error"
+
+
+@contextmanager
+def job_metrics(job: str) -> Iterator[JobOutcome]:
+    """Count a VideoCreator job in flight and record how it ended.
+
+    Set .result to "ok" or "failed" when the job returns; jobs that raise
+    are recorded as "cancelled" or "error".
+    """
+    outcome = JobOutcome()
+    JOBS_IN_FLIGHT.inc(job)
+    start = time.perf_counter()
+    try:
+        yield outcome
+    except BaseException as e:
+        outcome.result = "cancelled" if "Cancel" in type(e).__name__ else "error"
+        raise
+    finally:
+        JOBS_IN_FLIGHT.dec(job)
+        JOBS.inc(job, outcome.result)
+        JOB_SECONDS.observe(time.perf_counter() - start, job)
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1"):
+    """Serve REGISTRY at http://host:port/metrics from a daemon thread.
+
+    Returns the server, or None if the port cannot be bound. Only one
+    server is started per process.
+    """
+    # Imported here so that importing the metrics does not slow down startup
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = REGISTRY.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            server = ThreadingHTTPServer((host, port), MetricsHandler)
+        except OSError as e:
+            print(f"Could not start metrics endpoint on {host}:{port}: {e}")
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        _server = server
+        print(f"Serving metrics at http://{host}:{server.server_address[1]}/metrics")
+        return server
+
+
+def start_from_environment():
+    """Start the endpoint if VIDEOFORGE_METRICS_PORT is set"""
+    value = os.getenv(METRICS_PORT_ENV)
+    if not value:
+        return None
+    try:
+        port = int(value)
+    except ValueError:
+        print(f"Ignoring {METRICS_PORT_ENV}={value!r}: not a port number")
+        return None
+    return start_metrics_server(port)
@@ -0,0 +1,147 @@
+import json
+import re
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterator, List, Optional
+
+from project.storage import atomic_write
+
+REPORT_FILE = "render_report.json"
+
+# ffmpeg's last progress line, e.g. "frame=  150 ... time=00:00:05.00 ... speed=2.1x"
+PROGRESS_TIME = re.compile(r"time=\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+@dataclass
+class ProcessUsage:
+    """Resources used by one ffmpeg or ffprobe run"""
+    kind: str
+    tool: str
+    wall: float  # Seconds
+    user: float  # CPU seconds in user mode
+    system: float  # CPU seconds in the kernel
+    max_rss_kb: int
+    output_bytes: int = 0
+    media_seconds: float = 0.0  # Duration of media the run produced
+    returncode: int = 0
+
+    @property
+    def cpu(self) -> float:
+        return self.user + self.system
+
+
+def max_rss_kb(ru_maxrss: int) -> int:
+    """ru_maxrss in KiB; macOS reports bytes, Linux KiB"""
+    return ru_maxrss // 1024 if sys.platform == "darwin" else ru_maxrss
+
+
+def media_seconds(stderr) -> float:
+    """Output duration from the final progress line of ffmpeg's stderr"""
+    if not stderr:
+        return 0.0
+    tail = stderr[-4096:]
+    if isinstance(tail, bytes):
+        tail = tail.decode("utf-8", errors="replace")
+    matches = PROGRESS_TIME.findall(tail)
+    if not matches:
+        return 0.0
+    hours, minutes, seconds = matches[-1]
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+class ResourceReport:
+    """Resource usage of every ffmpeg/ffprobe run of one job.
+
+    save() writes the runs and per-pass totals (CPU and wall time, peak
+    RSS, output size and speed relative to real time) next to the project,
+    which is what render node capacity is planned from.
+    """
+
+    def __init__(self, project_id: str, job: str):
+        self.project_id = project_id
+        self.job = job
+        self.runs: List[ProcessUsage] = []
+        self._lock = Lock()
+
+    def add(self, usage: ProcessUsage) -> None:
+        with self._lock:
+            self.runs.append(usage)
+
+    def passes(self) -> Dict[str, dict]:
+        """Totals per pass type, in the order the passes first ran"""
+        with self._lock:
+            runs = list(self.runs)
+        totals: Dict[str, dict] = {}
+        for run in runs:
+            entry = totals.setdefault(run.kind, {
+                "runs": 0, "wall": 0.0, "cpu": 0.0, "max_rss_kb": 0,
+                "output_bytes": 0, "media_seconds": 0.0,
+            })
+            entry["runs"] += 1
+            entry["wall"] += run.wall
+            entry["cpu"] += run.cpu
+            entry["max_rss_kb"] = max(entry["max_rss_kb"], run.max_rss_kb)
+            entry["output_bytes"] += run.output_bytes
+            entry["media_seconds"] += run.media_seconds
+        for entry in totals.values():
+            wall = entry["wall"]
+            # Cores kept busy on average, and seconds of media per second of work
+            entry["cpu_utilization"] = round(entry["cpu"] / wall, 2) if wall else 0.0
+            entry["realtime_factor"] = round(entry["media_seconds"] / wall, 2) if wall else 0.0
+            for key in ("wall", "cpu", "media_seconds"):
+                entry[key] = round(entry[key], 3)
+        return totals
+
+    def summary(self) -> str:
+        lines = [f"{'pass':<16}{'runs':>5}{'wall s':>9}{'cpu s':>9}{'rss MiB':>9}{'x rt':>7}"]
+        for kind, entry in self.passes().items():
+            lines.append(
+                f"{kind:<16}{entry['runs']:>5}{entry['wall']:>9.2f}{entry['cpu']:>9.2f}"
+                f"{entry['max_rss_kb'] / 1024:>9.0f}{entry['realtime_factor']:>7.1f}"
+            )
+        return "\n".join(lines)
+
+    def save(self, path: Path) -> None:
+        if not self.runs:
+            return
+        with self._lock:
+            runs = [dict(asdict(run), cpu=round(run.cpu, 3)) for run in self.runs]
+        report = {
+            "project": self.project_id,
+            "job": self.job,
+            "platform": sys.platform,
+            "passes": self.passes(),
+            "runs": runs,
+        }
+        print(f"Render report for {self.project_id} ({self.job}):\n{self.summary()}")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, json.dumps(report, indent=2))
+        except OSError as e:
+            print(f"Could not write render report {path}: {e}")
+
+
+_report: ContextVar[Optional[ResourceReport]] = ContextVar("resource_report", default=None)
+
+
+def record_usage(usage: ProcessUsage) -> None:
+    """Add a run to the current job's report, if there is one"""
+    report = _report.get()
+    if report is not None:
+        report.add(usage)
+
+
+@contextmanager
+def resource_report(project_id: str, job: str) -> Iterator[ResourceReport]:
+    """Account a job's ffmpeg runs and write projects/<id>/render_report.json"""
+    report = ResourceReport(project_id, job)
+    token = _report.set(report)
+    try:
+        yield report
+    finally:
+        _report.reset(token)
+        report.save(Path("projects") / project_id / REPORT_FILE)
@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from project.storage import atomic_write
+from telemetry.metrics import job_metrics
+from telemetry.resources import resource_report
+
+TRACE_FILE = "trace.json"
+
+
+class Span:
+    """A timed stage of a job; attributes set on it end up in the trace's args"""
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, **attrs) -> None:
+        self.args.update(attrs)
+
+
+class Tracer:
+    """Collects the spans of one job as Chrome trace events.
+
+    Spans are grouped into one lane (a "thread" in the trace viewer) per
+    asyncio task or worker thread, so concurrent requests and ffmpeg runs
+    show up side by side and nested spans stack within their lane.
+    """
+
+    def __init__(self):
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        self._lanes: Dict[tuple, int] = {}
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+
+    def lane(self) -> int:
+        """Trace lane of the calling task or thread"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            key, label = ("task", id(task)), task.get_name()
+        else:
+            key, label = ("thread", threading.get_ident()), threading.current_thread().name
+        with self._lock:
+            lane = self._lanes.get(key)
+            if lane is None:
+                lane = self._lanes[key] = len(self._lanes) + 1
+                self.events.append({
+                    "name": "thread_name", "ph": "M", "pid": self._pid, "tid": lane,
+                    "args": {"name": label},
+                })
+            return lane
+
+    def record(self, span: Span, lane: int, start_ns: int, end_ns: int) -> None:
+        event = {
+            "name": span.name,
+            "cat": span.category,
+            "ph": "X",
+            "ts": (start_ns - self._origin) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self._pid,
+            "tid": lane,
+            "args": span.args,
+        }
+        with self._lock:
+            self.events.append(event)
+
+    def save(self, path: Path) -> None:
+        """Write the trace for chrome://tracing or https://ui.perfetto.dev"""
+        with self._lock:
+            events = sorted(self.events, key=lambda e: (e["ph"] != "M", e.get("ts", 0)))
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(path, json.dumps(
+                {"traceEvents": events, "displayTimeUnit": "ms"}, default=str
+            ))
+        except OSError as e:
+            print(f"Could not write trace {path}: {e}")
+
+
+_tracer: ContextVar[Optional[Tracer]] = ContextVar("tracer", default=None)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _tracer.get()
+
+
+@contextmanager
+def span(name: str, category: str = "stage", **attrs) -> Iterator[Span]:
+    """Time the enclosed block as a span of the current job's trace.
+
+    Does nothing outside a traced job. The tracer is found through a
+    context variable, so tasks and run_blocking threads started inside the
+    block record into the same trace.
+    """
+    current = Span(name, category, attrs)
+    tracer = _tracer.get()
+    if tracer is None:
+        yield current
+        return
+    lane = tracer.lane()
+    start = time.perf_counter_ns()
+    try:
+        yield current
+    except BaseException as e:
+        current.args["error"] = type(e).__name__
+        raise
+    finally:
+        tracer.record(current, lane, start, time.perf_counter_ns())
+
+
+@contextmanager
+def trace_job(project_id: str, name: str) -> Iterator[Tracer]:
+    """Trace a job and write it to projects/<id>/trace.json when it ends"""
+    tracer = Tracer()
+    token = _tracer.set(tracer)
+    try:
+        with span(name, "job", project=project_id):
+            yield tracer
+    finally:
+        _tracer.reset(token)
+        tracer.save(Path("projects") / project_id / TRACE_FILE)
+
+
+def traced_job(name: str):
+    """Decorator for VideoCreator jobs, whose first argument is the project.
+
+    Besides the trace, the job's ffmpeg runs are accounted in a render
+    report (see telemetry.resources) and the job is counted in the process
+    metrics (see telemetry.metrics).
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        async def wrapper(self, project, *args, **kwargs):
+            with trace_job(project.id, name), resource_report(project.id, name), \
+                    job_metrics(name) as outcome:
+                result = await func(self, project, *args, **kwargs)
+                outcome.result = "ok" if result else "failed"
+                return result
+        return wrapper
+    return decorate
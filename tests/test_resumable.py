@@ -0,0 +1,105 @@
+import asyncio
+import os
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from runtime.asyncio_runtime import close_http_client
+from simulators.youtube import SimulatorHandler, YouTubeSimulator
+from upload.resumable import CHUNK_GRANULARITY, ResumableUpload, UploadError
+
+METADATA = {"snippet": {"title": "Test"}, "status": {"privacyStatus": "unlisted"}}
+
+
+class Interrupted(Exception):
+    pass
+
+
+@contextmanager
+def simulator(fail_every: int = 0):
+    server = YouTubeSimulator(("127.0.0.1", 0), fail_every)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def auth_headers():
+    return {"Authorization": "Bearer simulated-token"}
+
+
+def upload(upload: ResumableUpload, server: YouTubeSimulator) -> dict:
+    async def run():
+        try:
+            return await upload.upload(f"{server.base_url}/upload/youtube/v3/videos", METADATA)
+        finally:
+            await close_http_client()
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "output.mp4"
+    path.write_bytes(os.urandom(5 * CHUNK_GRANULARITY + 1234))
+    return path
+
+
+def test_upload_resumes_after_server_errors(video, tmp_path):
+    state = tmp_path / "upload.json"
+    with simulator(fail_every=3) as server:
+        result = ResumableUpload(video, state, auth_headers, chunk_size=CHUNK_GRANULARITY)
+        created = upload(result, server)
+        (session,) = server.sessions.values()
+
+    # upload() raises when the server's MD5 differs from the file's
+    assert created["status"]["uploadStatus"] == "uploaded"
+    assert session.received == video.stat().st_size
+    assert not state.exists()
+
+
+def test_upload_resumes_session_from_state_file(video, tmp_path):
+    state = tmp_path / "upload.json"
+
+    def interrupt(sent, total):
+        if sent >= 2 * CHUNK_GRANULARITY:
+            raise Interrupted
+
+    with simulator() as server:
+        first = ResumableUpload(video, state, auth_headers, chunk_size=CHUNK_GRANULARITY,
+                                progress_callback=interrupt)
+        with pytest.raises(Interrupted):
+            upload(first, server)
+        assert state.exists()
+
+        sent = []
+        second = ResumableUpload(video, state, auth_headers, chunk_size=CHUNK_GRANULARITY,
+                                 progress_callback=lambda done, total: sent.append(done))
+        created = upload(second, server)
+        (session,) = server.sessions.values()
+
+    # Continued the same session from the bytes already stored
+    assert created["id"]
+    assert sent[0] == 2 * CHUNK_GRANULARITY
+    assert session.received == video.stat().st_size
+    assert not state.exists()
+
+
+class StalledHandler(SimulatorHandler):
+    """Answers every chunk with 308 without storing anything"""
+
+    def do_PUT(self):
+        self._body()
+        session = next(iter(self.server.sessions.values()))
+        self._session_status(session)
+
+
+def test_upload_gives_up_when_server_stores_nothing(video, tmp_path):
+    with simulator() as server:
+        server.RequestHandlerClass = StalledHandler
+        stalled = ResumableUpload(video, tmp_path / "upload.json", auth_headers, max_retries=1)
+        with pytest.raises(UploadError):
+            upload(stalled, server)
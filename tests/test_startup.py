@@ -0,0 +1,30 @@
+import pytest
+
+import main
+
+
+def trace(statement: str) -> list:
+    rows, error = main.import_trace(statement)
+    assert error is None, error
+    return rows
+
+
+def test_main_does_not_import_lazy_modules():
+    assert main.eager_imports(trace("import main")) == []
+
+
+def test_main_within_budget():
+    assert main.import_time_ms(trace("import main")) <= main.STARTUP_IMPORT_BUDGET_MS
+
+
+def gui_available() -> bool:
+    try:
+        import PyQt6.QtMultimedia  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@pytest.mark.skipif(not gui_available(), reason="PyQt6 with QtMultimedia is not installed")
+def test_gui_startup_within_budget():
+    assert main.profile_startup() == 0
@@ -0,0 +1,188 @@
+import asyncio
+import base64
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from project.storage import atomic_write, file_key
+from runtime.asyncio_runtime import http_client
+from runtime.cancellation import run_blocking
+
+# Chunks must be a multiple of 256 KiB, except for the last one
+CHUNK_GRANULARITY = 256 * 1024
+DEFAULT_CHUNK_SIZE = 32 * CHUNK_GRANULARITY  # 8 MiB
+# Server errors after which the upload continues from the acknowledged offset
+RETRY_STATUSES = {500, 502, 503, 504}
+# Upload sessions stay valid for about a week
+SESSION_LIFETIME = 6 * 24 * 3600
+
+
+class UploadError(Exception):
+    """The upload failed and cannot be resumed"""
+
+
+def file_md5(path: Path) -> str:
+    """Base64 MD5 of a file, the form servers report in X-Goog-Hash"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return base64.b64encode(digest.digest()).decode()
+
+
+def received_bytes(range_header: Optional[str]) -> int:
+    """Bytes the server has stored, from a "bytes=0-N" Range header"""
+    if not range_header:
+        return 0
+    return int(range_header.rsplit("-", 1)[1]) + 1
+
+
+class ResumableUpload:
+    """Upload of one file with the resumable upload protocol of Google APIs.
+
+    The file is sent in chunked PUTs to a session URI. After a network or
+    server error the session is asked how many bytes it has stored and
+    the upload continues from there. The session URI is kept in
+    state_path, so an upload interrupted by a crash or a cancel resumes
+    next time instead of starting over. Once complete, the server's MD5 is
+    compared with the file's when the server reports one.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        state_path: Path,
+        auth_headers: Callable[[], Awaitable[Dict[str, str]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        max_retries: int = 8,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ):
+        self.path = Path(path)
+        self.state_path = Path(state_path)
+        self.auth_headers = auth_headers
+        self.chunk_size = max(CHUNK_GRANULARITY, chunk_size // CHUNK_GRANULARITY * CHUNK_GRANULARITY)
+        self.max_retries = max_retries
+        self.progress_callback = progress_callback
+        self.size = self.path.stat().st_size
+
+    def _load_session(self, key: str) -> Optional[dict]:
+        try:
+            state = json.loads(self.state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if state.get("key") != key or time.time() - state.get("created", 0) > SESSION_LIFETIME:
+            return None
+        return state
+
+    def _clear_session(self) -> None:
+        self.state_path.unlink(missing_ok=True)
+
+    async def start_session(self, url: str, metadata: dict) -> str:
+        """Send the metadata and return the session URI for the file's bytes"""
+        headers = await self.auth_headers()
+        headers.update({
+            "X-Upload-Content-Length": str(self.size),
+            "X-Upload-Content-Type": "video/mp4",
+        })
+        response = await http_client().post(url, headers=headers, json=metadata)
+        if response.status_code != 200 or "Location" not in response.headers:
+            raise UploadError(
+                f"Could not start upload session: {response.status_code} {response.text}"
+            )
+        return response.headers["Location"]
+
+    async def query_offset(self, session_uri: str) -> httpx.Response:
+        """Ask the session how far it got; 308 with a Range header, or 200/201 when complete"""
+        headers = await self.auth_headers()
+        headers.update({"Content-Length": "0", "Content-Range": f"bytes */{self.size}"})
+        return await http_client().put(session_uri, headers=headers)
+
+    def _read_chunk(self, offset: int) -> bytes:
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return f.read(self.chunk_size)
+
+    async def upload(self, url: str, metadata: dict) -> dict:
+        """Upload the file and return the created resource"""
+        key = file_key(self.path)
+        state = self._load_session(key)
+        if state is None:
+            md5 = await run_blocking(file_md5, self.path)
+            session_uri = await self.start_session(url, metadata)
+            state = {"key": key, "md5": md5, "session_uri": session_uri, "created": time.time()}
+            atomic_write(self.state_path, json.dumps(state, indent=2))
+            offset = 0
+        else:
+            print(f"Resuming upload session for {self.path}")
+            offset = None  # Ask the server first
+
+        session_uri = state["session_uri"]
+        retries = 0
+        acknowledged = 0
+        response = None
+        while True:
+            try:
+                if offset is None:
+                    response = await self.query_offset(session_uri)
+                else:
+                    chunk = await run_blocking(self._read_chunk, offset)
+                    headers = await self.auth_headers()
+                    end = offset + len(chunk) - 1
+                    headers["Content-Range"] = f"bytes {offset}-{end}/{self.size}"
+                    response = await http_client().put(session_uri, headers=headers, content=chunk)
+            except httpx.TransportError as e:
+                response = None
+                error = str(e) or type(e).__name__
+            else:
+                error = f"status {response.status_code}"
+
+            if response is not None and response.status_code in (200, 201):
+                break
+            if response is not None and response.status_code == 308:
+                # The server's Range is what it stored, which may be less
+                # than was sent; continue from there
+                queried = offset is None
+                offset = received_bytes(response.headers.get("Range"))
+                if self.progress_callback:
+                    self.progress_callback(offset, self.size)
+                if offset > acknowledged:
+                    acknowledged = offset
+                    retries = 0
+                    continue
+                if queried:
+                    continue
+                # A chunk was sent but nothing more was stored; back off like
+                # after an error instead of resending it at once forever
+                error = f"no bytes stored past {offset}"
+            elif response is not None and response.status_code in (404, 410):
+                self._clear_session()
+                raise UploadError("Upload session expired, the upload has to start over")
+            elif response is not None and response.status_code not in RETRY_STATUSES:
+                raise UploadError(f"Upload failed: {response.status_code} {response.text}")
+
+            retries += 1
+            if retries > self.max_retries:
+                raise UploadError(f"Upload failed after {self.max_retries} retries: {error}")
+            delay = min(2 ** (retries - 1), 60)
+            print(f"Upload interrupted ({error}), resuming in {delay}s")
+            await asyncio.sleep(delay)
+            offset = None
+
+        # Google servers report the stored object's MD5 as "md5=<base64>"
+        hashes = dict(
+            part.strip().split("=", 1)
+            for part in response.headers.get("X-Goog-Hash", "").split(",")
+            if "=" in part
+        )
+        if "md5" in hashes and hashes["md5"] != state["md5"]:
+            self._clear_session()
+            raise UploadError("Checksum mismatch: the uploaded file differs from the local one")
+
+        self._clear_session()
+        if self.progress_callback:
+            self.progress_callback(self.size, self.size)
+        return response.json()
@@ -1,21 +1,251 @@
+import json
+import queue
+import threading
 import time
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Optional
 from PyQt6.QtCore import QThread, pyqtSignal
 import undetected_chromedriver as uc
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 import subprocess
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+from telemetry.metrics import QUEUE_DEPTH
+
+# One JSON line per upload attempt, next to the project's video
+UPLOAD_TIMING_LOG = "upload_timing.jsonl"
+
+# Slowest upload speed allowed for before giving up on the progress label
+MIN_UPLOAD_BYTES_PER_SECOND = 256 * 1024
+
+UPLOAD_PROGRESS = "ytcp-upload-progress-bar, ytcp-video-upload-progress"
+
+# Whether Studio has received the whole file. Read from attributes rather
+# than the progress label, whose text depends on the account's language:
+# the progress bar's aria-valuenow reaching aria-valuemax, or the progress
+# element moving on to its processing or checks state
+UPLOAD_COMPLETE_JS = """
+    const progress = document.querySelector('ytcp-video-upload-progress');
+    if (!progress) return false;
+    if (progress.hasAttribute('uploading')) return false;
+    const bar = progress.querySelector('[role="progressbar"][aria-valuenow]');
+    if (bar) {
+        const now = parseFloat(bar.getAttribute('aria-valuenow'));
+        const max = parseFloat(bar.getAttribute('aria-valuemax') || '100');
+        if (now >= max) return true;
+    }
+    return ['processing', 'processed', 'checks-complete'].some(
+        state => progress.hasAttribute(state)
+            || progress.getAttribute('upload-state') === state);
+"""
+
+# Index of the upload dialog's active step (Details, ..., Visibility), -1 if unknown
+ACTIVE_STEP_JS = """
+    const badges = Array.from(
+        document.querySelectorAll('ytcp-uploads-dialog [id^="step-badge-"]'));
+    return badges.findIndex(
+        b => b.getAttribute('state') === 'active' || b.hasAttribute('active'));
+"""
+
+
+def wait_for(predicate: Callable[[], bool], timeout: float, interval: float = 0.2) -> bool:
+    """Poll predicate until it is true; False if timeout passes first"""
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def page_loaded(driver) -> bool:
+    return driver.execute_script("return document.readyState") == "complete"
+
+
+def element_text(driver, element) -> str:
+    """Rendered text of a contenteditable field"""
+    return (driver.execute_script("return arguments[0].textContent;", element) or "").strip()
+
+
+class StepTimer:
+    """Elapsed time of each step of one upload.
+
+    Every upload appends its steps to UPLOAD_TIMING_LOG, so a step of the
+    Studio flow that gets slower shows up when comparing uploads.
+    """
+
+    def __init__(self, project_id: str):
+        self.project_id = project_id
+        self.steps = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def step(self, name: str):
+        start = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.steps.append({
+                "step": name,
+                "seconds": round(time.perf_counter() - start, 3),
+                "ok": ok,
+            })
+
+    def save(self, path: Path, success: bool) -> None:
+        total = round(time.perf_counter() - self.started, 3)
+        summary = ", ".join(f"{s['step']} {s['seconds']:.1f}s" for s in self.steps)
+        print(f"Upload of {self.project_id} took {total:.1f}s: {summary}")
+        record = {
+            "project": self.project_id,
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "success": success,
+            "seconds": total,
+            "steps": self.steps,
+        }
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError as e:
+            print(f"Could not write upload timing log: {e}")
+
+
+class BrowserSession:
+    """A Chrome session on YouTube Studio that is reused across uploads.
+
+    Starting Chrome against the user profile and loading Studio takes
+    most of an upload's time, so the driver is kept open between uploads
+    and only restarted when a health check fails, after max_uploads
+    uploads, or when an upload went wrong.
+    """
+
+    def __init__(self, max_uploads: int = 25):
+        self.driver = None
+        self.max_uploads = max_uploads
+        self.uploads = 0
+
+    def healthy(self) -> bool:
+        """Whether the browser still responds and has a window"""
+        if self.driver is None:
+            return False
+        try:
+            self.driver.execute_script("return document.readyState")
+            return bool(self.driver.window_handles)
+        except Exception:
+            return False
+
+    def start(self):
+        # The profile can only be used by one Chrome, so close the user's
+        try:
+            subprocess.run(["pkill", "Google Chrome"])
+            if not wait_for(lambda: subprocess.run(
+                    ["pgrep", "Google Chrome"], capture_output=True).returncode != 0, 10):
+                print("Google Chrome is still running")
+        except:
+            pass
+
+        options = uc.ChromeOptions()
+
+        # Use default Chrome profile
+        profile_path = str(
+            Path.home() / "Library/Application Support/Google/Chrome/Default"
+        )
+        options.add_argument(
+            f"--user-data-dir={str(Path.home() / 'Library/Application Support/Google/Chrome')}"
+        )
+        options.add_argument("--profile-directory=Default")
+        options.add_argument("--no-sandbox")
+        options.add_argument("--start-maximized")
+
+        print(f"Using Chrome profile: {profile_path}")
+        self.driver = uc.Chrome(
+            options=options,
+            version_main=None,  # Auto-detect Chrome version
+            use_subprocess=True,
+        )
+        self.uploads = 0
+
+    def acquire(self):
+        """Driver for the next upload, (re)starting the browser when needed"""
+        if self.driver is not None and (not self.healthy() or self.uploads >= self.max_uploads):
+            print("Restarting browser session")
+            self.close()
+        if self.driver is None:
+            self.start()
+        return self.driver
+
+    def close(self):
+        # Uploads wait for Studio to receive the whole file before clicking
+        # Done, so nothing is lost by quitting right away
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+        self.driver = None
+        self.uploads = 0
+
+
+_session: Optional[BrowserSession] = None
+_session_lock = threading.Lock()
+
+
+def get_browser_session() -> BrowserSession:
+    """The process-wide browser session, created on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = BrowserSession()
+        return _session
+
+
+def close_browser_session() -> None:
+    """Quit the shared browser, e.g. when the application exits"""
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session:
+        session.close()
+
 
 class UploadWorker(QThread):
+    """Uploads queued projects one after another in the shared browser session.
+
+    More projects can be added with enqueue() while it runs; they are
+    uploaded in the same Studio session without restarting Chrome. Each
+    step waits for the page state it needs rather than a fixed delay.
+    """
+
     progress = pyqtSignal(str, int)
-    finished = pyqtSignal(bool)
+    project_finished = pyqtSignal(str, bool)  # project id, success
+    finished = pyqtSignal(bool)  # True if every queued upload succeeded
 
     def __init__(self, project):
         super().__init__()
         self.project = project
+        self._queue = queue.Queue()
+        self._queue.put(project)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def enqueue(self, project) -> bool:
+        """Add a project to this run; False once the worker has stopped taking work"""
+        with self._lock:
+            if self._closed:
+                return False
+            self._queue.put(project)
+            QUEUE_DEPTH.set(self._queue.qsize(), "upload")
+            return True
+
+    def pending(self) -> int:
+        return self._queue.qsize()
 
     def wait_for_element(self, driver, by, value, timeout=30, retries=3):
         """Wait for element with retries"""
@@ -29,7 +259,7 @@ class UploadWorker(QThread):
                 print(f"Attempt {attempt + 1} failed to find element {value}")
                 if attempt < retries - 1:
                     driver.refresh()
-                    time.sleep(5)
+                    WebDriverWait(driver, timeout).until(page_loaded)
         return None
 
     def find_upload_button(self, driver):
@@ -59,11 +289,16 @@ class UploadWorker(QThread):
     def handle_file_upload(self, driver, video_path: str) -> bool:
         """Handle file upload with improved error handling"""
         try:
-            # Wait for upload dialog to be fully loaded
+            # Wait for upload dialog and its file input to be ready
             WebDriverWait(driver, 20).until(
                 EC.presence_of_element_located((By.TAG_NAME, "ytcp-uploads-dialog"))
             )
-            time.sleep(2)  # Additional wait for dialog animation
+            try:
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[type='file']"))
+                )
+            except TimeoutException:
+                pass
 
             # First attempt - Direct file input
             try:
@@ -74,10 +309,7 @@ class UploadWorker(QThread):
 
                     # Wait for upload progress indicator
                     WebDriverWait(driver, 30).until(
-                        EC.presence_of_element_located((
-                            By.CSS_SELECTOR,
-                            "ytcp-upload-progress-bar, ytcp-video-upload-progress"
-                        ))
+                        EC.presence_of_element_located((By.CSS_SELECTOR, UPLOAD_PROGRESS))
                     )
                     return True
             except Exception as e:
@@ -98,10 +330,7 @@ class UploadWorker(QThread):
 
                 # Wait for upload progress indicator
                 WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((
-                        By.CSS_SELECTOR,
-                        "ytcp-upload-progress-bar, ytcp-video-upload-progress"
-                    ))
+                    EC.presence_of_element_located((By.CSS_SELECTOR, UPLOAD_PROGRESS))
                 )
 
                 driver.execute_script("arguments[0].remove();", file_input)
@@ -114,13 +343,12 @@ class UploadWorker(QThread):
             # Third attempt - Click select files button and use active element
             try:
                 select_files_button = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((
+                    EC.element_to_be_clickable((
                         By.CSS_SELECTOR,
                         "#select-files-button"
                     ))
                 )
                 select_files_button.click()
-                time.sleep(2)
 
                 # Create a new file input and trigger it
                 js_code = """
@@ -138,10 +366,7 @@ class UploadWorker(QThread):
 
                 # Wait for upload progress indicator
                 WebDriverWait(driver, 30).until(
-                    EC.presence_of_element_located((
-                        By.CSS_SELECTOR,
-                        "ytcp-upload-progress-bar, ytcp-video-upload-progress"
-                    ))
+                    EC.presence_of_element_located((By.CSS_SELECTOR, UPLOAD_PROGRESS))
                 )
 
                 print("Upload succeeded using select files button")
@@ -159,10 +384,8 @@ class UploadWorker(QThread):
     def set_title_with_verification(self, driver, title):
         """Set title with improved clearing and verification"""
         try:
-            # Wait for title container and any auto-population
-            time.sleep(8)
-
-            # Find title input using multiple selectors
+            # Find title input using multiple selectors, waiting for the
+            # details form to appear
             title_input = None
             selectors = [
                 "ytcp-social-suggestion-input.style-scope.ytcp-video-metadata-editor-basics",
@@ -172,10 +395,10 @@ class UploadWorker(QThread):
 
             for selector in selectors:
                 try:
-                    if selector.startswith("//"):
-                        title_input = driver.find_element(By.XPATH, selector)
-                    else:
-                        title_input = driver.find_element(By.CSS_SELECTOR, selector)
+                    by = By.XPATH if selector.startswith("//") else By.CSS_SELECTOR
+                    title_input = WebDriverWait(driver, 20).until(
+                        EC.visibility_of_element_located((by, selector))
+                    )
                     if title_input:
                         break
                 except:
@@ -185,43 +408,53 @@ class UploadWorker(QThread):
                 print("Could not find title input")
                 return False
 
+            # Studio fills in the file name; wait for it so it does not
+            # overwrite the title after it has been cleared
+            try:
+                WebDriverWait(driver, 5).until(
+                    lambda d: element_text(d, title_input)
+                )
+            except TimeoutException:
+                pass
+
             # Clear title using JavaScript first
             driver.execute_script("arguments[0].innerHTML = '';", title_input)
-            time.sleep(1)
 
             # Click to focus
+            WebDriverWait(driver, 10).until(EC.element_to_be_clickable(title_input))
             title_input.click()
-            time.sleep(1)
 
             # Clear using keyboard shortcuts
             active_element = driver.switch_to.active_element
             active_element.send_keys(Keys.CONTROL + "a")
-            time.sleep(0.5)
             active_element.send_keys(Keys.DELETE)
-            time.sleep(0.5)
             active_element.send_keys(Keys.BACKSPACE)  # Extra clear
-            time.sleep(1)
 
             # Verify field is empty
-            current_text = title_input.get_attribute('innerHTML').strip()
-            if current_text:
+            try:
+                WebDriverWait(driver, 3).until(lambda d: not element_text(d, title_input))
+            except TimeoutException:
+                current_text = element_text(driver, title_input)
                 print(f"Failed to clear title field, current text: {current_text}")
                 # Try one more time to clear
                 driver.execute_script("arguments[0].innerHTML = '';", title_input)
-                time.sleep(1)
 
-            # Set new title
+            # Set new title and wait for the field to echo it
             active_element.send_keys(title)
-            time.sleep(2)
+            try:
+                WebDriverWait(driver, 10).until(
+                    lambda d: element_text(d, title_input) == title
+                )
+            except TimeoutException:
+                pass
 
             # Click outside to ensure title is set
             driver.execute_script("""
                 document.querySelector('ytcp-video-metadata-editor-basics').click();
             """)
-            time.sleep(1)
 
             # Verify title was set correctly
-            current_title = title_input.get_attribute('innerHTML').strip()
+            current_title = element_text(driver, title_input)
             if current_title != title:
                 print(f"Title verification failed. Expected: {title}, Got: {current_title}")
                 return False
@@ -233,206 +466,241 @@ class UploadWorker(QThread):
             print(f"Error in set_title_with_verification: {e}")
             return False
 
-    def run(self):
-        driver = None
-        try:
-            # Get metadata
-            video_path = Path(self.project.output_path).absolute()
-            title = sanitize_text(self.project.title)
-            description = sanitize_text(
-                self.project.metadata.get("youtube_description", "")
+    def click_next(self, driver):
+        """Go to the dialog's next step and wait for it to become active"""
+        step = driver.execute_script(ACTIVE_STEP_JS)
+        next_button = WebDriverWait(driver, 10).until(
+            EC.element_to_be_clickable((By.ID, "next-button"))
+        )
+        driver.execute_script("arguments[0].click();", next_button)
+        if step is not None and step >= 0:
+            WebDriverWait(driver, 10).until(
+                lambda d: d.execute_script(ACTIVE_STEP_JS) != step
+            )
+        else:
+            # Stepper not found; the button is re-enabled once the step has rendered
+            WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.ID, "next-button"))
             )
 
-            # Kill any existing Chrome processes
-            try:
-                subprocess.run(["pkill", "Google Chrome"])
-                time.sleep(2)
-            except:
-                pass
-
-            # Initialize Chrome
-            self.progress.emit("Initializing browser...", 10)
-            options = uc.ChromeOptions()
+    def wait_until_uploaded(self, driver, video_path: Path) -> bool:
+        """Wait until Studio has received the whole file and started processing"""
+        timeout = max(120, video_path.stat().st_size / MIN_UPLOAD_BYTES_PER_SECOND)
 
-            # Use default Chrome profile
-            profile_path = str(
-                Path.home() / "Library/Application Support/Google/Chrome/Default"
-            )
-            options.add_argument(
-                f"--user-data-dir={str(Path.home() / 'Library/Application Support/Google/Chrome')}"
-            )
-            options.add_argument("--profile-directory=Default")
-            options.add_argument("--no-sandbox")
-            options.add_argument("--start-maximized")
-
-            print(f"Using Chrome profile: {profile_path}")
-            driver = uc.Chrome(
-                options=options,
-                version_main=None,  # Auto-detect Chrome version
-                use_subprocess=True,
+        try:
+            WebDriverWait(driver, timeout, poll_frequency=1).until(
+                lambda d: d.execute_script(UPLOAD_COMPLETE_JS)
             )
+            return True
+        except TimeoutException:
+            return False
 
-            # Navigate to YouTube Studio with retries
-            self.progress.emit("Navigating to YouTube Studio...", 20)
-            max_retries = 3
-            success = False
+    def run(self):
+        session = get_browser_session()
+        all_succeeded = True
+        while True:
+            with self._lock:
+                if self._queue.empty():
+                    self._closed = True
+                    break
+                project = self._queue.get()
+                QUEUE_DEPTH.set(self._queue.qsize(), "upload")
+            self.project = project
+            success = self.upload_project(session, project)
+            self.project_finished.emit(project.id, success)
+            all_succeeded = all_succeeded and success
+        self.finished.emit(all_succeeded)
+
+    def open_studio(self, driver) -> bool:
+        """Make sure the upload button is reachable, loading Studio only if needed"""
+        if "studio.youtube.com" in (driver.current_url or ""):
+            if self.find_upload_button(driver):
+                return True
 
-            for attempt in range(max_retries):
-                try:
-                    print(f"Navigation attempt {attempt + 1}")
-                    driver.get("https://studio.youtube.com")
-                    time.sleep(5)
+        # Navigate to YouTube Studio with retries
+        max_retries = 3
+        for attempt in range(max_retries):
+            try:
+                print(f"Navigation attempt {attempt + 1}")
+                driver.get("https://studio.youtube.com")
+                WebDriverWait(driver, 30).until(page_loaded)
 
-                    # Try to find upload button with new method
-                    upload_button = self.find_upload_button(driver)
+                # Try to find upload button with new method
+                upload_button = self.find_upload_button(driver)
+
+                if upload_button:
+                    print("Found upload button")
+                    return True
+                else:
+                    # Try alternative URL
+                    print("Trying direct channel URL...")
+                    driver.get("https://studio.youtube.com/channel/UC")
+                    WebDriverWait(driver, 30).until(page_loaded)
 
+                    upload_button = self.find_upload_button(driver)
                     if upload_button:
-                        print("Found upload button")
-                        success = True
-                        break
-                    else:
-                        # Try alternative URL
-                        print("Trying direct channel URL...")
-                        driver.get("https://studio.youtube.com/channel/UC")
-                        time.sleep(5)
-
-                        upload_button = self.find_upload_button(driver)
-                        if upload_button:
-                            print("Found upload button on channel page")
-                            success = True
-                            break
+                        print("Found upload button on channel page")
+                        return True
 
-                except Exception as e:
-                    print(f"Navigation error on attempt {attempt + 1}: {e}")
-                    if attempt < max_retries - 1:
-                        time.sleep(3)
-                    else:
-                        raise Exception("Could not navigate to YouTube Studio")
+            except Exception as e:
+                print(f"Navigation error on attempt {attempt + 1}: {e}")
+        return False
+
+    def upload_project(self, session: BrowserSession, project) -> bool:
+        """Upload one project in the session's browser"""
+        driver = None
+        video_path = Path(project.output_path).resolve()
+        timer = StepTimer(project.id)
+        success = False
+        try:
+            # Get metadata
+            title = sanitize_text(project.title)
+            description = sanitize_text(
+                project.metadata.get("youtube_description", "")
+            )
 
-            if not success:
-                raise Exception("Could not find upload button")
+            with timer.step("browser"):
+                if session.driver is None or not session.healthy():
+                    self.progress.emit("Initializing browser...", 10)
+                driver = session.acquire()
+
+            self.progress.emit("Navigating to YouTube Studio...", 20)
+            with timer.step("studio"):
+                if not self.open_studio(driver):
+                    raise Exception("Could not find upload button")
 
             # Start upload process
             self.progress.emit("Starting upload process...", 30)
 
-            # Wait for any overlays to disappear
-            time.sleep(2)
-
-            # Click create button
-            create_button = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "#create-icon"))
-            )
-            driver.execute_script("arguments[0].click();", create_button)
-            time.sleep(2)
+            with timer.step("open_dialog"):
+                # Click create button once no overlay covers it
+                create_button = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "#create-icon"))
+                )
+                driver.execute_script("arguments[0].click();", create_button)
 
-            # Click upload option
-            upload_option = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "tp-yt-paper-item#text-item-0"))
-            )
-            driver.execute_script("arguments[0].click();", upload_option)
-            time.sleep(2)
+                # Click upload option
+                upload_option = WebDriverWait(driver, 10).until(
+                    EC.element_to_be_clickable((By.CSS_SELECTOR, "tp-yt-paper-item#text-item-0"))
+                )
+                driver.execute_script("arguments[0].click();", upload_option)
 
             # Handle file upload with improved method
-            video_path = Path(self.project.output_path).resolve()
-            if not self.handle_file_upload(driver, str(video_path)):
-                raise Exception("Failed to upload file")
-
-            # Wait for upload dialog to be ready
-            time.sleep(8)  # Longer wait after upload
+            with timer.step("select_file"):
+                if not self.handle_file_upload(driver, str(video_path)):
+                    raise Exception("Failed to upload file")
 
             # Set title
             self.progress.emit("Setting video title...", 60)
-            if not self.set_title_with_verification(driver, title):
-                print("Warning: Could not verify title was set correctly")
+            with timer.step("title"):
+                if not self.set_title_with_verification(driver, title):
+                    print("Warning: Could not verify title was set correctly")
 
             # Set description
             self.progress.emit("Setting video description...", 70)
-            try:
-                # Wait for description container
-                description_container = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((
-                        By.CSS_SELECTOR,
-                        "div[aria-label='Tell viewers about your video (type @ to mention a channel)']"
-                    ))
-                )
+            with timer.step("description"):
+                try:
+                    # Wait for description container
+                    description_container = WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable((
+                            By.CSS_SELECTOR,
+                            "div[aria-label='Tell viewers about your video (type @ to mention a channel)']"
+                        ))
+                    )
 
-                # Click to focus
-                description_container.click()
-                time.sleep(1)
+                    # Click to focus
+                    description_container.click()
 
-                # Clear and set description
-                active_element = driver.switch_to.active_element
-                active_element.send_keys(Keys.CONTROL + "a")
-                active_element.send_keys(Keys.DELETE)
-                time.sleep(1)
-                active_element.send_keys(description)
+                    # Clear and set description
+                    active_element = driver.switch_to.active_element
+                    active_element.send_keys(Keys.CONTROL + "a")
+                    active_element.send_keys(Keys.DELETE)
+                    WebDriverWait(driver, 5).until(
+                        lambda d: not element_text(d, description_container)
+                    )
+                    active_element.send_keys(description)
 
-                print("Successfully set description")
-                time.sleep(2)
-            except Exception as e:
-                print(f"Error setting description: {e}")
+                    # Line breaks are not part of textContent, so compare without whitespace
+                    expected = "".join(description.split())
+                    WebDriverWait(driver, 10).until(
+                        lambda d: "".join(element_text(d, description_container).split()) == expected
+                    )
+                    print("Successfully set description")
+                except Exception as e:
+                    print(f"Error setting description: {e}")
 
             # Click through next buttons
             self.progress.emit("Configuring upload settings...", 80)
-            for _ in range(3):
-                try:
-                    next_button = WebDriverWait(driver, 10).until(
-                        EC.element_to_be_clickable((By.ID, "next-button"))
-                    )
-                    driver.execute_script("arguments[0].click();", next_button)
-                    time.sleep(2)
-                except Exception as e:
-                    print(f"Error clicking next button: {e}")
-                    # Try alternative method
+            with timer.step("next_steps"):
+                for _ in range(3):
                     try:
-                        driver.execute_script(
-                            'document.querySelector("#next-button").click()'
-                        )
-                        time.sleep(2)
-                    except:
-                        pass
+                        self.click_next(driver)
+                    except Exception as e:
+                        print(f"Error clicking next button: {e}")
+                        # Try alternative method
+                        try:
+                            driver.execute_script(
+                                'document.querySelector("#next-button").click()'
+                            )
+                        except:
+                            pass
 
             # Set visibility
             self.progress.emit("Setting video visibility...", 90)
-            time.sleep(2)
-
-            try:
-                # Wait for visibility section and select unlisted
-                unlisted_radio = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.NAME, "UNLISTED"))
-                )
-                driver.execute_script("arguments[0].click();", unlisted_radio)
-            except:
+            with timer.step("visibility"):
                 try:
-                    # Alternative method using JavaScript
-                    driver.execute_script(
-                        'document.querySelector(\'tp-yt-paper-radio-button[name="UNLISTED"]\').click()'
+                    # Wait for visibility section and select unlisted
+                    unlisted_radio = WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable((By.NAME, "UNLISTED"))
                     )
-                except Exception as e:
-                    print(f"Could not set video visibility to unlisted: {e}")
+                    driver.execute_script("arguments[0].click();", unlisted_radio)
+                    WebDriverWait(driver, 5).until(
+                        lambda d: unlisted_radio.get_attribute("aria-checked") == "true"
+                        or unlisted_radio.get_attribute("checked") is not None
+                    )
+                except:
+                    try:
+                        # Alternative method using JavaScript
+                        driver.execute_script(
+                            'document.querySelector(\'tp-yt-paper-radio-button[name="UNLISTED"]\').click()'
+                        )
+                    except Exception as e:
+                        print(f"Could not set video visibility to unlisted: {e}")
 
-            time.sleep(2)
+            # Studio only keeps sending the file while the page is open, so
+            # make sure it has all of it before the dialog is closed
+            self.progress.emit("Waiting for upload to complete...", 92)
+            with timer.step("upload"):
+                if not self.wait_until_uploaded(driver, video_path):
+                    print("Warning: upload progress did not report completion")
 
             # Click done
             self.progress.emit("Finishing upload...", 95)
-            try:
-                done_button = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.ID, "done-button"))
-                )
-                driver.execute_script("arguments[0].click();", done_button)
-            except:
+            with timer.step("done"):
                 try:
-                    # Alternative method
-                    driver.execute_script(
-                        'document.querySelector("#done-button").click()'
+                    done_button = WebDriverWait(driver, 10).until(
+                        EC.element_to_be_clickable((By.ID, "done-button"))
                     )
-                except Exception as e:
-                    print(f"Error clicking done button: {e}")
-
-            time.sleep(20)
+                    driver.execute_script("arguments[0].click();", done_button)
+                except:
+                    try:
+                        # Alternative method
+                        driver.execute_script(
+                            'document.querySelector("#done-button").click()'
+                        )
+                    except Exception as e:
+                        print(f"Error clicking done button: {e}")
+                try:
+                    WebDriverWait(driver, 30).until(
+                        EC.invisibility_of_element_located((By.ID, "done-button"))
+                    )
+                except TimeoutException:
+                    print("Warning: upload dialog did not close")
 
-            driver.quit()
-            self.finished.emit(True)
+            # The browser stays open for the next upload
+            session.uploads += 1
+            success = True
+            return True
 
         except Exception as e:
             print(f"Upload error: {str(e)}")
@@ -440,10 +708,13 @@ class UploadWorker(QThread):
                 try:
                     driver.save_screenshot("error_screenshot.png")
                     print("Error screenshot saved")
-                    driver.quit()
                 except:
                     pass
-            self.finished.emit(False)
+                # Start from a fresh browser rather than an unknown page state
+                session.close()
+            return False
+        finally:
+            timer.save(video_path.parent / UPLOAD_TIMING_LOG, success)
 
 
 def sanitize_text(text: str) -> str:
@@ -451,4 +722,4 @@ def sanitize_text(text: str) -> str:
     return "".join(char for char in text if ord(char) < 0xFFFF)
 
 
-__all__ = ["UploadWorker"]
+__all__ = ["UploadWorker", "BrowserSession", "get_browser_session", "close_browser_session"]
@@ -0,0 +1,138 @@
+import os
+import time
+from concurrent.futures import CancelledError, Future
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from project.project import Project
+from runtime.asyncio_runtime import get_runtime, http_client
+from runtime.cancellation import CancellationToken, run_cancellable
+from upload.resumable import ResumableUpload, UploadError
+
+# Overridable so uploads can run against simulators.youtube
+YOUTUBE_UPLOAD_URL = os.getenv(
+    "YOUTUBE_UPLOAD_URL", "https://www.googleapis.com/upload/youtube/v3/videos"
+)
+YOUTUBE_TOKEN_URL = os.getenv("YOUTUBE_TOKEN_URL", "https://oauth2.googleapis.com/token")
+# Education; the documentary scripts fit it best
+CATEGORY_ID = "27"
+
+
+class YouTubeApiUploader:
+    """Uploads videos through the YouTube Data API.
+
+    Uses an OAuth refresh token (YOUTUBE_CLIENT_ID, YOUTUBE_CLIENT_SECRET
+    and YOUTUBE_REFRESH_TOKEN) to get access tokens. The title,
+    description and visibility are sent with the upload session, so there
+    is no separate edit step.
+    """
+
+    def __init__(self):
+        self.client_id = os.getenv("YOUTUBE_CLIENT_ID", "")
+        self.client_secret = os.getenv("YOUTUBE_CLIENT_SECRET", "")
+        self.refresh_token = os.getenv("YOUTUBE_REFRESH_TOKEN", "")
+        self._access_token = None
+        self._expires_at = 0.0
+
+    @staticmethod
+    def configured() -> bool:
+        """Whether API credentials are set; otherwise the browser uploader is used"""
+        return bool(os.getenv("YOUTUBE_REFRESH_TOKEN"))
+
+    async def auth_headers(self) -> Dict[str, str]:
+        """Authorization header with an access token, refreshed shortly before it expires"""
+        if self._access_token is None or time.time() > self._expires_at - 60:
+            response = await http_client().post(YOUTUBE_TOKEN_URL, data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "refresh_token": self.refresh_token,
+                "grant_type": "refresh_token",
+            })
+            if response.status_code != 200:
+                raise UploadError(f"Could not refresh access token: {response.text}")
+            token = response.json()
+            self._access_token = token["access_token"]
+            self._expires_at = time.time() + token.get("expires_in", 3600)
+        return {"Authorization": f"Bearer {self._access_token}"}
+
+    async def upload_project(
+        self, project: Project, progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[str]:
+        """Upload a project's video as unlisted and return the video ID"""
+        try:
+            video_path = Path(project.output_path)
+            metadata = {
+                "snippet": {
+                    "title": (project.metadata.get("youtube_title") or project.title)[:100],
+                    "description": project.metadata.get("youtube_description", ""),
+                    "categoryId": CATEGORY_ID,
+                },
+                "status": {
+                    "privacyStatus": "unlisted",
+                    "selfDeclaredMadeForKids": False,
+                },
+            }
+            upload = ResumableUpload(
+                video_path,
+                video_path.parent / "upload.json",
+                self.auth_headers,
+                progress_callback=progress_callback,
+            )
+            video = await upload.upload(
+                f"{YOUTUBE_UPLOAD_URL}?uploadType=resumable&part=snippet,status", metadata
+            )
+            project.add_metadata("youtube_video_id", video["id"])
+            print(f"Uploaded video {video['id']}")
+            return video["id"]
+        except (UploadError, OSError, KeyError, ValueError) as e:
+            print(f"Upload error: {e}")
+            return None
+
+
+class ApiUploadWorker(QObject):
+    """Runs an API upload on the shared asyncio runtime.
+
+    Has the same progress/finished signals and start() as the browser
+    UploadWorker, so the window can use either.
+    """
+
+    progress = pyqtSignal(str, int)
+    finished = pyqtSignal(bool)
+
+    def __init__(self, project: Project, parent=None):
+        super().__init__(parent)
+        self.project = project
+        self.cancel_token = CancellationToken()
+        self.future: Optional[Future] = None
+
+    def start(self):
+        self.progress.emit("Uploading to YouTube...", 0)
+        self.future = get_runtime().submit(run_cancellable(
+            YouTubeApiUploader().upload_project(self.project, self._on_bytes), self.cancel_token
+        ))
+        self.future.add_done_callback(self._on_done)
+
+    def cancel(self):
+        """Stop the upload; the session is kept so the next upload resumes it"""
+        self.cancel_token.cancel()
+
+    def isRunning(self) -> bool:
+        return self.future is not None and not self.future.done()
+
+    def _on_bytes(self, sent: int, total: int):
+        self.progress.emit(
+            f"Uploading to YouTube... {sent / 1e6:.1f} of {total / 1e6:.1f} MB",
+            int(sent * 100 / total) if total else 100,
+        )
+
+    def _on_done(self, future: Future):
+        try:
+            success = future.result() is not None
+        except CancelledError:
+            success = False
+        except Exception as e:
+            print(f"Error in upload worker: {e}")
+            success = False
+        self.finished.emit(success)
@@ -1,11 +1,88 @@
+import os
+import json
+import math
+import itertools
 import subprocess
 import shutil
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from project.storage import atomic_write, file_key
+from runtime.cancellation import CancellationToken, OperationCancelled, run_blocking
+from audio.library import MusicLibrary, SfxLibrary, sound_cues, strip_directions
+from telemetry.metrics import RENDER_SECONDS, RENDERED_SCENES, count_cache
+from telemetry.tracing import span
+from video.ffmpeg import run_ffmpeg
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """Output quality settings for a render pass"""
+    name: str
+    scale: float  # Relative to 1080p
+    preset: str
+    crf: int
+    output_name: str
+
+    def frame_size(self, layout: "Layout") -> tuple:
+        """Frame size (width, height) of a layout at this profile's scale"""
+        long_side = int(1920 * self.scale) // 2 * 2
+        short_side = int(1080 * self.scale) // 2 * 2
+        if layout.name == "vertical":
+            return (short_side, long_side)
+        if layout.name == "horizontal":
+            return (long_side, short_side)
+        return (short_side, short_side)
+
+
+@dataclass(frozen=True)
+class Layout:
+    """Frame shape and subtitle placement of a rendition, authored for 1080p"""
+    name: str  # "vertical", "horizontal" or "square"
+    base_y: int  # Distance of the bottom subtitle line from the bottom edge
+    line_spacing: int
+    max_chars: int
+    fade_duration: float
+
+
+# 9:16 for shorts, 16:9 for long-form videos, 1:1 for feeds that prefer square
+VERTICAL_LAYOUT = Layout("vertical", 250, 85, 28, 0.5)
+HORIZONTAL_LAYOUT = Layout("horizontal", 120, 75, 42, 0.4)
+SQUARE_LAYOUT = Layout("square", 160, 80, 34, 0.4)
+LAYOUTS = {layout.name: layout for layout in (VERTICAL_LAYOUT, HORIZONTAL_LAYOUT, SQUARE_LAYOUT)}
+
+
+def layout_for(is_short: bool) -> Layout:
+    """Primary layout of a project: vertical for shorts, horizontal otherwise"""
+    return VERTICAL_LAYOUT if is_short else HORIZONTAL_LAYOUT
+
+
+def rendition_name(profile: "RenderProfile", layout: Layout, primary: bool) -> str:
+    """File name of a rendition; the primary one keeps the profile's name"""
+    if primary:
+        return profile.output_name
+    stem, suffix = profile.output_name.rsplit(".", 1)
+    return f"{stem}_{layout.name}.{suffix}"
+
+
+# Final 1080p render
+FULL_PROFILE = RenderProfile("full", 1.0, "medium", 23, "output.mp4")
+# Fast 540p render shown in the preview player while the full render runs
+PROXY_PROFILE = RenderProfile("proxy", 0.5, "ultrafast", 30, "preview.mp4")
+# HLS playlist written scene by scene during a streaming render
+STREAM_PLAYLIST = "stream.m3u8"
+# Scene segments, narration stem and manifest kept by full renders so a
+# later render can patch changed scenes instead of starting over
+RENDER_STATE_DIR = "render"
+RENDER_MANIFEST = "manifest.json"
 
 
 class VideoCombiner:
-    def __init__(self):
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        # Cancelling the token kills the running ffmpeg process
+        self.cancel_token = cancel_token
         self.font_size = 84
         # Check for available fonts
         possible_fonts = [
@@ -23,6 +100,10 @@ class VideoCombiner:
         # Create assets directory if it doesn't exist
         self.assets_dir = Path("assets")
         self.assets_dir.mkdir(exist_ok=True)
+        # Indexed background music, matched to the script's music hint
+        self.music_library = MusicLibrary(self.assets_dir / "music", cancel_token)
+        # Indexed sound effects for the script's [Sound: ...] cues
+        self.sfx_library = SfxLibrary(self.assets_dir / "sfx", cancel_token)
 
     def escape_text(self, text: str) -> str:
         """Escape special characters for ffmpeg drawtext"""
@@ -102,103 +183,125 @@ class VideoCombiner:
 
         return lines
 
-    def create_video_from_image(
+    def scene_filter(
+        self,
+        layout: Layout,
+        duration: float,
+        subtitle: str = "",
+        profile: RenderProfile = FULL_PROFILE,
+    ) -> str:
+        """Scale/pad and subtitle filter chain for one rendition of a scene"""
+        # Layout values are authored for 1080p and scaled with the profile
+        width, height = profile.frame_size(layout)
+        scale = profile.scale
+        scale_filter = f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2:black"
+        text_size = int((self.font_size - 16) * scale)
+        base_y = f"h-{int(layout.base_y * scale)}"
+        line_spacing = int(layout.line_spacing * scale)
+        max_chars = layout.max_chars
+        fade_duration = layout.fade_duration
+
+        # Add subtitle overlay if available; sound and music directions are not shown
+        subtitle = strip_directions(subtitle)
+        if subtitle:
+            # Split subtitle into two parts
+            words = subtitle.split()
+            mid_point = len(words) // 2
+            first_half = " ".join(words[:mid_point])
+            second_half = " ".join(words[mid_point:])
+
+            # Calculate display timings
+            half_duration = duration / 2
+
+            # Create drawtext filters for each half with fade effects
+            text_filters = []
+
+            # First half of text
+            lines1 = self.split_text_into_lines(first_half, max_chars)
+            start_y1 = int(base_y.replace("h-", ""))
+
+            for i, line in enumerate(reversed(lines1)):
+                y_pos = f"h-{start_y1 + (i*line_spacing)}"
+                escaped_text = self.escape_text(line)
+
+                filter_text = (
+                    f"drawtext=fontfile={self.font_file}"
+                    f":text='{escaped_text}'"
+                    f":fontsize={text_size}"
+                    f":fontcolor=white"
+                    f":bordercolor=black@0.9"
+                    f":borderw=5"
+                    f":shadowcolor=black@0.8"
+                    f":shadowx=3:shadowy=3"
+                    f":box=1:boxcolor=black@0.4:boxborderw=8"
+                    f":x=(w-text_w)/2"
+                    f":y={y_pos}"
+                    f":alpha='if(lt(t,{fade_duration}),t/{fade_duration},if(lt(t,{half_duration}),1,if(lt(t,{
+                        half_duration}+{fade_duration}),({half_duration}+{fade_duration}-t)/{fade_duration},0)))'"
+                )
+                text_filters.append(filter_text)
+
+            # Second half of text
+            lines2 = self.split_text_into_lines(second_half, max_chars)
+            start_y2 = int(base_y.replace("h-", ""))
+
+            for i, line in enumerate(reversed(lines2)):
+                y_pos = f"h-{start_y2 + (i*line_spacing)}"
+                escaped_text = self.escape_text(line)
+
+                filter_text = (
+                    f"drawtext=fontfile={self.font_file}"
+                    f":text='{escaped_text}'"
+                    f":fontsize={text_size}"
+                    f":fontcolor=white"
+                    f":bordercolor=black@0.9"
+                    f":borderw=5"
+                    f":shadowcolor=black@0.8"
+                    f":shadowx=3:shadowy=3"
+                    f":box=1:boxcolor=black@0.4:boxborderw=8"
+                    f":x=(w-text_w)/2"
+                    f":y={y_pos}"
+                    f":alpha='if(lt(t,{half_duration}),0,if(lt(t,{half_duration}+{fade_duration}),((t-{half_duration})/{fade_duration}),if(lt(t,{
+                        duration}),1,if(lt(t,{duration}+{fade_duration}),(({duration}+{fade_duration}-t)/{fade_duration}),0))))'"
+                )
+                text_filters.append(filter_text)
+
+            # Filter all text lines together
+            if text_filters:
+                scale_filter = scale_filter + "," + ",".join(text_filters)
+
+        return scale_filter
+
+    def create_scene_clips(
         self,
         image_path: str,
         duration: float,
-        output_path: str,
+        outputs: Dict[str, str],
         subtitle: str = "",
-        is_short: bool = True,
+        profile: RenderProfile = FULL_PROFILE,
     ) -> bool:
-        """Create a video clip from a single image with subtitle overlay"""
+        """Create clips of one scene in several layouts with a single ffmpeg run
+
+        outputs maps a layout name (see LAYOUTS) to the clip path. The image
+        is decoded once and split into one scale/pad/subtitle branch per
+        layout, each with its own encoder.
+        """
         try:
             print(f"Creating video from image: {image_path}")
-            print(f"Output path: {output_path}")
-            print(f"Video type: {'short/vertical' if is_short else 'long/horizontal'}")
-
-            if is_short:
-                scale_filter = "scale=1080:1920:force_original_aspect_ratio=decrease,pad=1080:1920:(ow-iw)/2:(oh-ih)/2:black"
-                text_size = self.font_size - 16
-                base_y = "h-250"
-                line_spacing = 85
-                max_chars = 28
-                fade_duration = 0.5
-            else:
-                # Format landscape (16:9)
-                scale_filter = "scale=1920:1080:force_original_aspect_ratio=decrease,pad=1920:1080:(ow-iw)/2:(oh-ih)/2:black"
-                text_size = self.font_size - 16
-                base_y = "h-120"
-                line_spacing = 75
-                max_chars = 42
-                fade_duration = 0.4
-
-            # Add subtitle overlay if available
-            if subtitle:
-                # Split subtitle into two parts
-                words = subtitle.split()
-                mid_point = len(words) // 2
-                first_half = " ".join(words[:mid_point])
-                second_half = " ".join(words[mid_point:])
-
-                # Calculate display timings
-                half_duration = duration / 2
-
-                # Create drawtext filters for each half with fade effects
-                text_filters = []
-
-                # First half of text
-                lines1 = self.split_text_into_lines(first_half, max_chars)
-                start_y1 = int(base_y.replace("h-", ""))
-
-                for i, line in enumerate(reversed(lines1)):
-                    y_pos = f"h-{start_y1 + (i*line_spacing)}"
-                    escaped_text = self.escape_text(line)
-
-                    filter_text = (
-                        f"drawtext=fontfile={self.font_file}"
-                        f":text='{escaped_text}'"
-                        f":fontsize={text_size}"
-                        f":fontcolor=white"
-                        f":bordercolor=black@0.9"
-                        f":borderw=5"
-                        f":shadowcolor=black@0.8"
-                        f":shadowx=3:shadowy=3"
-                        f":box=1:boxcolor=black@0.4:boxborderw=8"
-                        f":x=(w-text_w)/2"
-                        f":y={y_pos}"
-                        f":alpha='if(lt(t,{fade_duration}),t/{fade_duration},if(lt(t,{half_duration}),1,if(lt(t,{
-                            half_duration}+{fade_duration}),({half_duration}+{fade_duration}-t)/{fade_duration},0)))'"
-                    )
-                    text_filters.append(filter_text)
-
-                # Second half of text
-                lines2 = self.split_text_into_lines(second_half, max_chars)
-                start_y2 = int(base_y.replace("h-", ""))
-
-                for i, line in enumerate(reversed(lines2)):
-                    y_pos = f"h-{start_y2 + (i*line_spacing)}"
-                    escaped_text = self.escape_text(line)
-
-                    filter_text = (
-                        f"drawtext=fontfile={self.font_file}"
-                        f":text='{escaped_text}'"
-                        f":fontsize={text_size}"
-                        f":fontcolor=white"
-                        f":bordercolor=black@0.9"
-                        f":borderw=5"
-                        f":shadowcolor=black@0.8"
-                        f":shadowx=3:shadowy=3"
-                        f":box=1:boxcolor=black@0.4:boxborderw=8"
-                        f":x=(w-text_w)/2"
-                        f":y={y_pos}"
-                        f":alpha='if(lt(t,{half_duration}),0,if(lt(t,{half_duration}+{fade_duration}),((t-{half_duration})/{fade_duration}),if(lt(t,{
-                            duration}),1,if(lt(t,{duration}+{fade_duration}),(({duration}+{fade_duration}-t)/{fade_duration}),0))))'"
-                    )
-                    text_filters.append(filter_text)
+            print(f"Output paths: {outputs}")
 
-                # Filter all text lines together
-                if text_filters:
-                    scale_filter = scale_filter + "," + ",".join(text_filters)
+            names = list(outputs)
+            if len(names) == 1:
+                graph = f"[0:v]{self.scene_filter(LAYOUTS[names[0]], duration, subtitle, profile)}[v0]"
+            else:
+                branches = "".join(f"[s{i}]" for i in range(len(names)))
+                graph = ";".join(
+                    [f"[0:v]split={len(names)}{branches}"]
+                    + [
+                        f"[s{i}]{self.scene_filter(LAYOUTS[name], duration, subtitle, profile)}[v{i}]"
+                        for i, name in enumerate(names)
+                    ]
+                )
 
             command = [
                 "ffmpeg",
@@ -207,23 +310,34 @@ class VideoCombiner:
                 "1",
                 "-i",
                 image_path,
-                "-c:v",
-                "libx264",
-                "-t",
-                str(duration),
-                "-pix_fmt",
-                "yuv420p",
-                "-vf",
-                scale_filter,
-                "-vsync",
-                "cfr",  # Use constant frame rate
-                "-r",
-                "30",  # Set frame rate to 30fps
-                output_path,
+                "-filter_complex",
+                graph,
             ]
+            for i, name in enumerate(names):
+                command += [
+                    "-map",
+                    f"[v{i}]",
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    profile.preset,
+                    "-crf",
+                    str(profile.crf),
+                    "-t",
+                    str(duration),
+                    "-pix_fmt",
+                    "yuv420p",
+                    "-flags",
+                    "+cgop",  # Closed GOPs so scene clips can be spliced by stream copy
+                    "-vsync",
+                    "cfr",  # Use constant frame rate
+                    "-r",
+                    "30",  # Set frame rate to 30fps
+                    outputs[name],
+                ]
 
             print(f"Running command: {' '.join(command)}")
-            subprocess.run(command, check=True, capture_output=True)
+            run_ffmpeg(command, self.cancel_token, check=True, kind="scene_clip")
             print("Successfully created video from image")
             return True
 
@@ -232,6 +346,25 @@ class VideoCombiner:
             print(f"ffmpeg stderr: {e.stderr.decode()}")
             return False
 
+    def create_video_from_image(
+        self,
+        image_path: str,
+        duration: float,
+        output_path: str,
+        subtitle: str = "",
+        is_short: bool = True,
+        profile: RenderProfile = FULL_PROFILE,
+    ) -> bool:
+        """Create a video clip from a single image with subtitle overlay"""
+        print(f"Video type: {'short/vertical' if is_short else 'long/horizontal'}")
+        return self.create_scene_clips(
+            image_path,
+            duration,
+            {layout_for(is_short).name: output_path},
+            subtitle,
+            profile,
+        )
+
     def combine_audio_video(
         self, video_path: str, audio_path: str, output_path: str
     ) -> bool:
@@ -257,7 +390,7 @@ class VideoCombiner:
             ]
 
             print(f"Running command: {' '.join(command)}")
-            subprocess.run(command, check=True, capture_output=True)
+            run_ffmpeg(command, self.cancel_token, check=True, kind="scene_mux")
             print("Successfully combined audio and video")
             return True
         except subprocess.CalledProcessError as e:
@@ -265,8 +398,19 @@ class VideoCombiner:
             print(f"ffmpeg stderr: {e.stderr.decode()}")
             return False
 
-    def concatenate_videos(self, video_clips: List[str], output_path: str) -> bool:
-        """Concatenate multiple video clips into a single video with smooth transitions"""
+    def concatenate_videos(
+        self,
+        video_clips: List[str],
+        output_path: str,
+        profile: RenderProfile = FULL_PROFILE,
+        stream_copy: bool = False,
+    ) -> bool:
+        """Concatenate multiple video clips into a single video with smooth transitions
+
+        With stream_copy the clips are joined without re-encoding, which is
+        valid because every scene clip of a render shares the same codec
+        settings and starts on a keyframe.
+        """
         try:
             print(f"Concatenating {len(video_clips)} video clips")
             print("Video clips to concatenate:")
@@ -305,23 +449,30 @@ class VideoCombiner:
             if xfade_filters:
                 filter_complex.extend(xfade_filters)
 
+            if stream_copy:
+                codec_args = ["-c", "copy"]
+            else:
+                codec_args = [
+                    "-c:v", "libx264",
+                    "-preset", profile.preset,
+                    "-crf", str(profile.crf),
+                    "-c:a", "aac",
+                    "-b:a", "192k",
+                    "-ar", "44100",
+                    "-ac", "2",
+                ]
+
             command = [
                 "ffmpeg", "-y",
                 "-f", "concat",
                 "-safe", "0",
                 "-i", str(list_file),
-                "-c:v", "libx264",
-                "-preset", "medium",
-                "-crf", "23",
-                "-c:a", "aac",
-                "-b:a", "192k",
-                "-ar", "44100",
-                "-ac", "2",
+                *codec_args,
                 output_path
             ]
 
             print(f"Running command: {' '.join(command)}")
-            result = subprocess.run(command, capture_output=True, text=True)
+            result = run_ffmpeg(command, self.cancel_token, text=True, kind="concat")
 
             if result.returncode != 0:
                 print(f"FFmpeg error: {result.stderr}")
@@ -340,13 +491,108 @@ class VideoCombiner:
             print(f"Error in concatenate_videos: {str(e)}")
             return False
 
+    def write_stream_segment(self, clip_path: str, segment_path: str, offset: float) -> bool:
+        """Remux a finished scene clip into an MPEG-TS segment for HLS playback
+
+        The segment is shifted by offset seconds so timestamps continue from
+        the previous scene and players see one continuous stream.
+        """
+        try:
+            command = [
+                "ffmpeg",
+                "-y",
+                "-i",
+                clip_path,
+                "-c",
+                "copy",
+                "-output_ts_offset",
+                f"{offset:.3f}",
+                "-muxdelay",
+                "0",
+                "-muxpreload",
+                "0",
+                "-f",
+                "mpegts",
+                segment_path,
+            ]
+
+            print(f"Running command: {' '.join(command)}")
+            run_ffmpeg(command, self.cancel_token, check=True, kind="stream_segment")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"Error writing stream segment: {e}")
+            print(f"ffmpeg stderr: {e.stderr.decode()}")
+            return False
+
+    def write_stream_playlist(
+        self, playlist_path: Path, segments: List[tuple], target_duration: int, finished: bool
+    ) -> None:
+        """Rewrite the HLS event playlist listing (file name, duration) segments"""
+        lines = [
+            "#EXTM3U",
+            "#EXT-X-VERSION:3",
+            f"#EXT-X-TARGETDURATION:{target_duration}",
+            "#EXT-X-MEDIA-SEQUENCE:0",
+            "#EXT-X-PLAYLIST-TYPE:EVENT",
+        ]
+        for name, duration in segments:
+            lines.append(f"#EXTINF:{duration:.3f},")
+            lines.append(name)
+        if finished:
+            lines.append("#EXT-X-ENDLIST")
+        # Players poll the playlist while it grows, so never expose a partial file
+        atomic_write(playlist_path, "\n".join(lines) + "\n")
+
+    def audio_mix_filter(
+        self,
+        speech: str,
+        music: Optional[str],
+        effects: Sequence[Tuple[str, float]],
+        first_effect: int,
+    ) -> str:
+        """filter_complex mixing speech, music and sound effects into [aout]
+
+        speech and music are input pads such as "[0:a]"; effect k is input
+        first_effect + k and is delayed to its start time, so any number of
+        effects costs a single mixing pass.
+        """
+        bed = "[bed]" if effects else "[aout]"
+        if music:
+            parts = [
+                f"{speech}volume=1.0[a1]",  # Keep original audio at 100%
+                f"{music}volume=0.2[a2]",  # Reduce music volume to 20%
+                f"[a1][a2]amix=inputs=2:duration=first{bed}",  # Mix both audio streams
+            ]
+        else:
+            parts = [f"{speech}anull{bed}"]
+
+        if effects:
+            labels = ""
+            for k, (_, start) in enumerate(effects):
+                delay = int(start * 1000)
+                parts.append(f"[{first_effect + k}:a]adelay={delay}|{delay},volume=0.4[e{k}]")
+                labels += f"[e{k}]"
+            # Effects are added on top of the bed without rescaling it
+            parts.append(
+                f"[bed]{labels}amix=inputs={len(effects) + 1}:duration=first:normalize=0[aout]"
+            )
+        return ";".join(parts)
+
     def add_background_music(
-        self, video_path: str, music_path: str, output_path: str
+        self,
+        video_path: str,
+        music_path: Optional[str],
+        output_path: str,
+        effects: Sequence[Tuple[str, float]] = (),
     ) -> bool:
-        """Add background music to video with volume adjustment"""
+        """Add background music and sound effects to video with volume adjustment
+
+        effects are (audio path, start seconds) pairs, mixed in the same pass.
+        """
         try:
             print(f"Adding background music to video: {video_path}")
             print(f"Music file: {music_path}")
+            print(f"Sound effects: {len(effects)}")
             print(f"Output path: {output_path}")
 
             command = [
@@ -354,14 +600,21 @@ class VideoCombiner:
                 "-y",
                 "-i",
                 video_path,  # Input video with original audio
-                "-stream_loop",
-                "-1",  # Loop the music for entire video duration
-                "-i",
-                music_path,  # Input music file
+            ]
+            if music_path:
+                command += [
+                    "-stream_loop",
+                    "-1",  # Loop the music for entire video duration
+                    "-i",
+                    music_path,  # Input music file
+                ]
+            for effect_path, _ in effects:
+                command += ["-i", effect_path]
+            command += [
                 "-filter_complex",
-                "[0:a]volume=1.0[a1];"  # Keep original audio at 100%
-                "[1:a]volume=0.2[a2];"  # Reduce music volume to 20%
-                "[a1][a2]amix=inputs=2:duration=first[aout]",  # Mix both audio streams
+                self.audio_mix_filter(
+                    "[0:a]", "[1:a]" if music_path else None, effects, 2 if music_path else 1
+                ),
                 "-map",
                 "0:v",  # Take video from first input
                 "-map",
@@ -377,7 +630,7 @@ class VideoCombiner:
             ]
 
             print(f"Running command: {' '.join(command)}")
-            subprocess.run(command, check=True, capture_output=True)
+            run_ffmpeg(command, self.cancel_token, check=True, kind="music")
             print("Successfully added background music")
             return True
         except subprocess.CalledProcessError as e:
@@ -385,6 +638,356 @@ class VideoCombiner:
             print(f"ffmpeg stderr: {e.stderr.decode()}")
             return False
 
+    def find_soundtrack(self) -> Optional[Path]:
+        """Background music file, if one exists"""
+        # Check for soundtrack in multiple locations
+        possible_soundtrack_paths = [
+            Path("assets/soundtrack.mp3"),
+            Path("soundtrack.mp3"),
+            self.assets_dir / "soundtrack.mp3",
+        ]
+
+        return next(
+            (p for p in possible_soundtrack_paths if p.exists()), None
+        )
+
+    def prepare_music(
+        self, hint: Optional[str], duration: Optional[float], output_path: Path
+    ) -> Optional[Path]:
+        """Background music for a timeline of the given length
+
+        A library track matching the hint is written to output_path as PCM
+        trimmed or looped to exactly duration, so the mix only reads samples.
+        Without a library the single soundtrack file is used, looped by the
+        mix.
+        """
+        track = self.music_library.select(hint)
+        if track:
+            print(f"Using library track {track.path} for music {hint!r}")
+            if duration is None:
+                return self.music_library.ensure_pcm(track)
+            if self.music_library.fit(track, duration, output_path):
+                return output_path
+        return self.find_soundtrack()
+
+    def soundtrack_key(self, hint: Optional[str] = None) -> Optional[str]:
+        """Fingerprint of the background music, so a changed soundtrack is re-mixed"""
+        track = self.music_library.select(hint)
+        if track:
+            return f"{track.path}:{track.key}"
+        soundtrack_path = self.find_soundtrack()
+        return f"{soundtrack_path}:{file_key(soundtrack_path)}" if soundtrack_path else None
+
+    def effect_cues(
+        self,
+        scripts: Optional[List[str]],
+        sound_effects: Optional[List[str]],
+        durations: List[float],
+    ) -> List[Tuple[str, float]]:
+        """Sound effect PCM files and their start times on the scene timeline"""
+        starts = list(itertools.accumulate(durations, initial=0.0))
+        effects = []
+        for scene, position, name in sound_cues(scripts, sound_effects):
+            if scene >= len(durations):
+                continue
+            track = self.sfx_library.select(name)
+            pcm = self.sfx_library.ensure_pcm(track) if track else None
+            if pcm is None:
+                print(f"No sound effect found for cue {name!r}")
+                continue
+            effects.append((str(pcm), starts[scene] + position * durations[scene]))
+        return effects
+
+    @staticmethod
+    def effects_key(effects: Sequence[Tuple[str, float]]) -> List[list]:
+        """Comparable form of effect cues for the render manifest"""
+        return [[Path(path).name, round(start, 2)] for path, start in effects]
+
+    def media_duration(self, path: str) -> Optional[float]:
+        """Duration of a media file in seconds, or None if it cannot be probed"""
+        command = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            path,
+        ]
+        try:
+            result = run_ffmpeg(command, self.cancel_token, text=True, check=True, kind="probe")
+            return float(result.stdout.strip())
+        except (subprocess.CalledProcessError, ValueError, OSError):
+            return None
+
+    def build_narration_stem(
+        self, audio_files: List[str], durations: List[float], output_path: str
+    ) -> bool:
+        """Join scene narrations into one track, each padded or cut to its scene's length"""
+        try:
+            command = ["ffmpeg", "-y"]
+            for audio_file in audio_files:
+                command += ["-i", audio_file]
+            filters = [
+                f"[{i}:a]aresample=44100,aformat=channel_layouts=stereo,"
+                f"apad,atrim=0:{duration:.6f},asetpts=PTS-STARTPTS[a{i}]"
+                for i, duration in enumerate(durations)
+            ]
+            inputs = "".join(f"[a{i}]" for i in range(len(durations)))
+            filters.append(f"{inputs}concat=n={len(durations)}:v=0:a=1[aout]")
+            command += [
+                "-filter_complex",
+                ";".join(filters),
+                "-map",
+                "[aout]",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "192k",
+                output_path,
+            ]
+
+            print(f"Running command: {' '.join(command)}")
+            run_ffmpeg(command, self.cancel_token, check=True, kind="narration")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"Error building narration stem: {e}")
+            print(f"ffmpeg stderr: {e.stderr.decode()}")
+            return False
+
+    def mux_narration(
+        self,
+        video_path: str,
+        narration_path: str,
+        music_path: Optional[Path],
+        output_path: str,
+        effects: Sequence[Tuple[str, float]] = (),
+    ) -> bool:
+        """Mux a video-only file with the narration stem, mixing in music and effects like add_background_music"""
+        try:
+            command = [
+                "ffmpeg",
+                "-y",
+                "-i",
+                video_path,
+                "-i",
+                narration_path,
+            ]
+            if music_path:
+                command += ["-stream_loop", "-1", "-i", str(music_path)]
+            for effect_path, _ in effects:
+                command += ["-i", effect_path]
+            if music_path or effects:
+                command += [
+                    "-filter_complex",
+                    self.audio_mix_filter(
+                        "[1:a]", "[2:a]" if music_path else None, effects, 3 if music_path else 2
+                    ),
+                    "-map",
+                    "0:v",
+                    "-map",
+                    "[aout]",
+                ]
+            else:
+                command += ["-map", "0:v", "-map", "1:a"]
+            command += [
+                "-c:v",
+                "copy",
+                "-c:a",
+                "aac",
+                "-b:a",
+                "192k",
+                "-shortest",
+                output_path,
+            ]
+
+            print(f"Running command: {' '.join(command)}")
+            run_ffmpeg(command, self.cancel_token, check=True, kind="narration_mux")
+            return True
+        except subprocess.CalledProcessError as e:
+            print(f"Error muxing narration: {e}")
+            print(f"ffmpeg stderr: {e.stderr.decode()}")
+            return False
+
+    def save_render_state(
+        self,
+        project_dir: Path,
+        layout: Layout,
+        scene_clips: List[str],
+        images: List[str],
+        audio_files: List[str],
+        scripts: Optional[List[str]],
+        music: Optional[str] = None,
+        sound_effects: Optional[List[str]] = None,
+    ) -> None:
+        """Keep a full render's video-only scene clips and a narration stem for patching
+
+        Renders without narration for every scene are not kept; patching
+        them falls back to a full render.
+        """
+        state_dir = project_dir / RENDER_STATE_DIR
+        shutil.rmtree(state_dir, ignore_errors=True)
+        if not audio_files or len(audio_files) != len(images):
+            return
+
+        state_dir.mkdir(parents=True, exist_ok=True)
+        scenes = []
+        for i, clip in enumerate(scene_clips):
+            segment = state_dir / f"scene_{i:04d}.mp4"
+            os.replace(clip, segment)
+            clip_duration = self.media_duration(str(segment))
+            if clip_duration is None:
+                print("Could not probe scene clip, render will not be patchable")
+                shutil.rmtree(state_dir, ignore_errors=True)
+                return
+            scenes.append({
+                "image": images[i],
+                "image_key": file_key(images[i]),
+                "audio": audio_files[i],
+                "audio_key": file_key(audio_files[i]),
+                "subtitle": scripts[i] if scripts and i < len(scripts) else "",
+                "duration": clip_duration,
+            })
+
+        if not self.build_narration_stem(
+            audio_files, [scene["duration"] for scene in scenes], str(state_dir / "narration.m4a")
+        ):
+            shutil.rmtree(state_dir, ignore_errors=True)
+            return
+
+        manifest = {
+            "layout": layout.name,
+            "music": music,
+            "soundtrack": self.soundtrack_key(music),
+            "effects": self.effects_key(
+                self.effect_cues(scripts, sound_effects, [scene["duration"] for scene in scenes])
+            ),
+            "scenes": scenes,
+        }
+        atomic_write(state_dir / RENDER_MANIFEST, json.dumps(manifest, indent=2))
+
+    def finish_rendition(
+        self,
+        video_clips: List[str],
+        temp_dir: Path,
+        final_output: Path,
+        suffix: str = "",
+        profile: RenderProfile = FULL_PROFILE,
+        stream_copy: bool = False,
+        fit_short: bool = False,
+        music: Optional[str] = None,
+        effects: Sequence[Tuple[str, float]] = (),
+    ) -> bool:
+        """Concatenate a rendition's scene clips, fit shorts to 59.5 seconds and add music"""
+        # Concatenate all clips directly
+        temp_output = temp_dir / f"temp_output{suffix}.mp4"
+        if not self.concatenate_videos(
+            video_clips, str(temp_output), profile, stream_copy=stream_copy
+        ):
+            print("Failed to concatenate videos")
+            return False
+
+        # Check if we need to adjust video speed
+        duration_command = [
+            "ffprobe",
+            "-v",
+            "error",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "default=noprint_wrappers=1:nokey=1",
+            str(temp_output),
+        ]
+
+        timeline = None
+        duration_result = run_ffmpeg(duration_command, self.cancel_token, text=True, kind="probe")
+        if duration_result.returncode == 0:
+            duration = float(duration_result.stdout.strip())
+            timeline = duration
+            speed_adjusted_output = temp_dir / f"speed_adjusted{suffix}.mp4"
+
+            # Apply speed adjustment only for short videos
+            if fit_short and duration > 59.5:
+                speed = duration / 59.5
+
+                speed_command = [
+                    "ffmpeg",
+                    "-y",
+                    "-i",
+                    str(temp_output),
+                    "-filter_complex",
+                    f"[0:v]setpts={1/speed}*PTS[v];[0:a]atempo={speed}[a]",
+                    "-map",
+                    "[v]",
+                    "-map",
+                    "[a]",
+                    "-c:v",
+                    "libx264",
+                    "-preset",
+                    profile.preset,
+                    "-crf",
+                    str(profile.crf),
+                    "-vsync",
+                    "cfr",
+                    "-r",
+                    "30",
+                    "-g",
+                    "30",
+                    "-c:a",
+                    "aac",
+                    "-b:a",
+                    "192k",
+                    "-ar",
+                    "44100",
+                    "-ac",
+                    "2",
+                    str(speed_adjusted_output),
+                ]
+
+                print("Adjusting video speed to fit 59.5 seconds...")
+                speed_result = run_ffmpeg(speed_command, self.cancel_token, text=True, kind="speed")
+                if speed_result.returncode == 0:
+                    temp_output = speed_adjusted_output
+                    timeline = 59.5
+                    effects = [(path, start / speed) for path, start in effects]
+            else:
+                print("Skipping speed adjustment for long video")
+
+        # Add background music if exists
+        soundtrack_path = self.prepare_music(music, timeline, temp_dir / f"music{suffix}.wav")
+        if soundtrack_path or effects:
+            if soundtrack_path:
+                print(f"Using soundtrack from: {soundtrack_path}")
+            # Mix into the temp directory first so a cancelled mix never
+            # leaves a truncated file in place of the previous output
+            mixed_output = temp_dir / f"with_music{suffix}.mp4"
+            if self.add_background_music(
+                str(temp_output),
+                str(soundtrack_path) if soundtrack_path else None,
+                str(mixed_output),
+                effects,
+            ):
+                os.replace(mixed_output, final_output)
+            else:
+                print("Failed to add background music, using video without music")
+                shutil.copy(str(temp_output), str(final_output))
+        else:
+            print("No soundtrack found, using video without music")
+            shutil.copy(str(temp_output), str(final_output))
+        return True
+
+    def scene_durations(
+        self, audio_files: List[str], count: int, scene_duration: float
+    ) -> List[float]:
+        """Scene lengths: each narration's duration, or scene_duration without audio"""
+        if not audio_files:
+            return [scene_duration] * count
+        return [
+            duration if duration is not None else scene_duration
+            for duration in map(self.media_duration, audio_files)
+        ]
+
     async def create_final_video(
         self,
         project_id: str,
@@ -392,15 +995,247 @@ class VideoCombiner:
         audio_files: List[str],
         scene_duration: float = 5.0,
         scripts: List[str] = None,
+        profile: RenderProfile = FULL_PROFILE,
+        stream_callback=None,
+        renditions: Sequence[str] = (),
+        music: Optional[str] = None,
+        sound_effects: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Create the final video by combining all components
+
+        music is the script's background music hint, used to pick a track
+        from the music library. Sound effects follow the [Sound: ...]
+        directions in scripts, or the sound_effects list when there are
+        none, and are mixed together with the music in one pass.
+
+        renditions names extra layouts (see LAYOUTS) rendered alongside the
+        primary one, e.g. ("square",) also writes output_square.mp4. Each
+        scene image is decoded once and split into every layout, so an
+        extra rendition costs an encode rather than a whole pipeline.
+
+        If stream_callback is given, every finished scene is also published
+        as an HLS segment under projects/<id>/stream/ and the callback receives
+        the playlist path as soon as the first scene is playable. The scenes
+        are then joined with stream copy instead of being encoded again.
+
+        The ffmpeg pipeline blocks, so it runs in a worker thread and the
+        shared event loop stays free for other jobs' API requests.
+        """
+        start = time.perf_counter()
+        with span("render", profile=profile.name, scenes=len(images)) as render_span:
+            output = await run_blocking(
+                self._create_final_video,
+                project_id,
+                images,
+                audio_files,
+                scene_duration,
+                scripts,
+                profile,
+                stream_callback,
+                renditions,
+                music,
+                sound_effects,
+            )
+            render_span.set(ok=output is not None)
+        RENDER_SECONDS.observe(
+            time.perf_counter() - start, profile.name, "ok" if output else "failed"
+        )
+        if output:
+            RENDERED_SCENES.inc(profile.name, amount=len(images))
+        return output
+
+    async def patch_final_video(
+        self,
+        project_id: str,
+        images: List[str],
+        audio_files: List[str],
+        scene_duration: float = 5.0,
+        scripts: List[str] = None,
+        music: Optional[str] = None,
+        sound_effects: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Update output.mp4 by re-encoding only the scenes that changed
+
+        Uses the scene clips and narration stem kept by the last full
+        render: changed scenes are re-encoded, all scene clips are joined by
+        stream copy and only the audio track is re-mixed. Returns None when
+        the render cannot be patched (no kept state, different scene count or
+        format, a short that would need speeding up) so the caller can fall
+        back to create_final_video.
+        """
+        with span("patch", scenes=len(images)) as patch_span:
+            output = await run_blocking(
+                self._patch_final_video,
+                project_id,
+                images,
+                audio_files,
+                scene_duration,
+                scripts,
+                music,
+                sound_effects,
+            )
+            patch_span.set(ok=output is not None)
+            return output
+
+    def _patch_final_video(
+        self,
+        project_id: str,
+        images: List[str],
+        audio_files: List[str],
+        scene_duration: float = 5.0,
+        scripts: List[str] = None,
+        music: Optional[str] = None,
+        sound_effects: Optional[List[str]] = None,
+    ) -> Optional[str]:
+        """Blocking implementation of patch_final_video"""
+        project_dir = Path(f"projects/{project_id}")
+        state_dir = project_dir / RENDER_STATE_DIR
+        final_output = project_dir / FULL_PROFILE.output_name
+        temp_dir = project_dir / "temp" / "patch"
+        try:
+            manifest = json.loads((state_dir / RENDER_MANIFEST).read_text())
+            scenes = manifest["scenes"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+        is_short = len(images) * scene_duration <= 60
+        if (
+            manifest.get("layout") != layout_for(is_short).name
+            or len(scenes) != len(images)
+            or len(audio_files) != len(images)
+            or not final_output.exists()
+            or not (state_dir / "narration.m4a").exists()
+        ):
+            print("Render state does not match the project, a full render is needed")
+            return None
+
+        try:
+            durations = self.scene_durations(audio_files, len(images), scene_duration)
+            if is_short and sum(durations) > 59.5:
+                print("Short needs speed adjustment, a full render is needed")
+                return None
+
+            changed = []
+            for i, (image, audio) in enumerate(zip(images, audio_files)):
+                scene = scenes[i]
+                subtitle = scripts[i] if scripts and i < len(scripts) else ""
+                segment = state_dir / f"scene_{i:04d}.mp4"
+                if (
+                    not segment.exists()
+                    or scene["image"] != image
+                    or scene["image_key"] != file_key(image)
+                    or scene["subtitle"] != subtitle
+                    or abs(scene["duration"] - durations[i]) > 0.05
+                ):
+                    changed.append(i)
+            count_cache("scene_clip", hits=len(images) - len(changed), misses=len(changed))
+            soundtrack = self.soundtrack_key(music)
+            effects = self.effect_cues(
+                scripts, sound_effects, [scene["duration"] for scene in scenes]
+            )
+            audio_changed = changed or manifest.get("soundtrack") != soundtrack or any(
+                scene["audio"] != audio or scene["audio_key"] != file_key(audio)
+                for scene, audio in zip(scenes, audio_files)
+            ) or manifest.get("effects") != self.effects_key(effects)
+            if not audio_changed:
+                print("No scene changes, keeping existing video")
+                return str(final_output)
+
+            print(f"Patching scenes {[i + 1 for i in changed]} of project {project_id}")
+            temp_dir.mkdir(parents=True, exist_ok=True)
+            layout = LAYOUTS[manifest["layout"]]
+            for i in changed:
+                subtitle = scripts[i] if scripts and i < len(scripts) else ""
+                temp_clip = temp_dir / f"scene_{i:04d}.mp4"
+                with span("scene", scene=i + 1):
+                    if not self.create_scene_clips(
+                        images[i], durations[i], {layout.name: str(temp_clip)}, subtitle
+                    ):
+                        print(f"Failed to re-render scene {i + 1}")
+                        return None
+                    clip_duration = self.media_duration(str(temp_clip))
+                    if clip_duration is None:
+                        return None
+                    scenes[i].update(
+                        image=images[i],
+                        image_key=file_key(images[i]),
+                        subtitle=subtitle,
+                        duration=clip_duration,
+                    )
+
+            # Scene clips are swapped in together only after all re-encodes succeeded
+            for i in changed:
+                os.replace(temp_dir / f"scene_{i:04d}.mp4", state_dir / f"scene_{i:04d}.mp4")
+            for scene, audio in zip(scenes, audio_files):
+                scene.update(audio=audio, audio_key=file_key(audio))
+            manifest["music"] = music
+            manifest["soundtrack"] = soundtrack
+            # Cue times follow the re-rendered scene lengths
+            effects = self.effect_cues(
+                scripts, sound_effects, [scene["duration"] for scene in scenes]
+            )
+            manifest["effects"] = self.effects_key(effects)
+
+            narration = temp_dir / "narration.m4a"
+            video_only = temp_dir / "video.mp4"
+            patched = temp_dir / "output.mp4"
+            if not self.build_narration_stem(
+                audio_files, [scene["duration"] for scene in scenes], str(narration)
+            ):
+                return None
+            if not self.concatenate_videos(
+                [str(state_dir / f"scene_{i:04d}.mp4") for i in range(len(scenes))],
+                str(video_only),
+                stream_copy=True,
+            ):
+                return None
+            music_path = self.prepare_music(
+                music, sum(scene["duration"] for scene in scenes), temp_dir / "music.wav"
+            )
+            if not self.mux_narration(
+                str(video_only), str(narration), music_path, str(patched), effects
+            ):
+                return None
+
+            os.replace(narration, state_dir / "narration.m4a")
+            atomic_write(state_dir / RENDER_MANIFEST, json.dumps(manifest, indent=2))
+            os.replace(patched, final_output)
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            print(f"Successfully patched final video: {final_output}")
+            return str(final_output)
+
+        except OperationCancelled:
+            print(f"Cancelled patching video for project {project_id}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            raise
+
+        except Exception as e:
+            print(f"Error patching final video: {e}")
+            return None
+
+    def _create_final_video(
+        self,
+        project_id: str,
+        images: List[str],
+        audio_files: List[str],
+        scene_duration: float = 5.0,
+        scripts: List[str] = None,
+        profile: RenderProfile = FULL_PROFILE,
+        stream_callback=None,
+        renditions: Sequence[str] = (),
+        music: Optional[str] = None,
+        sound_effects: Optional[List[str]] = None,
     ) -> Optional[str]:
-        """Create the final video by combining all components"""
+        """Blocking implementation of create_final_video"""
+        project_dir = Path(f"projects/{project_id}")
+        temp_dir = project_dir / "temp" / profile.name
         try:
-            print(f"\nStarting video creation for project {project_id}")
+            print(f"\nStarting {profile.name} video creation for project {project_id}")
             print(f"Number of images: {len(images)}")
             print(f"Number of audio files: {len(audio_files)}")
 
-            project_dir = Path(f"projects/{project_id}")
-            temp_dir = project_dir / "temp"
+            # Each profile renders in its own temp directory so a proxy and a
+            # full render of the same project never share intermediate files
             temp_dir.mkdir(parents=True, exist_ok=True)
 
             # Calculate format based on total expected duration
@@ -408,172 +1243,126 @@ class VideoCombiner:
             is_short = total_duration <= 60
 
             # Get actual audio durations for all scenes
-            scene_durations = []
-            if audio_files:
-                duration_command = [
-                    "ffprobe",
-                    "-v",
-                    "error",
-                    "-show_entries",
-                    "format=duration",
-                    "-of",
-                    "default=noprint_wrappers=1:nokey=1"
-                ]
-
-                for audio_file in audio_files:
-                    try:
-                        result = subprocess.run(
-                            duration_command + [audio_file],
-                            capture_output=True,
-                            text=True,
-                            check=True
-                        )
-                        duration = float(result.stdout.strip())
-                        scene_durations.append(duration)
-                    except:
-                        scene_durations.append(scene_duration)
-            else:
-                scene_durations = [scene_duration] * len(images)
+            scene_durations = self.scene_durations(audio_files, len(images), scene_duration)
+
+            # Streaming output starts from an empty playlist on every render
+            if stream_callback:
+                stream_dir = project_dir / "stream"
+                shutil.rmtree(stream_dir, ignore_errors=True)
+                stream_dir.mkdir(parents=True, exist_ok=True)
+                playlist_path = stream_dir / STREAM_PLAYLIST
+                target_duration = math.ceil(max(scene_durations, default=scene_duration))
+                stream_segments = []
+                stream_offset = 0.0
+
+            # The primary layout follows the project format; extra renditions
+            # are encoded from the same decoded scene images
+            primary = layout_for(is_short)
+            layouts = [primary] + [
+                LAYOUTS[name] for name in dict.fromkeys(renditions) if name != primary.name
+            ]
+            suffixes = {
+                layout.name: "" if layout is primary else f"_{layout.name}" for layout in layouts
+            }
 
             # Create video clips
-            video_clips = []
+            video_clips = {layout.name: [] for layout in layouts}
             for i, image_path in enumerate(images):
-                print(f"\nProcessing image {i+1}/{len(images)}: {image_path}")
-
-                # Use exact audio duration for scene length
-                current_duration = scene_durations[i] if i < len(
-                    scene_durations) else scene_duration
-
-                # Get subtitle if available
-                subtitle = scripts[i] if scripts and i < len(scripts) else ""
-
-                # Create video from image with exact audio duration
-                temp_video = temp_dir / f"temp_video_{i}.mp4"
-                if not self.create_video_from_image(
-                    image_path,
-                    current_duration,
-                    str(temp_video),
-                    subtitle,
-                    is_short
-                ):
-                    print(f"Failed to create video from image {i}")
-                    return None
-
-                # Combine with audio if available
-                if audio_files and i < len(audio_files):
-                    temp_video_audio = temp_dir / f"temp_video_audio_{i}.mp4"
-                    if not self.combine_audio_video(
-                        str(temp_video),
-                        audio_files[i],
-                        str(temp_video_audio)
+                with span("scene", scene=i + 1, renditions=len(layouts)):
+                    print(f"\nProcessing image {i+1}/{len(images)}: {image_path}")
+
+                    # Use exact audio duration for scene length
+                    current_duration = scene_durations[i] if i < len(
+                        scene_durations) else scene_duration
+
+                    # Get subtitle if available
+                    subtitle = scripts[i] if scripts and i < len(scripts) else ""
+
+                    # Create video from image with exact audio duration, all
+                    # renditions in one ffmpeg run
+                    temp_videos = {
+                        name: str(temp_dir / f"temp_video_{i}{suffix}.mp4")
+                        for name, suffix in suffixes.items()
+                    }
+                    if not self.create_scene_clips(
+                        image_path,
+                        current_duration,
+                        temp_videos,
+                        subtitle,
+                        profile
                     ):
-                        print(f"Failed to combine audio for video {i}")
+                        print(f"Failed to create video from image {i}")
                         return None
-                    video_clips.append(str(temp_video_audio))
-                else:
-                    video_clips.append(str(temp_video))
-
-            if not video_clips:
-                print("No video clips were created")
-                return None
 
-            print(f"\nCreated {len(video_clips)} video clips")
+                    for name, suffix in suffixes.items():
+                        # Combine with audio if available
+                        if audio_files and i < len(audio_files):
+                            temp_video_audio = temp_dir / f"temp_video_audio_{i}{suffix}.mp4"
+                            if not self.combine_audio_video(
+                                temp_videos[name],
+                                audio_files[i],
+                                str(temp_video_audio)
+                            ):
+                                print(f"Failed to combine audio for video {i}")
+                                return None
+                            video_clips[name].append(str(temp_video_audio))
+                        else:
+                            video_clips[name].append(temp_videos[name])
+
+                    if stream_callback:
+                        segment_name = f"segment_{i:04d}.ts"
+                        if not self.write_stream_segment(
+                            video_clips[primary.name][-1], str(stream_dir / segment_name), stream_offset
+                        ):
+                            print(f"Failed to write stream segment {i}")
+                            return None
+                        stream_segments.append((segment_name, current_duration))
+                        stream_offset += current_duration
+                        self.write_stream_playlist(
+                            playlist_path, stream_segments, target_duration,
+                            finished=i == len(images) - 1
+                        )
+                        if i == 0:
+                            stream_callback(str(playlist_path))
 
-            # Concatenate all clips directly
-            temp_output = project_dir / "temp" / "temp_output.mp4"
-            if not self.concatenate_videos(video_clips, str(temp_output)):
-                print("Failed to concatenate videos")
+            if not video_clips[primary.name]:
+                print("No video clips were created")
                 return None
 
-            # Check if we need to adjust video speed
-            duration_command = [
-                "ffprobe",
-                "-v",
-                "error",
-                "-show_entries",
-                "format=duration",
-                "-of",
-                "default=noprint_wrappers=1:nokey=1",
-                str(temp_output),
-            ]
-
-            duration_result = subprocess.run(
-                duration_command, capture_output=True, text=True
-            )
-            if duration_result.returncode == 0:
-                duration = float(duration_result.stdout.strip())
-                speed_adjusted_output = project_dir / "temp" / "speed_adjusted.mp4"
-
-                # Apply speed adjustment only for short videos
-                if is_short and duration > 59.5:
-                    speed = duration / 59.5
-
-                    speed_command = [
-                        "ffmpeg",
-                        "-y",
-                        "-i",
-                        str(temp_output),
-                        "-filter_complex",
-                        f"[0:v]setpts={1/speed}*PTS[v];[0:a]atempo={speed}[a]",
-                        "-map",
-                        "[v]",
-                        "-map",
-                        "[a]",
-                        "-c:v",
-                        "libx264",
-                        "-preset",
-                        "medium",
-                        "-crf",
-                        "23",
-                        "-vsync",
-                        "cfr",
-                        "-r",
-                        "30",
-                        "-g",
-                        "30",
-                        "-c:a",
-                        "aac",
-                        "-b:a",
-                        "192k",
-                        "-ar",
-                        "44100",
-                        "-ac",
-                        "2",
-                        str(speed_adjusted_output),
-                    ]
-
-                    print("Adjusting video speed to fit 59.5 seconds...")
-                    speed_result = subprocess.run(
-                        speed_command, capture_output=True, text=True
-                    )
-                    if speed_result.returncode == 0:
-                        temp_output = speed_adjusted_output
-                else:
-                    print("Skipping speed adjustment for long video")
-
-            # Add background music if exists
-            final_output = project_dir / "output.mp4"
-            # Check for soundtrack in multiple locations
-            possible_soundtrack_paths = [
-                Path("assets/soundtrack.mp3"),
-                Path("soundtrack.mp3"),
-                self.assets_dir / "soundtrack.mp3",
-            ]
-
-            soundtrack_path = next(
-                (p for p in possible_soundtrack_paths if p.exists()), None
-            )
-
-            if soundtrack_path:
-                print(f"Using soundtrack from: {soundtrack_path}")
-                if not self.add_background_music(
-                    str(temp_output), str(soundtrack_path), str(final_output)
-                ):
-                    print("Failed to add background music, using video without music")
-                    shutil.copy(str(temp_output), str(final_output))
-            else:
-                print("No soundtrack found, using video without music")
-                shutil.copy(str(temp_output), str(final_output))
+            print(f"\nCreated {len(video_clips[primary.name])} video clips per rendition")
+
+            effects = self.effect_cues(scripts, sound_effects, scene_durations)
+            final_output = project_dir / profile.output_name
+            for layout in layouts:
+                output = project_dir / rendition_name(profile, layout, layout is primary)
+                with span("rendition", layout=layout.name):
+                    if not self.finish_rendition(
+                        video_clips[layout.name],
+                        temp_dir,
+                        output,
+                        suffixes[layout.name],
+                        profile,
+                        stream_copy=stream_callback is not None,
+                        # Shorts must stay under a minute; other renditions keep their pace
+                        fit_short=is_short and layout is primary,
+                        music=music,
+                        effects=effects,
+                    ):
+                        if layout is primary:
+                            return None
+                        print(f"Failed to create {layout.name} rendition, skipping it")
+
+            if profile is FULL_PROFILE:
+                self.save_render_state(
+                    project_dir,
+                    primary,
+                    [str(temp_dir / f"temp_video_{i}.mp4") for i in range(len(images))],
+                    images,
+                    audio_files,
+                    scripts,
+                    music,
+                    sound_effects,
+                )
 
             print("\nCleaning up temporary files")
             # Clean up temporary files
@@ -592,6 +1381,15 @@ class VideoCombiner:
             print(f"Successfully created final video: {final_output}")
             return str(final_output)
 
+        except OperationCancelled:
+            # Scene assets are untouched, so the project can simply be rendered
+            # again; only this render's intermediate and partial outputs go
+            print(f"Cancelled {profile.name} video creation for project {project_id}")
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            if stream_callback:
+                shutil.rmtree(project_dir / "stream", ignore_errors=True)
+            raise
+
         except Exception as e:
             print(f"Error creating final video: {e}")
             return None
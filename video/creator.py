@@ -1,21 +1,60 @@
 from pathlib import Path
+from typing import Optional
 
 from project.project import Project
-from script.generator import ScriptGenerator
-from image.generator import ImageGenerator
-from audio.generator import AudioGenerator
-from video.combiner import VideoCombiner
+from runtime.cancellation import CancellationToken, run_blocking
+from runtime.rate_scheduler import scheduled_job
+from telemetry.metrics import count_cache
+from telemetry.tracing import span, traced_job
 
 
 class VideoCreator:
-    def __init__(self):
-        self.script_generator = ScriptGenerator()
-        self.image_generator = ImageGenerator()
-        self.audio_generator = AudioGenerator()
-        self.video_combiner = VideoCombiner()
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        # Cancelling the token kills running ffmpeg processes; the job runner
+        # also cancels the task so in-flight API requests are aborted
+        self.cancel_token = cancel_token or CancellationToken()
+
+        # Generators and the combiner pull in httpx and probe for ffmpeg, so
+        # they are created on first use rather than when the window opens
+        self._script_generator = None
+        self._image_generator = None
+        self._audio_generator = None
+        self._video_combiner = None
         self._last_progress = 0
         self._last_message = ""
 
+    @property
+    def script_generator(self):
+        """Script generator, created on first use"""
+        if self._script_generator is None:
+            from script.generator import ScriptGenerator
+            self._script_generator = ScriptGenerator()
+        return self._script_generator
+
+    @property
+    def image_generator(self):
+        """Image generator, created on first use"""
+        if self._image_generator is None:
+            from image.generator import ImageGenerator
+            self._image_generator = ImageGenerator()
+        return self._image_generator
+
+    @property
+    def audio_generator(self):
+        """Audio generator, created on first use"""
+        if self._audio_generator is None:
+            from audio.generator import AudioGenerator
+            self._audio_generator = AudioGenerator(self.cancel_token)
+        return self._audio_generator
+
+    @property
+    def video_combiner(self):
+        """Video combiner, created on first use"""
+        if self._video_combiner is None:
+            from video.combiner import VideoCombiner
+            self._video_combiner = VideoCombiner(self.cancel_token)
+        return self._video_combiner
+
     def _update_progress(self, progress_callback, message: str, value: int):
         """Helper to update progress only when there's a change"""
         if progress_callback and (value != self._last_progress or message != self._last_message):
@@ -23,7 +62,86 @@ class VideoCreator:
             self._last_message = message
             progress_callback(message, value)
 
-    async def create_video(self, project: Project, progress_callback=None, skip_audio=False) -> bool:
+    async def _render_final_video(self, project: Project, audio_files, scene_duration: float,
+                                  progress_callback=None, preview_callback=None, progress: int = 80,
+                                  preview_mode: str = "proxy", renditions=(), patch: bool = False):
+        """Render the final video with an optional early preview.
+
+        preview_mode "proxy" renders a fast low-resolution pass first;
+        "stream" publishes an HLS playlist that grows scene by scene during
+        the full render. preview_callback receives the playable path.
+        renditions lists extra layouts of the full render; the files that
+        were written are recorded in the "renditions" metadata.
+        With patch, only scenes that changed since the last full render are
+        re-encoded when possible; that takes seconds, so no preview is shown.
+        """
+        from video.combiner import FULL_PROFILE, LAYOUTS, PROXY_PROFILE, layout_for, rendition_name
+
+        if patch and not renditions:
+            self._update_progress(progress_callback, "Updating changed scenes...", progress)
+            output_path = await self.video_combiner.patch_final_video(
+                project.id,
+                project.images,
+                audio_files,
+                scene_duration=scene_duration,
+                scripts=project.scripts,
+                music=project.metadata.get("background_music"),
+                sound_effects=project.metadata.get("sound_effects"),
+            )
+            if output_path:
+                # Extra renditions of the previous render are now out of date
+                primary = layout_for(project.duration <= 60)
+                project.add_metadata("renditions", {primary.name: output_path})
+                return output_path
+            print("Could not patch the existing video, rendering it in full")
+
+        use_proxy = preview_callback is not None and preview_mode == "proxy"
+        if use_proxy:
+            self._update_progress(progress_callback, "Rendering preview...", progress)
+            preview_path = await self.video_combiner.create_final_video(
+                project.id,
+                project.images,
+                audio_files,
+                scene_duration=scene_duration,
+                scripts=project.scripts,
+                music=project.metadata.get("background_music"),
+                sound_effects=project.metadata.get("sound_effects"),
+                profile=PROXY_PROFILE,
+            )
+            if preview_path:
+                preview_callback(preview_path)
+            else:
+                print("Failed to render preview, continuing with full render")
+
+        self._update_progress(progress_callback, "Creating final video with voiceover...",
+                              progress + (5 if use_proxy else 0))
+        output_path = await self.video_combiner.create_final_video(
+            project.id,
+            project.images,
+            audio_files,
+            scene_duration=scene_duration,
+            scripts=project.scripts,
+            music=project.metadata.get("background_music"),
+            sound_effects=project.metadata.get("sound_effects"),
+            profile=FULL_PROFILE,
+            stream_callback=preview_callback if preview_mode == "stream" else None,
+            renditions=renditions,
+        )
+        if output_path:
+            primary = layout_for(project.duration <= 60)
+            available = {primary.name: output_path}
+            for name in renditions:
+                path = Path(output_path).parent / rendition_name(FULL_PROFILE, LAYOUTS[name], False)
+                if name != primary.name and path.exists():
+                    available[name] = str(path)
+            project.add_metadata("renditions", available)
+        return output_path
+
+    @traced_job("create_video")
+    @scheduled_job
+    async def create_video(self, project: Project, progress_callback=None, skip_audio=False,
+                           preview_callback=None, preview_mode: str = "proxy",
+                           renditions=()) -> bool:
         """Create a complete video from start to finish"""
         try:
             # Calculate video format based on duration
@@ -32,7 +150,8 @@ class VideoCreator:
 
             # Script generation (0-20%)
             self._update_progress(progress_callback, "Generating script...", 0)
-            script_data = await self.script_generator.generate_script(project.subject, project.duration)
+            with span("script"):
+                script_data = await self.script_generator.generate_script(project.subject, project.duration)
             print(f"Script data: {script_data}")
             if not script_data or not self.script_generator.validate_script(script_data):
                 self._update_progress(
@@ -41,21 +160,24 @@ class VideoCreator:
 
             # Update project data (20%)
             self._update_progress(progress_callback, "Updating project data...", 20)
-            project.set_title(script_data["title"])
-            project.scripts = script_data["script"]
-            project.add_metadata("youtube_title", script_data["youtube_title"])
-            project.add_metadata("youtube_description", script_data["youtube_description"])
-            project.add_metadata("background_music", script_data["music"])
-            project.add_metadata("sound_effects", script_data["sounds"])
-            project.add_metadata("image_descriptions", script_data["descriptions"])
+            with project.batch():
+                project.set_title(script_data["title"])
+                project.scripts = script_data["script"]
+                project.add_metadata("youtube_title", script_data["youtube_title"])
+                project.add_metadata("youtube_description", script_data["youtube_description"])
+                project.add_metadata("background_music", script_data["music"])
+                project.add_metadata("sound_effects", script_data["sounds"])
+                project.add_metadata("image_descriptions", script_data["descriptions"])
 
             # Image generation (20-50%)
+            self.cancel_token.raise_if_cancelled()
             self._update_progress(progress_callback, "Generating images...", 25)
-            images, error = await self.image_generator.generate_project_images(
-                project.id,
-                script_data["descriptions"],
-                is_short=is_short  # Pass correct format
-            )
+            with span("images", scenes=len(script_data["descriptions"])):
+                images, error = await self.image_generator.generate_project_images(
+                    project.id,
+                    script_data["descriptions"],
+                    is_short=is_short  # Pass correct format
+                )
             if error:
                 self._update_progress(progress_callback, f"Error: {error}", 25)
                 return False
@@ -63,16 +185,20 @@ class VideoCreator:
                 self._update_progress(
                     progress_callback, "Error: Failed to generate all required images", 25)
                 return False
+            # Saved right away so a cancelled job can resume from the audio stage
             project.images = images
+            project.update()
 
             # Audio generation (50-80%)
             if not skip_audio:
+                self.cancel_token.raise_if_cancelled()
                 self._update_progress(progress_callback, "Generating voiceover...", 50)
-                audio_files = await self.audio_generator.generate_project_audio(
-                    project.id,
-                    script_data["script"],
-                    project.duration
-                )
+                with span("audio", scenes=len(script_data["script"])):
+                    audio_files = await self.audio_generator.generate_project_audio(
+                        project.id,
+                        script_data["script"],
+                        project.duration
+                    )
                 if not audio_files or len(audio_files) != len(script_data["script"]):
                     self._update_progress(
                         progress_callback, "Error: Failed to generate voiceover", 50)
@@ -80,15 +206,18 @@ class VideoCreator:
                 project.audio_files = audio_files
             else:
                 project.audio_files = []
+            project.update()
 
             # Final video creation (80-100%)
-            self._update_progress(progress_callback, "Creating final video with voiceover...", 80)
-            output_path = await self.video_combiner.create_final_video(
-                project.id,
-                project.images,
+            self.cancel_token.raise_if_cancelled()
+            output_path = await self._render_final_video(
+                project,
                 project.audio_files if not skip_audio else [],
-                scripts=project.scripts,
-                scene_duration=project.duration / len(project.scripts) if project.scripts else 5.0
+                project.duration / len(project.scripts) if project.scripts else 5.0,
+                progress_callback,
+                preview_callback,
+                preview_mode=preview_mode,
+                renditions=renditions,
             )
             if not output_path:
                 self._update_progress(progress_callback, "Error: Failed to create final video", 80)
@@ -106,7 +235,11 @@ class VideoCreator:
             self._update_progress(progress_callback, f"Error: {error_msg}", 0)
             return False
 
-    async def recreate_video(self, project: Project, progress_callback=None) -> bool:
+    @traced_job("recreate_video")
+    @scheduled_job
+    async def recreate_video(self, project: Project, progress_callback=None,
+                             preview_callback=None, preview_mode: str = "proxy",
+                             renditions=()) -> bool:
         """Recreate video using existing project assets"""
         try:
             print(f"Starting video recreation for project {project.id}")
@@ -134,7 +267,8 @@ class VideoCreator:
                 images, error = await self.image_generator.generate_project_images(
                     project.id,
                     project.metadata['image_descriptions'],
-                    is_short=is_short  # Pass format based on duration
+                    is_short=is_short,  # Pass format based on duration
+                    skip_existing=True
                 )
                 if error:
                     if progress_callback:
@@ -152,13 +286,24 @@ class VideoCreator:
                 # Generate audio for scenes that don't have audio
                 new_audio_files = []
                 for i, script in enumerate(project.scripts):
-                    if i >= len(project.audio_files) or not Path(project.audio_files[i]).exists():
+                    raw_audio = Path(f"projects/{project.id}/audio/scene{i+1}-audio.mp3")
+                    if i < len(project.audio_files) and Path(project.audio_files[i]).exists():
+                        count_cache("audio", hits=1)
+                        new_audio_files.append(project.audio_files[i])
+                    elif raw_audio.exists() and raw_audio.stat().st_size > 0:
+                        # Left by a cancelled run; silence is processed below
+                        print(f"Reusing existing audio for scene {i+1}")
+                        count_cache("audio", hits=1)
+                        new_audio_files.append(str(raw_audio))
+                    else:
                         print(f"Generating audio for scene {i+1}")
-                        audio_path = await self.audio_generator.generate_audio(
-                            script,
-                            Path(f"projects/{project.id}/audio/scene{i+1}-audio.mp3"),
-                            is_short=is_short
-                        )
+                        count_cache("audio", misses=1)
+                        with span("tts", scene=i + 1):
+                            audio_path = await self.audio_generator.generate_audio(
+                                script,
+                                Path(f"projects/{project.id}/audio/scene{i+1}-audio.mp3"),
+                                is_short=is_short
+                            )
                         if audio_path:
                             new_audio_files.append(audio_path)
                         else:
@@ -167,8 +312,6 @@ class VideoCreator:
                                 progress_callback(
                                     f"Error: Failed to generate audio for scene {i+1}", 0)
                             return False
-                    else:
-                        new_audio_files.append(project.audio_files[i])
 
                 project.audio_files = new_audio_files
                 project.update()
@@ -180,7 +323,8 @@ class VideoCreator:
 
                 processed_audio = []
                 for audio_file in project.audio_files:
-                    processed_path = self.audio_generator.process_audio_silence(
+                    processed_path = await run_blocking(
+                        self.audio_generator.process_audio_silence,
                         audio_file,
                         is_short=is_short  # Pass correct format
                     )
@@ -201,7 +345,8 @@ class VideoCreator:
                 print("Generating missing images from stored descriptions")
 
                 images, error = await self.image_generator.generate_project_images(
-                    project.id, project.metadata['image_descriptions']
+                    project.id, project.metadata['image_descriptions'],
+                    is_short=is_short, skip_existing=True
                 )
                 if error:
                     error_msg = f"Failed to generate images: {error}"
@@ -236,12 +381,16 @@ class VideoCreator:
             print("All image files verified")
 
             # Combine existing assets into final video with scripts
-            output_path = await self.video_combiner.create_final_video(
-                project.id,
-                project.images,
+            output_path = await self._render_final_video(
+                project,
                 project.audio_files,
-                scene_duration=scene_duration,  # Pass the calculated scene duration
-                scripts=project.scripts
+                scene_duration,  # Pass the calculated scene duration
+                progress_callback,
+                preview_callback,
+                progress=50,
+                preview_mode=preview_mode,
+                renditions=renditions,
+                patch=True,
             )
 
             if not output_path:
@@ -268,6 +417,8 @@ class VideoCreator:
                 progress_callback(f"Error: {error_msg}", 0)
             return False
 
+    @traced_job("regenerate_scene")
+    @scheduled_job
     async def regenerate_scene(self, project: Project, scene_index: int, progress_callback=None, skip_audio=True) -> bool:
         """Regenerate a specific scene (image and audio) without recreating video"""
         try:
@@ -0,0 +1,116 @@
+import os
+import subprocess
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from runtime.cancellation import CancellationToken
+from telemetry.metrics import observe_ffmpeg
+from telemetry.resources import ProcessUsage, max_rss_kb, media_seconds, record_usage
+from telemetry.tracing import span
+
+
+def output_file(command: List[str]) -> Optional[str]:
+    """The file an ffmpeg command writes, if its last argument is one"""
+    if len(command) < 2 or command[-1].startswith("-") or command[-2] == "-i":
+        return None
+    return command[-1]
+
+
+def communicate_with_usage(process: subprocess.Popen) -> Tuple[object, object, Optional[object]]:
+    """Like process.communicate(), also returning the child's rusage.
+
+    The pipes are drained by threads while the child is reaped with
+    os.wait4, which reports the CPU time and peak memory of that child
+    alone, even while other jobs run ffmpeg at the same time.
+    """
+    if not hasattr(os, "wait4"):
+        stdout, stderr = process.communicate()
+        return stdout, stderr, None
+
+    output = {}
+
+    def drain(name, pipe):
+        output[name] = pipe.read()
+        pipe.close()
+
+    readers = [
+        threading.Thread(target=drain, args=(name, pipe), daemon=True)
+        for name, pipe in (("stdout", process.stdout), ("stderr", process.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    for reader in readers:
+        reader.join()
+    return output["stdout"], output["stderr"], usage
+
+
+def run_ffmpeg(
+    command: List[str],
+    cancel_token: Optional[CancellationToken] = None,
+    check: bool = False,
+    text: bool = False,
+    kind: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """Run an ffmpeg/ffprobe command, capturing its output.
+
+    Behaves like subprocess.run(command, capture_output=True, ...), except
+    that the child process is killed as soon as cancel_token is cancelled,
+    in which case OperationCancelled is raised instead of returning.
+    kind names the pass (e.g. "scene_clip", "concat") in job traces and
+    render reports, which also get the run's CPU time and peak memory.
+    """
+    if cancel_token:
+        cancel_token.raise_if_cancelled()
+
+    tool = os.path.basename(command[0])
+    with span(kind or tool, tool) as run_span:
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text
+        )
+        remove_callback = cancel_token.add_callback(process.kill) if cancel_token else None
+        try:
+            stdout, stderr, rusage = communicate_with_usage(process)
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        finally:
+            if remove_callback:
+                remove_callback()
+        wall = time.perf_counter() - start
+
+        usage = ProcessUsage(
+            kind=kind or tool,
+            tool=tool,
+            wall=round(wall, 3),
+            user=round(rusage.ru_utime, 3) if rusage else 0.0,
+            system=round(rusage.ru_stime, 3) if rusage else 0.0,
+            max_rss_kb=max_rss_kb(rusage.ru_maxrss) if rusage else 0,
+            returncode=process.returncode,
+        )
+        if tool == "ffprobe":
+            run_span.set(input=os.path.basename(command[-1]))
+        else:
+            output = output_file(command)
+            if output and process.returncode == 0 and os.path.isfile(output):
+                usage.output_bytes = os.path.getsize(output)
+                run_span.set(output=os.path.basename(output))
+            usage.media_seconds = media_seconds(stderr)
+        run_span.set(
+            returncode=process.returncode,
+            bytes=usage.output_bytes,
+            cpu=round(usage.cpu, 3),
+            max_rss_kb=usage.max_rss_kb,
+        )
+        record_usage(usage)
+        observe_ffmpeg(usage)
+
+    if cancel_token:
+        cancel_token.raise_if_cancelled()
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)